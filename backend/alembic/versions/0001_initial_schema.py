@@ -0,0 +1,136 @@
+"""initial schema
+
+The tables as init_db.py / create_all used to build them. Databases that
+were created that way should be stamped with this revision instead of
+running it:
+
+    alembic stamp 0001_initial_schema
+    alembic upgrade head
+
+Revision ID: 0001_initial_schema
+Revises:
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001_initial_schema"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _timestamps():
+    return [
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("full_name", sa.String(255), nullable=False),
+        sa.Column("hashed_password", sa.String(255), nullable=True),
+        sa.Column("profile_picture", sa.String(500), nullable=True),
+        sa.Column("role", sa.Enum("ADMIN", "FACULTY", "STUDENT", name="roleenum"), nullable=False),
+        sa.Column("oauth_provider", sa.String(50), nullable=True),
+        sa.Column("oauth_id", sa.String(255), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        *_timestamps(),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "students",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False, unique=True),
+        sa.Column("student_id", sa.String(50), nullable=False),
+        sa.Column("date_of_birth", sa.Date(), nullable=True),
+        sa.Column("phone", sa.String(20), nullable=True),
+        sa.Column("address", sa.Text(), nullable=True),
+        sa.Column("enrollment_year", sa.Integer(), nullable=True),
+        sa.Column("program", sa.String(100), nullable=True),
+        sa.Column("current_semester", sa.String(50), nullable=True),
+        sa.Column("gpa", sa.Float(), nullable=True),
+        *_timestamps(),
+    )
+    op.create_index("ix_students_id", "students", ["id"])
+    op.create_index("ix_students_student_id", "students", ["student_id"], unique=True)
+
+    op.create_table(
+        "courses",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("course_code", sa.String(20), nullable=False),
+        sa.Column("course_name", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("credits", sa.Integer(), nullable=False),
+        sa.Column("faculty_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("semester", sa.String(50), nullable=True),
+        sa.Column("academic_year", sa.String(20), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        *_timestamps(),
+    )
+    op.create_index("ix_courses_id", "courses", ["id"])
+    op.create_index("ix_courses_course_code", "courses", ["course_code"], unique=True)
+
+    op.create_table(
+        "enrollments",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("student_id", sa.Integer(), sa.ForeignKey("students.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("course_id", sa.Integer(), sa.ForeignKey("courses.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("enrollment_date", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("status", sa.String(20), nullable=True),
+        *_timestamps(),
+    )
+    op.create_index("ix_enrollments_id", "enrollments", ["id"])
+
+    op.create_table(
+        "attendance",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("student_id", sa.Integer(), sa.ForeignKey("students.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("course_id", sa.Integer(), sa.ForeignKey("courses.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("notes", sa.Text(), nullable=True),
+        *_timestamps(),
+    )
+    op.create_index("ix_attendance_id", "attendance", ["id"])
+
+    op.create_table(
+        "grades",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("student_id", sa.Integer(), sa.ForeignKey("students.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("course_id", sa.Integer(), sa.ForeignKey("courses.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("assessment_type", sa.String(50), nullable=False),
+        sa.Column("assessment_name", sa.String(255), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("max_score", sa.Float(), nullable=False),
+        sa.Column("percentage", sa.Float(), nullable=True),
+        sa.Column("letter_grade", sa.String(5), nullable=True),
+        sa.Column("date_assessed", sa.Date(), nullable=True),
+        sa.Column("remarks", sa.Text(), nullable=True),
+        *_timestamps(),
+    )
+    op.create_index("ix_grades_id", "grades", ["id"])
+
+    op.create_table(
+        "semesters",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(50), nullable=False, unique=True),
+        sa.Column("is_current", sa.Boolean(), nullable=True),
+        sa.Column("start_date", sa.Date(), nullable=True),
+        sa.Column("end_date", sa.Date(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_semesters_id", "semesters", ["id"])
+
+
+def downgrade() -> None:
+    for table in ("semesters", "grades", "attendance", "enrollments", "courses", "students", "users"):
+        op.drop_table(table)
+    sa.Enum(name="roleenum").drop(op.get_bind(), checkfirst=True)
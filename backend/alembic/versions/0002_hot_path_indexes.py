@@ -0,0 +1,70 @@
+"""indexes and unique constraints for the hot filter paths
+
+Duplicate attendance rows (same student, course and date) and duplicate
+enrollments (same student and course) are collapsed onto the newest row
+before the unique constraints are added.
+
+Revision ID: 0002_hot_path_indexes
+Revises: 0001_initial_schema
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002_hot_path_indexes"
+down_revision = "0001_initial_schema"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_students_program", "students", ["program"]),
+    ("ix_students_current_semester", "students", ["current_semester"]),
+    ("ix_courses_faculty_id", "courses", ["faculty_id"]),
+    ("ix_enrollments_course_id_status", "enrollments", ["course_id", "status"]),
+    ("ix_attendance_course_id_date", "attendance", ["course_id", "date"]),
+    ("ix_attendance_date_id", "attendance", ["date", "id"]),
+    ("ix_grades_student_id_course_id_assessment_type", "grades", ["student_id", "course_id", "assessment_type"]),
+    ("ix_grades_course_id_assessment_type", "grades", ["course_id", "assessment_type"]),
+]
+
+
+def _has_unique_constraint(table: str, name: str) -> bool:
+    inspector = sa.inspect(op.get_bind())
+    return any(constraint["name"] == name for constraint in inspector.get_unique_constraints(table))
+
+
+def upgrade() -> None:
+    # create_all already added this constraint to databases built after the
+    # bulk attendance endpoint shipped
+    if not _has_unique_constraint("attendance", "uq_attendance_student_course_date"):
+        op.execute("""
+            DELETE FROM attendance a
+            USING attendance newer
+            WHERE a.student_id = newer.student_id
+              AND a.course_id = newer.course_id
+              AND a.date = newer.date
+              AND a.id < newer.id
+        """)
+        op.create_unique_constraint(
+            "uq_attendance_student_course_date", "attendance", ["student_id", "course_id", "date"]
+        )
+
+    op.execute("""
+        DELETE FROM enrollments e
+        USING enrollments newer
+        WHERE e.student_id = newer.student_id
+          AND e.course_id = newer.course_id
+          AND e.id < newer.id
+    """)
+    op.create_unique_constraint("uq_enrollment_student_course", "enrollments", ["student_id", "course_id"])
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    op.drop_constraint("uq_enrollment_student_course", "enrollments", type_="unique")
+    op.drop_constraint("uq_attendance_student_course_date", "attendance", type_="unique")
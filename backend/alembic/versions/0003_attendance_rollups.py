@@ -0,0 +1,63 @@
+"""attendance rollups per student x course and per course x date
+
+Both tables are filled from the existing attendance rows; afterwards the
+attendance endpoints keep them current.
+
+Revision ID: 0003_attendance_rollups
+Revises: 0002_hot_path_indexes
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003_attendance_rollups"
+down_revision = "0002_hot_path_indexes"
+branch_labels = None
+depends_on = None
+
+STATUSES = ("present", "absent", "late", "excused")
+
+
+def _counts():
+    return [
+        *(sa.Column(status, sa.Integer(), nullable=False, server_default="0") for status in STATUSES),
+        sa.Column("total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    ]
+
+
+def _backfill(table: str, keys: str) -> None:
+    counts = ", ".join(f"count(*) FILTER (WHERE status = '{status}')" for status in STATUSES)
+    op.execute(f"""
+        INSERT INTO {table} ({keys}, {", ".join(STATUSES)}, total)
+        SELECT {keys}, {counts}, count(*)
+        FROM attendance
+        GROUP BY {keys}
+    """)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "attendance_student_rollups",
+        sa.Column("student_id", sa.Integer(), sa.ForeignKey("students.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("course_id", sa.Integer(), sa.ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True),
+        *_counts(),
+    )
+    op.create_index("ix_attendance_student_rollups_course_id", "attendance_student_rollups", ["course_id"])
+
+    op.create_table(
+        "attendance_daily_rollups",
+        sa.Column("course_id", sa.Integer(), sa.ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("date", sa.Date(), primary_key=True),
+        *_counts(),
+    )
+
+    _backfill("attendance_student_rollups", "student_id, course_id")
+    _backfill("attendance_daily_rollups", "course_id, date")
+
+
+def downgrade() -> None:
+    op.drop_table("attendance_daily_rollups")
+    op.drop_index("ix_attendance_student_rollups_course_id", table_name="attendance_student_rollups")
+    op.drop_table("attendance_student_rollups")
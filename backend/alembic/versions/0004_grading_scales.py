@@ -0,0 +1,40 @@
+"""grading scales
+
+Revision ID: 0004_grading_scales
+Revises: 0003_attendance_rollups
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004_grading_scales"
+down_revision = "0003_attendance_rollups"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "grading_scales",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("scope", sa.String(20), nullable=False),
+        sa.Column("program", sa.String(100), nullable=True),
+        sa.Column("course_id", sa.Integer(), sa.ForeignKey("courses.id", ondelete="CASCADE"), nullable=True),
+        sa.Column("cutoffs", sa.JSON(), nullable=False),
+        sa.Column("failing_grade", sa.String(5), nullable=False),
+        sa.Column("curve_mode", sa.String(20), nullable=False),
+        sa.Column("curve_value", sa.Float(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_grading_scales_id", "grading_scales", ["id"])
+    op.create_index("ix_grading_scales_course_id", "grading_scales", ["course_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_grading_scales_course_id", table_name="grading_scales")
+    op.drop_index("ix_grading_scales_id", table_name="grading_scales")
+    op.drop_table("grading_scales")
@@ -0,0 +1,34 @@
+"""at-risk flags written by the at-risk scan
+
+Revision ID: 0005_at_risk_flags
+Revises: 0004_grading_scales
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005_at_risk_flags"
+down_revision = "0004_grading_scales"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "at_risk_flags",
+        sa.Column("student_id", sa.Integer(), sa.ForeignKey("students.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("course_id", sa.Integer(), sa.ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("attendance_rate", sa.Float(), nullable=True),
+        sa.Column("sessions", sa.Integer(), nullable=False),
+        sa.Column("grade_percentage", sa.Float(), nullable=True),
+        sa.Column("assessments", sa.Integer(), nullable=False),
+        sa.Column("reasons", sa.String(100), nullable=False),
+        sa.Column("computed_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_at_risk_flags_course_id", "at_risk_flags", ["course_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_at_risk_flags_course_id", table_name="at_risk_flags")
+    op.drop_table("at_risk_flags")
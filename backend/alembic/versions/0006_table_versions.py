@@ -0,0 +1,104 @@
+"""per-table write counters for conditional GETs
+
+A statement-level trigger on each versioned table records that the current
+transaction wrote to it; the counters themselves are bumped once per
+transaction, at commit, by a deferred constraint trigger. The bump commits
+together with the write, so a reader never sees a new version next to old
+rows.
+
+Lock ordering: bumping a counter locks its table_versions row until commit.
+Bumping from the write triggers took those locks in statement order, so
+create_student (users, then students) and student deletes (students, then
+users) could deadlock, and every writer of a table queued behind the first
+one for the rest of its transaction. The deferred bump locks all of a
+transaction's rows in one statement, ordered by table name, and only at
+commit, so the locks are held briefly and always acquired in the same
+order. Any later code that locks table_versions rows must also take them in
+table name order.
+
+Revision ID: 0006_table_versions
+Revises: 0005_at_risk_flags
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006_table_versions"
+down_revision = "0005_at_risk_flags"
+branch_labels = None
+depends_on = None
+
+VERSIONED_TABLES = ("users", "students", "courses", "enrollments", "semesters", "grades")
+
+
+def upgrade() -> None:
+    table_versions = op.create_table(
+        "table_versions",
+        sa.Column("table_name", sa.String(63), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.bulk_insert(table_versions, [{"table_name": table} for table in VERSIONED_TABLES])
+
+    # One row per writing transaction, only there to queue the deferred bump
+    op.execute("CREATE UNLOGGED TABLE table_version_bumps (txid bigint NOT NULL)")
+
+    # The tables written so far are kept in a transaction-local setting as
+    # ",users,students,"; the first write of a transaction queues the bump
+    op.execute("""
+        CREATE FUNCTION mark_table_written() RETURNS trigger LANGUAGE plpgsql AS $$
+        DECLARE
+            pending text := coalesce(current_setting('table_versions.pending', true), '');
+        BEGIN
+            IF position(',' || TG_TABLE_NAME || ',' IN pending) = 0 THEN
+                IF pending = '' THEN
+                    INSERT INTO table_version_bumps (txid) VALUES (txid_current());
+                    pending := ',';
+                END IF;
+                PERFORM set_config('table_versions.pending', pending || TG_TABLE_NAME || ',', true);
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE FUNCTION bump_table_versions() RETURNS trigger LANGUAGE plpgsql AS $$
+        DECLARE
+            tables text[] := string_to_array(
+                trim(BOTH ',' FROM coalesce(current_setting('table_versions.pending', true), '')), ','
+            );
+        BEGIN
+            -- Rows are locked in table name order; see the lock ordering note
+            PERFORM 1 FROM table_versions WHERE table_name = ANY (tables) ORDER BY table_name FOR UPDATE;
+            UPDATE table_versions
+            SET version = version + 1, updated_at = clock_timestamp()
+            WHERE table_name = ANY (tables);
+            DELETE FROM table_version_bumps WHERE txid = NEW.txid;
+            -- Writes after SET CONSTRAINTS ... IMMEDIATE queue a new bump
+            PERFORM set_config('table_versions.pending', '', true);
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE CONSTRAINT TRIGGER table_version_bumps_at_commit
+        AFTER INSERT ON table_version_bumps
+        DEFERRABLE INITIALLY DEFERRED
+        FOR EACH ROW EXECUTE FUNCTION bump_table_versions()
+    """)
+    for table in VERSIONED_TABLES:
+        op.execute(f"""
+            CREATE TRIGGER {table}_mark_written
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION mark_table_written()
+        """)
+
+
+def downgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.execute(f"DROP TRIGGER {table}_mark_written ON {table}")
+    op.execute("DROP FUNCTION mark_table_written()")
+    op.execute("DROP TABLE table_version_bumps")
+    op.execute("DROP FUNCTION bump_table_versions()")
+    op.drop_table("table_versions")
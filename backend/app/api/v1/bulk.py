@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+from typing import Any, Dict, Iterable, List
+from fastapi import HTTPException, Request, status
+from sqlalchemy import Integer, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+from app.core.config import settings
+
+
+def _check_size(rows: List[Any]) -> None:
+    if len(rows) > settings.BULK_IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_IMPORT_MAX_ROWS} rows can be imported at once"
+        )
+
+
+def _csv_rows(lines: Iterable[str]) -> List[Dict[str, str]]:
+    # Empty cells mean "not given", so optional fields fall back to None
+    rows = []
+    for row in csv.DictReader(lines):
+        rows.append({key: value for key, value in row.items() if key and value not in ("", None)})
+        _check_size(rows)
+    return rows
+
+
+async def read_bulk_rows(request: Request) -> List[Any]:
+    """Read the rows of a bulk import: a JSON array, a text/csv body or a
+    multipart upload in a ``file`` field.
+
+    Uploaded files are parsed line by line from Starlette's spooled file, and
+    the row limit is enforced while reading.
+    """
+    content_type = request.headers.get("content-type", "")
+    
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Upload the CSV as a 'file' form field"
+            )
+        return _csv_rows(io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline=""))
+    
+    body = await request.body()
+    if "csv" in content_type:
+        return _csv_rows(io.StringIO(body.decode("utf-8-sig"), newline=""))
+    
+    try:
+        rows = json.loads(body)
+    except ValueError:
+        rows = None
+    if not isinstance(rows, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Expected a JSON array of rows or a CSV upload"
+        )
+    _check_size(rows)
+    return rows
+
+
+def id_array(name: str, ids: Iterable[int]) -> bindparam:
+    """Bind ``ids`` as one integer array, for use as ``column == any_(...)``.
+
+    One array parameter instead of one bind per id keeps bulk imports under
+    the driver's 32767 parameter limit.
+    """
+    return bindparam(name, list(ids), type_=ARRAY(Integer))
+
+
+def validation_message(exc) -> str:
+    first = exc.errors()[0]
+    field = ".".join(str(part) for part in first["loc"])
+    return f"{field}: {first['msg']}" if field else first["msg"]
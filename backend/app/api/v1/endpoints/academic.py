@@ -1,76 +1,159 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+import asyncio
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from pydantic import ValidationError
+from sqlalchemy import any_, select, func, insert, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import date
-from app.db.database import get_db
-from app.db.models import User, Attendance, Grade, Student, Course
+from app.db.database import get_async_db
+from app.db.versions import table_versions
+from app.db.models import (
+    User, RoleEnum, Attendance, AttendanceDailyRollup, AttendanceStudentRollup, AtRiskFlag, Grade, Student, Course
+)
 from app.schemas.academic import (
     AttendanceCreate, AttendanceUpdate, AttendanceResponse, AttendanceWithDetails,
-    GradeCreate, GradeUpdate, GradeResponse
+    AttendanceBulkCreate, AttendanceBulkResult, StudentCourseAttendance,
+    CourseStudentAttendance, CourseDateAttendance, CourseAttendanceSummary,
+    GradeCreate, GradeUpdate, GradeResponse, GradeBulkError, GradeBulkResult, CourseGradeStats,
+    AtRiskStudent, AtRiskScanResult
+)
+from app.auth.dependencies import get_current_user, require_faculty, require_admin
+from app.api.v1.conditional import not_modified
+from app.api.v1.pagination import paginate, finish_page
+from app.api.v1.export import EXPORT_FORMAT_PATTERN, stream_export
+from app.api.v1.bulk import id_array, read_bulk_rows, validation_message
+from app.core.cache import grade_stats_cache, stats_cache
+from app.core.config import settings
+from app.core.grading import compute_percentage, compute_percentages
+from app.services.at_risk import run_scan
+from app.services.attendance_rollups import (
+    ROLLUP_STATUSES, apply_attendance_changes, attendance_key, attendance_rate, lock_attendance_day, rebuild_rollups
 )
-from app.auth.dependencies import get_current_user, require_faculty
+from app.services.gpa import recompute_gpas
+from app.services.grading_scales import regrade_assessments
+from app.services.grade_stats import course_grade_stats
 
 router = APIRouter()
 
+ATTENDANCE_UPSERT_BATCH_SIZE = 5000  # five bind parameters per record
+
+
+def _attendance_details_query():
+    return (
+        select(
+            Attendance.id,
+            Attendance.student_id,
+            Attendance.course_id,
+            Attendance.date,
+            Attendance.status,
+            Attendance.notes,
+            Attendance.created_at,
+            User.full_name.label("student_name"),
+            Course.course_name,
+            Course.course_code
+        )
+        .outerjoin(Student, Student.id == Attendance.student_id)
+        .outerjoin(User, User.id == Student.user_id)
+        .outerjoin(Course, Course.id == Attendance.course_id)
+    )
+
+
+def _filter_attendance(
+    query,
+    student_id: Optional[int],
+    course_id: Optional[int],
+    date_from: Optional[date],
+    date_to: Optional[date]
+):
+    if student_id:
+        query = query.where(Attendance.student_id == student_id)
+    if course_id:
+        query = query.where(Attendance.course_id == course_id)
+    if date_from:
+        query = query.where(Attendance.date >= date_from)
+    if date_to:
+        query = query.where(Attendance.date <= date_to)
+    return query
+
+
+def _attendance_counts(row) -> dict:
+    counts = {column: getattr(row, column) for column in (*ROLLUP_STATUSES, "total")}
+    counts["attendance_rate"] = attendance_rate(counts["present"], counts["late"], counts["total"])
+    return counts
+
+
+def _filter_grades(query, student_id: Optional[int], course_id: Optional[int], assessment_type: Optional[str]):
+    if student_id:
+        query = query.where(Grade.student_id == student_id)
+    if course_id:
+        query = query.where(Grade.course_id == course_id)
+    if assessment_type:
+        query = query.where(Grade.assessment_type == assessment_type)
+    return query
+
 
 @router.get("/attendance/", response_model=List[AttendanceWithDetails])
 async def get_attendance(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(500, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
     student_id: Optional[int] = None,
     course_id: Optional[int] = None,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_faculty)
 ):
-    query = db.query(Attendance)
+    query = _filter_attendance(_attendance_details_query(), student_id, course_id, date_from, date_to)
     
-    if student_id:
-        query = query.filter(Attendance.student_id == student_id)
-    if course_id:
-        query = query.filter(Attendance.course_id == course_id)
-    if date_from:
-        query = query.filter(Attendance.date >= date_from)
-    if date_to:
-        query = query.filter(Attendance.date <= date_to)
-    
-    attendance_records = query.order_by(Attendance.date.desc()).offset(skip).limit(limit).all()
+    # Student and course details come from the same joined row, so a page
+    # costs one round trip regardless of its size
+    rows = (await db.execute(
+        paginate(query, [Attendance.date, Attendance.id], cursor, skip, limit, descending=True)
+    )).all()
+    rows = finish_page(response, rows, limit, lambda row: (row.date, row.id))
     
-    # Fetch student and course details
     result = []
-    for record in attendance_records:
-        student = db.query(Student).filter(Student.id == record.student_id).first()
-        course = db.query(Course).filter(Course.id == record.course_id).first()
-        
-        record_dict = {
-            "id": record.id,
-            "student_id": record.student_id,
-            "course_id": record.course_id,
-            "date": record.date,
-            "status": record.status,
-            "notes": record.notes,
-            "created_at": record.created_at,
-            "student_name": student.full_name if student else f"Student {record.student_id}",
-            "course_name": course.course_name if course else f"Course {record.course_id}",
-            "course_code": course.course_code if course else ""
-        }
+    for row in rows:
+        record_dict = dict(row._mapping)
+        record_dict.update({
+            "student_name": row.student_name or f"Student {row.student_id}",
+            "course_name": row.course_name or f"Course {row.course_id}",
+            "course_code": row.course_code or ""
+        })
         result.append(AttendanceWithDetails(**record_dict))
     
     return result
 
 
+@router.get("/attendance/export")
+async def export_attendance(
+    export_format: str = Query("csv", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    student_id: Optional[int] = None,
+    course_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    current_user: User = Depends(require_faculty)
+):
+    query = _filter_attendance(_attendance_details_query(), student_id, course_id, date_from, date_to)
+    return stream_export(query.order_by(Attendance.id), export_format, "attendance")
+
+
 @router.post("/attendance/", response_model=AttendanceResponse, status_code=status.HTTP_201_CREATED)
 async def create_attendance(
     attendance: AttendanceCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_faculty)
 ):
-    existing = db.query(Attendance).filter(
+    await lock_attendance_day(db, attendance.course_id, attendance.date)
+    existing = await db.scalar(select(Attendance).where(
         Attendance.student_id == attendance.student_id,
         Attendance.course_id == attendance.course_id,
         Attendance.date == attendance.date
-    ).first()
+    ))
     
     if existing:
         raise HTTPException(
@@ -80,18 +163,180 @@ async def create_attendance(
     
     db_attendance = Attendance(**attendance.model_dump())
     db.add(db_attendance)
-    db.commit()
-    db.refresh(db_attendance)
+    await apply_attendance_changes(db, added=[attendance_key(db_attendance)])
+    await db.commit()
+    stats_cache.clear()
+    await db.refresh(db_attendance)
     return AttendanceResponse.model_validate(db_attendance)
 
 
+@router.post("/attendance/bulk", response_model=AttendanceBulkResult)
+async def bulk_mark_attendance(
+    attendance: AttendanceBulkCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_faculty)
+):
+    if len(attendance.records) > settings.BULK_IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_IMPORT_MAX_ROWS} records can be marked at once"
+        )
+    # Last entry wins if a student appears twice; ON CONFLICT cannot touch
+    # the same row twice in one statement
+    records = {record.student_id: record for record in attendance.records}
+    if not records:
+        return AttendanceBulkResult(inserted=0, updated=0)
+    
+    course = await db.scalar(select(Course.id).where(Course.id == attendance.course_id))
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found"
+        )
+    
+    found = set((await db.scalars(select(Student.id).where(Student.id == any_(id_array("student_ids", records.keys()))))).all())
+    missing = sorted(set(records) - found)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Students not found: {missing}"
+        )
+    
+    # Rows about to be overwritten leave the rollups with their old status.
+    # The advisory lock keeps another batch for the same session from
+    # inserting rows this read cannot see yet; the row locks keep single
+    # record updates from changing a status meanwhile
+    await lock_attendance_day(db, attendance.course_id, attendance.date)
+    previous = (await db.execute(
+        select(Attendance.student_id, Attendance.course_id, Attendance.date, Attendance.status)
+        .where(
+            Attendance.course_id == attendance.course_id,
+            Attendance.date == attendance.date,
+            Attendance.student_id == any_(id_array("student_ids", records.keys()))
+        )
+        .with_for_update()
+    )).all()
+    
+    values = [
+        {
+            "student_id": record.student_id,
+            "course_id": attendance.course_id,
+            "date": attendance.date,
+            "status": record.status,
+            "notes": record.notes
+        }
+        for record in records.values()
+    ]
+    inserted_flags = []
+    # Batched to stay under the bind parameter limit of one statement
+    for start in range(0, len(values), ATTENDANCE_UPSERT_BATCH_SIZE):
+        stmt = pg_insert(Attendance).values(values[start:start + ATTENDANCE_UPSERT_BATCH_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Attendance.student_id, Attendance.course_id, Attendance.date],
+            set_={
+                "status": stmt.excluded.status,
+                "notes": stmt.excluded.notes,
+                "updated_at": func.now()
+            }
+        ).returning(literal_column("xmax = 0").label("inserted"))
+        # xmax is 0 only for rows created by this statement, which tells
+        # inserts and conflict updates apart without another query
+        inserted_flags += (await db.scalars(stmt)).all()
+    await apply_attendance_changes(db, removed=previous, added=[
+        (record.student_id, attendance.course_id, attendance.date, record.status)
+        for record in records.values()
+    ])
+    await db.commit()
+    stats_cache.clear()
+    
+    inserted = sum(1 for flag in inserted_flags if flag)
+    return AttendanceBulkResult(inserted=inserted, updated=len(inserted_flags) - inserted)
+
+
+@router.get("/attendance/rates/students/{student_id}", response_model=List[StudentCourseAttendance])
+async def get_student_attendance_rates(
+    student_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Attendance counts and rate per course for one student, read from the rollups"""
+    if current_user.role == RoleEnum.STUDENT:
+        own_student_id = await db.scalar(select(Student.id).where(Student.user_id == current_user.id))
+        if own_student_id != student_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access forbidden"
+            )
+    
+    rows = (await db.execute(
+        select(*AttendanceStudentRollup.__table__.columns, Course.course_code, Course.course_name)
+        .join(Course, Course.id == AttendanceStudentRollup.course_id)
+        .where(AttendanceStudentRollup.student_id == student_id, AttendanceStudentRollup.total > 0)
+        .order_by(Course.course_code)
+    )).all()
+    return [
+        StudentCourseAttendance(
+            course_id=row.course_id,
+            course_code=row.course_code,
+            course_name=row.course_name,
+            **_attendance_counts(row)
+        )
+        for row in rows
+    ]
+
+
+@router.get("/attendance/rates/courses/{course_id}", response_model=CourseAttendanceSummary)
+async def get_course_attendance_rates(
+    course_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_faculty)
+):
+    """Attendance counts and rates of a course per session date and per student"""
+    course = await db.scalar(select(Course.id).where(Course.id == course_id))
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found"
+        )
+    
+    by_date = (await db.execute(
+        select(AttendanceDailyRollup)
+        .where(AttendanceDailyRollup.course_id == course_id, AttendanceDailyRollup.total > 0)
+        .order_by(AttendanceDailyRollup.date)
+    )).scalars().all()
+    by_student = (await db.execute(
+        select(AttendanceStudentRollup)
+        .where(AttendanceStudentRollup.course_id == course_id, AttendanceStudentRollup.total > 0)
+        .order_by(AttendanceStudentRollup.student_id)
+    )).scalars().all()
+    
+    totals = {column: sum(getattr(row, column) for row in by_date) for column in (*ROLLUP_STATUSES, "total")}
+    totals["attendance_rate"] = attendance_rate(totals["present"], totals["late"], totals["total"])
+    return CourseAttendanceSummary(
+        course_id=course_id,
+        by_date=[CourseDateAttendance(date=row.date, **_attendance_counts(row)) for row in by_date],
+        by_student=[CourseStudentAttendance(student_id=row.student_id, **_attendance_counts(row)) for row in by_student],
+        **totals
+    )
+
+
+@router.post("/attendance/rollups/rebuild")
+async def rebuild_attendance_rollups(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_admin)
+):
+    """Recompute the attendance rollups from the attendance table (Admin only)"""
+    rebuilt = await rebuild_rollups(db)
+    return {"message": f"Rebuilt attendance rollups for {rebuilt} student-course pairs", "rebuilt_count": rebuilt}
+
+
 @router.get("/attendance/{attendance_id}", response_model=AttendanceResponse)
 async def get_attendance_by_id(
     attendance_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_faculty)
 ):
-    attendance = db.query(Attendance).filter(Attendance.id == attendance_id).first()
+    attendance = await db.scalar(select(Attendance).where(Attendance.id == attendance_id))
     if not attendance:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -104,22 +349,27 @@ async def get_attendance_by_id(
 async def update_attendance(
     attendance_id: int,
     attendance_update: AttendanceUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_faculty)
 ):
-    attendance = db.query(Attendance).filter(Attendance.id == attendance_id).first()
+    attendance = await db.scalar(select(Attendance).where(Attendance.id == attendance_id).with_for_update())
     if not attendance:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Attendance record not found"
         )
     
+    before = attendance_key(attendance)
     update_data = attendance_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(attendance, field, value)
     
-    db.commit()
-    db.refresh(attendance)
+    if (attendance.course_id, attendance.date) != before[1:3]:
+        await lock_attendance_day(db, attendance.course_id, attendance.date)
+    await apply_attendance_changes(db, removed=[before], added=[attendance_key(attendance)])
+    await db.commit()
+    stats_cache.clear()
+    await db.refresh(attendance)
     return AttendanceResponse.model_validate(attendance)
 
 
@@ -127,92 +377,182 @@ async def update_attendance(
 async def update_attendance_full(
     attendance_id: int,
     attendance_update: AttendanceUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_faculty)
 ):
-    attendance = db.query(Attendance).filter(Attendance.id == attendance_id).first()
+    attendance = await db.scalar(select(Attendance).where(Attendance.id == attendance_id).with_for_update())
     if not attendance:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Attendance record not found"
         )
     
+    before = attendance_key(attendance)
     update_data = attendance_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(attendance, field, value)
     
-    db.commit()
-    db.refresh(attendance)
+    if (attendance.course_id, attendance.date) != before[1:3]:
+        await lock_attendance_day(db, attendance.course_id, attendance.date)
+    await apply_attendance_changes(db, removed=[before], added=[attendance_key(attendance)])
+    await db.commit()
+    stats_cache.clear()
+    await db.refresh(attendance)
     return AttendanceResponse.model_validate(attendance)
 
 
 @router.delete("/attendance/{attendance_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_attendance(
     attendance_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_faculty)
 ):
-    attendance = db.query(Attendance).filter(Attendance.id == attendance_id).first()
+    attendance = await db.scalar(select(Attendance).where(Attendance.id == attendance_id).with_for_update())
     if not attendance:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Attendance record not found"
         )
     
-    db.delete(attendance)
-    db.commit()
+    await apply_attendance_changes(db, removed=[attendance_key(attendance)])
+    await db.delete(attendance)
+    await db.commit()
+    stats_cache.clear()
     return None
 
 
 @router.get("/grades/", response_model=List[GradeResponse])
 async def get_grades(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
     student_id: Optional[int] = None,
     course_id: Optional[int] = None,
     assessment_type: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    query = db.query(Grade)
+    cached = await not_modified(db, request, response, current_user, "grades")
+    if cached is not None:
+        return cached
     
-    if student_id:
-        query = query.filter(Grade.student_id == student_id)
-    if course_id:
-        query = query.filter(Grade.course_id == course_id)
-    if assessment_type:
-        query = query.filter(Grade.assessment_type == assessment_type)
+    query = _filter_grades(select(Grade), student_id, course_id, assessment_type)
     
-    grades = query.offset(skip).limit(limit).all()
+    grades = (await db.scalars(paginate(query, [Grade.id], cursor, skip, limit))).all()
+    grades = finish_page(response, grades, limit, lambda grade: (grade.id,))
     return [GradeResponse.model_validate(grade) for grade in grades]
 
 
+@router.get("/grades/export")
+async def export_grades(
+    export_format: str = Query("csv", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    student_id: Optional[int] = None,
+    course_id: Optional[int] = None,
+    assessment_type: Optional[str] = None,
+    current_user: User = Depends(require_faculty)
+):
+    query = _filter_grades(select(*Grade.__table__.columns), student_id, course_id, assessment_type)
+    return stream_export(query.order_by(Grade.id), export_format, "grades")
+
+
 @router.post("/grades/", response_model=GradeResponse, status_code=status.HTTP_201_CREATED)
 async def create_grade(
     grade: GradeCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_faculty)
 ):
     db_grade = Grade(**grade.model_dump())
-    
-    if grade.max_score > 0:
-        percentage_value = (grade.score / grade.max_score) * 100
-        setattr(db_grade, 'percentage', percentage_value)
+    db_grade.percentage = compute_percentage(grade.score, grade.max_score)
     
     db.add(db_grade)
-    db.commit()
-    db.refresh(db_grade)
+    await db.flush()
+    regraded = await regrade_assessments(db, [(db_grade.course_id, db_grade.assessment_type, db_grade.assessment_name)])
+    await recompute_gpas(db, {db_grade.student_id} | regraded.curved_student_ids)
+    await db.commit()
+    stats_cache.clear()
+    await db.refresh(db_grade)
     return GradeResponse.model_validate(db_grade)
 
 
+@router.post("/grades/bulk", response_model=GradeBulkResult)
+async def bulk_create_grades(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_faculty)
+):
+    raw_rows = await read_bulk_rows(request)
+    
+    errors: List[GradeBulkError] = []
+    rows: List[tuple] = []
+    for position, raw in enumerate(raw_rows, start=1):
+        try:
+            rows.append((position, GradeCreate.model_validate(raw)))
+        except ValidationError as exc:
+            student_id = raw.get("student_id") if isinstance(raw, dict) else None
+            errors.append(GradeBulkError(
+                row=position,
+                student_id=student_id if isinstance(student_id, int) else None,
+                error=validation_message(exc)
+            ))
+    
+    # Two set-based lookups cover every row, whatever the batch size
+    student_ids = {grade.student_id for _, grade in rows}
+    course_ids = {grade.course_id for _, grade in rows}
+    found_students = set((await db.scalars(
+        select(Student.id).where(Student.id == any_(id_array("student_ids", student_ids)))
+    )).all()) if student_ids else set()
+    found_courses = set((await db.scalars(
+        select(Course.id).where(Course.id == any_(id_array("course_ids", course_ids)))
+    )).all()) if course_ids else set()
+    
+    checked = []
+    for position, grade in rows:
+        if grade.student_id not in found_students:
+            errors.append(GradeBulkError(row=position, student_id=grade.student_id, error="Student not found"))
+        elif grade.course_id not in found_courses:
+            errors.append(GradeBulkError(row=position, student_id=grade.student_id, error="Course not found"))
+        else:
+            checked.append((position, grade))
+    
+    # Range checks and percentages run over whole columns
+    scores = np.array([grade.score for _, grade in checked], dtype=float)
+    max_scores = np.array([grade.max_score for _, grade in checked], dtype=float)
+    bad_max = max_scores <= 0
+    out_of_range = ~bad_max & ((scores < 0) | (scores > max_scores))
+    percentages = compute_percentages(scores, max_scores)
+    
+    values = []
+    for index in np.flatnonzero(bad_max | out_of_range):
+        position, grade = checked[index]
+        error = "max_score must be greater than 0" if bad_max[index] else "score must be between 0 and max_score"
+        errors.append(GradeBulkError(row=position, student_id=grade.student_id, error=error))
+    for index in np.flatnonzero(~(bad_max | out_of_range)):
+        grade = checked[index][1]
+        values.append({**grade.model_dump(), "percentage": float(percentages[index])})
+    
+    if values:
+        await db.execute(insert(Grade), values)
+        regraded = await regrade_assessments(db, {
+            (value["course_id"], value["assessment_type"], value["assessment_name"]) for value in values
+        })
+        await recompute_gpas(db, {value["student_id"] for value in values} | regraded.curved_student_ids)
+        await db.commit()
+        stats_cache.clear()
+    
+    errors.sort(key=lambda error: error.row)
+    return GradeBulkResult(inserted=len(values), errors=errors)
+
+
 @router.patch("/grades/{grade_id}", response_model=GradeResponse)
 async def update_grade(
     grade_id: int,
     grade_update: GradeUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_faculty)
 ):
-    grade = db.query(Grade).filter(Grade.id == grade_id).first()
+    grade = await db.scalar(select(Grade).where(Grade.id == grade_id))
     if not grade:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -224,30 +564,116 @@ async def update_grade(
         setattr(grade, field, value)
     
     if "score" in update_data or "max_score" in update_data:
-        max_score_val = getattr(grade, 'max_score', 0)
-        if max_score_val > 0:
-            score_val = getattr(grade, 'score', 0)
-            percentage_value = (score_val / max_score_val) * 100
-            setattr(grade, 'percentage', percentage_value)
-    
-    db.commit()
-    db.refresh(grade)
+        percentage_value = compute_percentage(grade.score, grade.max_score)
+        if percentage_value is not None:
+            grade.percentage = percentage_value
+        await db.flush()
+        regraded = await regrade_assessments(db, [(grade.course_id, grade.assessment_type, grade.assessment_name)])
+        await recompute_gpas(db, {grade.student_id} | regraded.curved_student_ids)
+    
+    await db.commit()
+    stats_cache.clear()
+    await db.refresh(grade)
     return GradeResponse.model_validate(grade)
 
 
 @router.delete("/grades/{grade_id}")
 async def delete_grade(
     grade_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_faculty)
 ):
-    grade = db.query(Grade).filter(Grade.id == grade_id).first()
+    grade = await db.scalar(select(Grade).where(Grade.id == grade_id))
     if not grade:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Grade record not found"
         )
     
-    db.delete(grade)
-    db.commit()
+    await db.delete(grade)
+    await db.flush()
+    # A curve over the assessment may shift without this grade
+    regraded = await regrade_assessments(db, [(grade.course_id, grade.assessment_type, grade.assessment_name)])
+    await recompute_gpas(db, {grade.student_id} | regraded.curved_student_ids)
+    await db.commit()
+    stats_cache.clear()
     return {"message": "Grade deleted successfully"}
+
+
+@router.get("/courses/{course_id}/grade-stats", response_model=CourseGradeStats)
+async def get_course_grade_stats(
+    course_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_faculty)
+):
+    """Mean, median, spread, histogram and student percentiles per assessment of a course"""
+    # Entries are keyed on the grades and courses write counters, so a write
+    # committed by any worker moves later reads to a new key. The counters are
+    # read first: stats computed after a concurrent write are only ever newer
+    # than their key, never older
+    versions = await table_versions(db, "grades", "courses")
+    cache_key = (course_id, versions["grades"][0], versions["courses"][0]) if versions else None
+    cached = grade_stats_cache.get(cache_key) if cache_key else None
+    if cached is not None:
+        return cached
+    
+    course = await db.scalar(select(Course.id).where(Course.id == course_id))
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found"
+        )
+    
+    grade_stats = await course_grade_stats(db, course_id)
+    if cache_key:
+        grade_stats_cache.set(cache_key, grade_stats)
+    return grade_stats
+
+
+@router.get("/at-risk", response_model=List[AtRiskStudent])
+async def get_at_risk_students(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    course_id: Optional[int] = None,
+    student_id: Optional[int] = None,
+    reason: Optional[str] = Query(None, pattern="^(low_attendance|low_grade)$"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_faculty)
+):
+    """Students flagged by the latest at-risk scan, per course"""
+    query = (
+        select(
+            *AtRiskFlag.__table__.columns,
+            User.full_name.label("student_name"),
+            Course.course_code,
+            Course.course_name
+        )
+        .join(Student, Student.id == AtRiskFlag.student_id)
+        .join(User, User.id == Student.user_id)
+        .join(Course, Course.id == AtRiskFlag.course_id)
+    )
+    if course_id:
+        query = query.where(AtRiskFlag.course_id == course_id)
+    if student_id:
+        query = query.where(AtRiskFlag.student_id == student_id)
+    if reason:
+        query = query.where(AtRiskFlag.reasons.contains(reason))
+    
+    rows = (await db.execute(
+        paginate(query, [AtRiskFlag.course_id, AtRiskFlag.student_id], cursor, 0, limit)
+    )).all()
+    rows = finish_page(response, rows, limit, lambda row: (row.course_id, row.student_id))
+    return [
+        AtRiskStudent(**{**row._mapping, "reasons": row.reasons.split(",")})
+        for row in rows
+    ]
+
+
+@router.post("/at-risk/scan", response_model=AtRiskScanResult)
+async def run_at_risk_scan(
+    current_user: User = Depends(require_admin)
+):
+    """Rerun the at-risk scan now instead of waiting for the scheduled job (Admin only)"""
+    flagged = await asyncio.to_thread(run_scan)
+    return AtRiskScanResult(flagged=flagged)
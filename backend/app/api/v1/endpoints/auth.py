@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 import httpx
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.auth.oauth import get_oauth_provider
 from app.auth.utils import create_or_update_user
-from app.core.security import create_access_token, hash_password, verify_password
+from app.core.security import create_access_token, hash_password_async, verify_password_async
 from app.core.config import settings
 from app.schemas.user import UserWithToken, UserResponse, UserRegister, UserLogin
 from app.auth.dependencies import get_current_user
@@ -14,6 +15,7 @@ import logging
 from fastapi import Header
 from typing import Dict
 from app.core.security import verify_token
+from app.core.cache import stats_cache
 
 _LAST_JWT: str | None = None
 
@@ -64,7 +66,7 @@ async def oauth_callback(
     provider: str,
     code: str = Query(...),
     state: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if provider not in ['google', 'microsoft', 'github']:
         raise HTTPException(
@@ -72,64 +74,36 @@ async def oauth_callback(
             detail=f"Invalid OAuth provider: {provider}"
         )
     
-    token_urls = {
-        'google': 'https://oauth2.googleapis.com/token',
-        'microsoft': f'https://login.microsoftonline.com/{settings.MICROSOFT_TENANT_ID}/oauth2/v2.0/token',
-        'github': 'https://github.com/login/oauth/access_token'
-    }
-    
-    token_data = {
-        'google': {
-            'code': code,
-            'client_id': settings.GOOGLE_CLIENT_ID,
-            'client_secret': settings.GOOGLE_CLIENT_SECRET,
-            'redirect_uri': settings.GOOGLE_REDIRECT_URI,
-            'grant_type': 'authorization_code'
-        },
-        'microsoft': {
-            'code': code,
-            'client_id': settings.MICROSOFT_CLIENT_ID,
-            'client_secret': settings.MICROSOFT_CLIENT_SECRET,
-            'redirect_uri': settings.MICROSOFT_REDIRECT_URI,
-            'grant_type': 'authorization_code'
-        },
-        'github': {
-            'code': code,
-            'client_id': settings.GITHUB_CLIENT_ID,
-            'client_secret': settings.GITHUB_CLIENT_SECRET,
-            'redirect_uri': settings.GITHUB_REDIRECT_URI
-        }
-    }
-    
-    async with httpx.AsyncClient() as client:
-        headers = {'Accept': 'application/json'} if provider == 'github' else {}
-        response = await client.post(
-            token_urls[provider],
-            data=token_data[provider],
-            headers=headers
-        )
-        
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=f"Failed to obtain access token: {response.text}"
-            )
-        
-        token_response = response.json()
-        access_token = token_response.get('access_token')
-        
-        if not access_token:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Access token not found in response"
-            )
-    
     oauth_provider = get_oauth_provider(provider)
     if not oauth_provider:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid OAuth provider: {provider}"
         )
+    
+    try:
+        response = await oauth_provider.exchange_code(code)
+    except httpx.HTTPError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"OAuth provider unavailable: {exc.__class__.__name__}"
+        )
+    
+    if response.status_code != 200:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"Failed to obtain access token: {response.text}"
+        )
+    
+    token_response = response.json()
+    access_token = token_response.get('access_token')
+    
+    if not access_token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Access token not found in response"
+        )
+    
     user_data = await oauth_provider.verify_token(access_token)
     
     if not user_data:
@@ -144,7 +118,7 @@ async def oauth_callback(
             detail="Email not provided by OAuth provider"
         )
     
-    user = create_or_update_user(db, user_data)
+    user = await create_or_update_user(db, user_data)
     
     jwt_token = create_access_token(
         data={
@@ -191,16 +165,16 @@ async def get_last_jwt():
 @router.post("/register", response_model=UserWithToken)
 async def register(
     user_data: UserRegister,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    hashed_password = hash_password(user_data.password)
+    hashed_password = await hash_password_async(user_data.password)
     
     new_user = User(
         email=user_data.email,
@@ -212,8 +186,9 @@ async def register(
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    stats_cache.clear()
+    await db.refresh(new_user)
     
     access_token = create_access_token(
         data={
@@ -235,9 +210,9 @@ async def register(
 @router.post("/login", response_model=UserWithToken)
 async def login(
     credentials: UserLogin,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(User).filter(User.email == credentials.email).first()
+    user = await db.scalar(select(User).where(User.email == credentials.email))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -252,7 +227,7 @@ async def login(
             detail="This account uses OAuth login. Please login with Google, Microsoft, or GitHub."
         )
     
-    if not verify_password(credentials.password, hashed_pwd):
+    if not await verify_password_async(credentials.password, hashed_pwd):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -1,74 +1,102 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from app.db.database import get_db
-from app.db.models import User, Course
+from app.db.database import get_async_db
+from app.db.models import User, Course, Enrollment, Grade
 from app.schemas.course import CourseCreate, CourseUpdate, CourseResponse, CourseWithFaculty
 from app.auth.dependencies import get_current_user, require_admin, require_faculty
+from app.api.v1.conditional import not_modified
+from app.api.v1.pagination import paginate, finish_page
+from app.core.cache import stats_cache
+from app.services.gpa import recompute_gpas
 
 router = APIRouter()
 
 
+def _course_with_faculty_query():
+    return (
+        select(Course, User.full_name.label("faculty_name"), User.email.label("faculty_email"))
+        .outerjoin(User, User.id == Course.faculty_id)
+    )
+
+
+def _course_with_faculty(row) -> CourseWithFaculty:
+    course_dict = CourseResponse.model_validate(row.Course).model_dump()
+    course_dict.update({
+        "faculty_name": row.faculty_name,
+        "faculty_email": row.faculty_email
+    })
+    return CourseWithFaculty(**course_dict)
+
+
+async def _course_student_ids(db: AsyncSession, course_id: int) -> List[int]:
+    # Students whose GPA counts this course's credits
+    return (await db.scalars(
+        select(Grade.student_id).where(Grade.course_id == course_id)
+        .union(select(Enrollment.student_id).where(Enrollment.course_id == course_id))
+    )).all()
+
+
 @router.get("/", response_model=List[CourseWithFaculty])
 async def get_courses(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
     semester: Optional[str] = None,
     is_active: Optional[bool] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    query = db.query(Course)
+    cached = await not_modified(db, request, response, current_user, "courses", "users")
+    if cached is not None:
+        return cached
+    
+    query = _course_with_faculty_query()
     
     if semester:
-        query = query.filter(Course.semester == semester)
+        query = query.where(Course.semester == semester)
     if is_active is not None:
-        query = query.filter(Course.is_active == is_active)
-    
-    courses = query.offset(skip).limit(limit).all()
+        query = query.where(Course.is_active == is_active)
     
-    result = []
-    for course in courses:
-        course_dict = CourseResponse.model_validate(course).model_dump()
-        if course.faculty:
-            course_dict.update({
-                "faculty_name": course.faculty.full_name,
-                "faculty_email": course.faculty.email
-            })
-        result.append(CourseWithFaculty(**course_dict))
-    
-    return result
+    rows = (await db.execute(paginate(query, [Course.id], cursor, skip, limit))).all()
+    rows = finish_page(response, rows, limit, lambda row: (row.Course.id,))
+    return [_course_with_faculty(row) for row in rows]
 
 
 @router.get("/{course_id}", response_model=CourseWithFaculty)
 async def get_course(
     course_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    course = db.query(Course).filter(Course.id == course_id).first()
-    if not course:
+    cached = await not_modified(db, request, response, current_user, "courses", "users")
+    if cached is not None:
+        return cached
+    
+    row = (await db.execute(
+        _course_with_faculty_query().where(Course.id == course_id)
+    )).first()
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Course not found"
         )
     
-    course_dict = CourseResponse.model_validate(course).model_dump()
-    if course.faculty:
-        course_dict.update({
-            "faculty_name": course.faculty.full_name,
-            "faculty_email": course.faculty.email
-        })
-    return CourseWithFaculty(**course_dict)
+    return _course_with_faculty(row)
 
 
 @router.post("/", response_model=CourseResponse, status_code=status.HTTP_201_CREATED)
 async def create_course(
     course: CourseCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
-    existing_course = db.query(Course).filter(Course.course_code == course.course_code).first()
+    existing_course = await db.scalar(select(Course).where(Course.course_code == course.course_code))
     if existing_course:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -76,7 +104,7 @@ async def create_course(
         )
     
     if course.faculty_id:
-        faculty = db.query(User).filter(User.id == course.faculty_id).first()
+        faculty = await db.scalar(select(User).where(User.id == course.faculty_id))
         if not faculty or faculty.role not in ["admin", "faculty"]:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -85,8 +113,9 @@ async def create_course(
     
     db_course = Course(**course.model_dump())
     db.add(db_course)
-    db.commit()
-    db.refresh(db_course)
+    await db.commit()
+    stats_cache.clear()
+    await db.refresh(db_course)
     return CourseResponse.model_validate(db_course)
 
 
@@ -94,10 +123,10 @@ async def create_course(
 async def update_course(
     course_id: int,
     course_update: CourseUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
-    course = db.query(Course).filter(Course.id == course_id).first()
+    course = await db.scalar(select(Course).where(Course.id == course_id))
     if not course:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -106,55 +135,68 @@ async def update_course(
     
     update_data = course_update.model_dump(exclude_unset=True)
     if "faculty_id" in update_data and update_data["faculty_id"]:
-        faculty = db.query(User).filter(User.id == update_data["faculty_id"]).first()
+        faculty = await db.scalar(select(User).where(User.id == update_data["faculty_id"]))
         if not faculty or faculty.role not in ["admin", "faculty"]:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid faculty ID"
             )
     
+    credits_changed = "credits" in update_data and update_data["credits"] != course.credits
     for field, value in update_data.items():
         setattr(course, field, value)
     
-    db.commit()
-    db.refresh(course)
+    if credits_changed:
+        await db.flush()
+        await recompute_gpas(db, await _course_student_ids(db, course_id))
+    
+    await db.commit()
+    stats_cache.clear()
+    await db.refresh(course)
     return CourseResponse.model_validate(course)
 
 
 @router.patch("/bulk/semester")
 async def bulk_update_course_semester(
     semester: str = Query(..., description="New semester value for all courses"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_faculty)
 ):
     """Update semester for all courses at once (Admin/Faculty only)"""
-    result = db.query(Course).update({"semester": semester})
-    db.commit()
+    result = (await db.execute(update(Course).values(semester=semester))).rowcount
+    await db.commit()
+    stats_cache.clear()
     return {"message": f"Successfully updated semester to '{semester}' for {result} courses", "updated_count": result}
 
 
 @router.delete("/{course_id}")
 async def delete_course(
     course_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
-    course = db.query(Course).filter(Course.id == course_id).first()
+    course = await db.scalar(select(Course).where(Course.id == course_id))
     if not course:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Course not found"
         )
     
-    db.delete(course)
-    db.commit()
+    # The course's grades go with it, so its students' GPAs are recomputed
+    # without them in the same transaction
+    student_ids = await _course_student_ids(db, course_id)
+    await db.delete(course)
+    await db.flush()
+    await recompute_gpas(db, student_ids)
+    await db.commit()
+    stats_cache.clear()
     return {"message": "Course deleted successfully"}
 
 
 @router.get("/faculty/my-courses", response_model=List[CourseResponse])
 async def get_my_courses(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_faculty)
 ):
-    courses = db.query(Course).filter(Course.faculty_id == current_user.id).all()
+    courses = (await db.scalars(select(Course).where(Course.faculty_id == current_user.id))).all()
     return [CourseResponse.model_validate(course) for course in courses]
@@ -1,100 +1,166 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import and_, any_, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.db.models import User, Student, Course, Enrollment
 from app.schemas.enrollment import (
-    EnrollmentCreate, EnrollmentUpdate, EnrollmentResponse, EnrollmentWithDetails
+    EnrollmentCreate, EnrollmentUpdate, EnrollmentResponse, EnrollmentWithDetails,
+    EnrollmentBulkCreate, EnrollmentBulkResult
 )
 from app.auth.dependencies import get_current_user, require_admin, require_faculty
+from app.api.v1.conditional import not_modified
+from app.api.v1.pagination import paginate, finish_page
+from app.api.v1.export import EXPORT_FORMAT_PATTERN, stream_export
+from app.api.v1.bulk import id_array
+from app.core.cache import stats_cache
+from app.core.config import settings
 
 router = APIRouter()
 
 
+def _enrollment_details_query():
+    # Student, user and course columns are projected alongside the enrollment
+    # so detail rows never trigger per-row relationship loads
+    return (
+        select(
+            Enrollment,
+            User.full_name.label("student_name"),
+            User.email.label("student_email"),
+            Student.student_id.label("student_code"),
+            Course.course_name,
+            Course.course_code
+        )
+        .join(Student, Student.id == Enrollment.student_id)
+        .join(User, User.id == Student.user_id)
+        .join(Course, Course.id == Enrollment.course_id)
+    )
+
+
+def _enrollment_with_details(row) -> EnrollmentWithDetails:
+    enrollment_dict = EnrollmentResponse.model_validate(row.Enrollment).model_dump()
+    enrollment_dict.update({
+        "student_name": row.student_name,
+        "student_email": row.student_email,
+        "student_code": row.student_code,
+        "course_name": row.course_name,
+        "course_code": row.course_code
+    })
+    return EnrollmentWithDetails(**enrollment_dict)
+
+
+def _filter_enrollments(query, student_id: Optional[int], course_id: Optional[int], status: Optional[str]):
+    if student_id:
+        query = query.where(Enrollment.student_id == student_id)
+    if course_id:
+        query = query.where(Enrollment.course_id == course_id)
+    if status:
+        query = query.where(Enrollment.status == status)
+    return query
+
+
 @router.get("/", response_model=List[EnrollmentWithDetails])
 async def get_enrollments(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
     student_id: Optional[int] = None,
     course_id: Optional[int] = None,
     status: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_faculty)
 ):
-    query = db.query(Enrollment).join(Student).join(Course)
+    cached = await not_modified(db, request, response, current_user, "enrollments", "students", "users", "courses")
+    if cached is not None:
+        return cached
     
-    if student_id:
-        query = query.filter(Enrollment.student_id == student_id)
-    if course_id:
-        query = query.filter(Enrollment.course_id == course_id)
-    if status:
-        query = query.filter(Enrollment.status == status)
-    
-    enrollments = query.offset(skip).limit(limit).all()
-    
-    result = []
-    for enrollment in enrollments:
-        enrollment_dict = EnrollmentResponse.model_validate(enrollment).model_dump()
-        enrollment_dict.update({
-            "student_name": enrollment.student.user.full_name,
-            "student_email": enrollment.student.user.email,
-            "student_code": enrollment.student.student_id,
-            "course_name": enrollment.course.course_name,
-            "course_code": enrollment.course.course_code
-        })
-        result.append(EnrollmentWithDetails(**enrollment_dict))
+    query = _filter_enrollments(_enrollment_details_query(), student_id, course_id, status)
     
-    return result
+    rows = (await db.execute(paginate(query, [Enrollment.id], cursor, skip, limit))).all()
+    rows = finish_page(response, rows, limit, lambda row: (row.Enrollment.id,))
+    return [_enrollment_with_details(row) for row in rows]
+
+
+@router.get("/export")
+async def export_enrollments(
+    export_format: str = Query("csv", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    student_id: Optional[int] = None,
+    course_id: Optional[int] = None,
+    status: Optional[str] = None,
+    current_user: User = Depends(require_faculty)
+):
+    query = (
+        select(
+            Enrollment.id,
+            Enrollment.student_id,
+            Student.student_id.label("student_code"),
+            User.full_name.label("student_name"),
+            User.email.label("student_email"),
+            Enrollment.course_id,
+            Course.course_code,
+            Course.course_name,
+            Enrollment.status,
+            Enrollment.enrollment_date
+        )
+        .join(Student, Student.id == Enrollment.student_id)
+        .join(User, User.id == Student.user_id)
+        .join(Course, Course.id == Enrollment.course_id)
+        .order_by(Enrollment.id)
+    )
+    return stream_export(_filter_enrollments(query, student_id, course_id, status), export_format, "enrollments")
 
 
 @router.get("/{enrollment_id}", response_model=EnrollmentWithDetails)
 async def get_enrollment(
     enrollment_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_faculty)
 ):
-    enrollment = db.query(Enrollment).filter(Enrollment.id == enrollment_id).first()
-    if not enrollment:
+    cached = await not_modified(db, request, response, current_user, "enrollments", "students", "users", "courses")
+    if cached is not None:
+        return cached
+    
+    row = (await db.execute(
+        _enrollment_details_query().where(Enrollment.id == enrollment_id)
+    )).first()
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Enrollment not found"
         )
     
-    enrollment_dict = EnrollmentResponse.model_validate(enrollment).model_dump()
-    enrollment_dict.update({
-        "student_name": enrollment.student.user.full_name,
-        "student_email": enrollment.student.user.email,
-        "student_code": enrollment.student.student_id,
-        "course_name": enrollment.course.course_name,
-        "course_code": enrollment.course.course_code
-    })
-    return EnrollmentWithDetails(**enrollment_dict)
+    return _enrollment_with_details(row)
 
 
 @router.post("/", response_model=EnrollmentResponse, status_code=status.HTTP_201_CREATED)
 async def create_enrollment(
     enrollment: EnrollmentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
-    student = db.query(Student).filter(Student.id == enrollment.student_id).first()
+    student = await db.scalar(select(Student).where(Student.id == enrollment.student_id))
     if not student:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Student not found"
         )
     
-    course = db.query(Course).filter(Course.id == enrollment.course_id).first()
+    course = await db.scalar(select(Course).where(Course.id == enrollment.course_id))
     if not course:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Course not found"
         )
     
-    existing = db.query(Enrollment).filter(
+    existing = await db.scalar(select(Enrollment).where(
         Enrollment.student_id == enrollment.student_id,
         Enrollment.course_id == enrollment.course_id
-    ).first()
+    ))
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -105,19 +171,92 @@ async def create_enrollment(
     enrollment_data = {k: v for k, v in enrollment.model_dump().items() if v is not None}
     db_enrollment = Enrollment(**enrollment_data)
     db.add(db_enrollment)
-    db.commit()
-    db.refresh(db_enrollment)
+    await db.commit()
+    stats_cache.clear()
+    await db.refresh(db_enrollment)
     return EnrollmentResponse.model_validate(db_enrollment)
 
 
+@router.post("/bulk", response_model=EnrollmentBulkResult)
+async def bulk_enroll(
+    cohort: EnrollmentBulkCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_admin)
+):
+    if cohort.student_ids is None and not (cohort.program or cohort.current_semester):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide student_ids or a program/current_semester filter"
+        )
+    if cohort.student_ids is not None and len(cohort.student_ids) > settings.BULK_IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_IMPORT_MAX_ROWS} students can be enrolled at once"
+        )
+    
+    course = await db.scalar(select(Course.id).where(Course.id == cohort.course_id))
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found"
+        )
+    
+    if cohort.student_ids is not None:
+        criteria = [Student.id == any_(id_array("student_ids", set(cohort.student_ids)))]
+    else:
+        criteria = []
+        if cohort.program:
+            criteria.append(Student.program == cohort.program)
+        if cohort.current_semester:
+            criteria.append(Student.current_semester == cohort.current_semester)
+    
+    # Existence and existing enrollments for the whole cohort in one query
+    rows = (await db.execute(
+        select(Student.id, Enrollment.id.label("enrollment_id"))
+        .outerjoin(Enrollment, and_(
+            Enrollment.student_id == Student.id,
+            Enrollment.course_id == cohort.course_id
+        ))
+        .where(*criteria)
+    )).all()
+    
+    found = {row.id for row in rows}
+    already_enrolled = {row.id for row in rows if row.enrollment_id is not None}
+    candidates = found - already_enrolled
+    not_found = set(cohort.student_ids or []) - found
+    
+    enrolled = set()
+    if candidates:
+        # ON CONFLICT keeps a concurrent enrollment of the same student from
+        # failing the whole cohort
+        enrolled = set((await db.scalars(
+            pg_insert(Enrollment)
+            .from_select(
+                ["student_id", "course_id", "status"],
+                select(Student.id, literal(cohort.course_id), literal(cohort.status))
+                .where(Student.id == any_(id_array("candidate_ids", candidates)))
+            )
+            .on_conflict_do_nothing(constraint="uq_enrollment_student_course")
+            .returning(Enrollment.student_id)
+        )).all())
+        await db.commit()
+        stats_cache.clear()
+    
+    return EnrollmentBulkResult(
+        enrolled=sorted(enrolled),
+        already_enrolled=sorted(already_enrolled | (candidates - enrolled)),
+        not_found=sorted(not_found)
+    )
+
+
 @router.patch("/{enrollment_id}", response_model=EnrollmentResponse)
 async def update_enrollment(
     enrollment_id: int,
     enrollment_update: EnrollmentUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
-    enrollment = db.query(Enrollment).filter(Enrollment.id == enrollment_id).first()
+    enrollment = await db.scalar(select(Enrollment).where(Enrollment.id == enrollment_id))
     if not enrollment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -128,56 +267,53 @@ async def update_enrollment(
     for field, value in update_data.items():
         setattr(enrollment, field, value)
     
-    db.commit()
-    db.refresh(enrollment)
+    await db.commit()
+    stats_cache.clear()
+    await db.refresh(enrollment)
     return EnrollmentResponse.model_validate(enrollment)
 
 
 @router.delete("/{enrollment_id}")
 async def delete_enrollment(
     enrollment_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
-    enrollment = db.query(Enrollment).filter(Enrollment.id == enrollment_id).first()
+    enrollment = await db.scalar(select(Enrollment).where(Enrollment.id == enrollment_id))
     if not enrollment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Enrollment not found"
         )
     
-    db.delete(enrollment)
-    db.commit()
+    await db.delete(enrollment)
+    await db.commit()
+    stats_cache.clear()
     return {"message": "Enrollment deleted successfully"}
 
 
 @router.get("/student/{student_id}/courses", response_model=List[EnrollmentWithDetails])
 async def get_student_enrollments(
     student_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     user_role = str(current_user.role)
     if user_role == "student":
-        student = db.query(Student).filter(Student.user_id == current_user.id).first()
+        student = await db.scalar(select(Student).where(Student.user_id == current_user.id))
         if not student or getattr(student, 'id', None) != student_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access forbidden"
             )
     
-    enrollments = db.query(Enrollment).filter(Enrollment.student_id == student_id).all()
-    
-    result = []
-    for enrollment in enrollments:
-        enrollment_dict = EnrollmentResponse.model_validate(enrollment).model_dump()
-        enrollment_dict.update({
-            "student_name": enrollment.student.user.full_name,
-            "student_email": enrollment.student.user.email,
-            "student_code": enrollment.student.student_id,
-            "course_name": enrollment.course.course_name,
-            "course_code": enrollment.course.course_code
-        })
-        result.append(EnrollmentWithDetails(**enrollment_dict))
-    
-    return result
+    cached = await not_modified(db, request, response, current_user, "enrollments", "students", "users", "courses")
+    if cached is not None:
+        return cached
+    
+    rows = (await db.execute(
+        _enrollment_details_query().where(Enrollment.student_id == student_id)
+    )).all()
+    return [_enrollment_with_details(row) for row in rows]
@@ -0,0 +1,197 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.db.database import get_async_db
+from app.db.models import User, Course, Grade, GradingScale, RoleEnum
+from app.schemas.grading import (
+    GradingScaleCreate, GradingScaleUpdate, GradingScaleResponse, RegradeResult
+)
+from app.auth.dependencies import require_admin, require_faculty
+from app.services.grading_scales import cutoff_points, regrade_in_batches, scale_criteria
+
+router = APIRouter()
+
+RECOMPUTE_DESCRIPTION = "Regrade the grades the scale applies to; pass false for large scopes and run the recompute job later"
+
+
+async def _check_scale_permission(db: AsyncSession, scope: str, course_id: Optional[int], current_user: User):
+    # Faculty manage the scales of the courses they teach; wider scopes are for admins
+    if current_user.role == RoleEnum.ADMIN:
+        return
+    if scope != "course":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can manage institution and program grading scales"
+        )
+    faculty_id = await db.scalar(select(Course.faculty_id).where(Course.id == course_id)) if course_id else None
+    if faculty_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only the course's faculty can manage its grading scales"
+        )
+
+
+async def _validate_scale(db: AsyncSession, scale: dict, scale_id: Optional[int] = None):
+    scope = scale["scope"]
+    if scope == "course" and (not scale.get("course_id") or scale.get("program")):
+        detail = "Course grading scales need a course_id and no program"
+    elif scope == "program" and (not scale.get("program") or scale.get("course_id")):
+        detail = "Program grading scales need a program and no course_id"
+    elif scope == "institution" and (scale.get("program") or scale.get("course_id")):
+        detail = "Institution grading scales take neither a program nor a course_id"
+    else:
+        detail = None
+    
+    minimums = [cutoff["min_percentage"] for cutoff in scale["cutoffs"]]
+    letters = [cutoff["letter"] for cutoff in scale["cutoffs"]]
+    if detail is None and len(set(minimums)) != len(minimums):
+        detail = "Cutoff percentages must be distinct"
+    if detail is None and len(set(letters + [scale["failing_grade"]])) != len(letters) + 1:
+        detail = "Letters must be distinct, including the failing grade"
+    if detail is None and scale["curve_mode"] in ("flat", "target_mean") and scale.get("curve_value") is None:
+        detail = f"Curve mode '{scale['curve_mode']}' needs a curve_value"
+    if detail is None:
+        pointless = [cutoff["letter"] for cutoff in scale["cutoffs"] if cutoff_points(cutoff) is None]
+        if pointless:
+            detail = f"Letters without standard grade points need grade_points: {', '.join(pointless)}"
+    if detail:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+    
+    if scope == "course":
+        course = await db.scalar(select(Course.id).where(Course.id == scale["course_id"]))
+        if not course:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Course not found"
+            )
+    
+    if scale.get("is_active", True):
+        query = select(GradingScale.id).where(
+            GradingScale.is_active.is_(True),
+            GradingScale.scope == scope,
+            GradingScale.program == scale.get("program"),
+            GradingScale.course_id == scale.get("course_id")
+        )
+        if scale_id:
+            query = query.where(GradingScale.id != scale_id)
+        existing = await db.scalar(query.limit(1))
+        if existing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"An active {scope} grading scale already exists for this target (id {existing})"
+            )
+
+
+@router.get("/", response_model=List[GradingScaleResponse])
+async def get_grading_scales(
+    scope: Optional[str] = Query(None, pattern="^(institution|program|course)$"),
+    course_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_faculty)
+):
+    query = select(GradingScale).order_by(GradingScale.id)
+    if scope:
+        query = query.where(GradingScale.scope == scope)
+    if course_id:
+        query = query.where(GradingScale.course_id == course_id)
+    return (await db.scalars(query)).all()
+
+
+@router.post("/", response_model=GradingScaleResponse, status_code=status.HTTP_201_CREATED)
+async def create_grading_scale(
+    scale: GradingScaleCreate,
+    recompute: bool = Query(True, description=RECOMPUTE_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_faculty)
+):
+    await _check_scale_permission(db, scale.scope, scale.course_id, current_user)
+    scale_data = scale.model_dump()
+    await _validate_scale(db, scale_data)
+    
+    db_scale = GradingScale(**scale_data)
+    db.add(db_scale)
+    await db.commit()
+    await db.refresh(db_scale)
+    if recompute:
+        await regrade_in_batches(db, *scale_criteria(db_scale))
+    return db_scale
+
+
+@router.patch("/{scale_id}", response_model=GradingScaleResponse)
+async def update_grading_scale(
+    scale_id: int,
+    scale_update: GradingScaleUpdate,
+    recompute: bool = Query(True, description=RECOMPUTE_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_faculty)
+):
+    db_scale = await db.scalar(select(GradingScale).where(GradingScale.id == scale_id))
+    if not db_scale:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Grading scale not found"
+        )
+    await _check_scale_permission(db, db_scale.scope, db_scale.course_id, current_user)
+    
+    update_data = scale_update.model_dump(exclude_unset=True)
+    merged = GradingScaleCreate.model_validate({
+        **GradingScaleResponse.model_validate(db_scale).model_dump(), **update_data
+    }).model_dump()
+    await _validate_scale(db, {**merged, "is_active": update_data.get("is_active", db_scale.is_active)}, scale_id)
+    
+    for field, value in update_data.items():
+        setattr(db_scale, field, merged.get(field, value))
+    await db.commit()
+    await db.refresh(db_scale)
+    if recompute:
+        await regrade_in_batches(db, *scale_criteria(db_scale))
+    return db_scale
+
+
+@router.delete("/{scale_id}")
+async def delete_grading_scale(
+    scale_id: int,
+    recompute: bool = Query(True, description=RECOMPUTE_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_faculty)
+):
+    db_scale = await db.scalar(select(GradingScale).where(GradingScale.id == scale_id))
+    if not db_scale:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Grading scale not found"
+        )
+    await _check_scale_permission(db, db_scale.scope, db_scale.course_id, current_user)
+    
+    criteria = scale_criteria(db_scale)
+    await db.delete(db_scale)
+    await db.commit()
+    updated = 0
+    if recompute:
+        _, updated = await regrade_in_batches(db, *criteria)
+    return {"message": "Grading scale deleted successfully", "regraded_count": updated}
+
+
+@router.post("/recompute", response_model=RegradeResult)
+async def recompute_letter_grades(
+    course_id: Optional[int] = None,
+    semester: Optional[str] = Query(None, description="Regrade every course of this semester, e.g. 'Fall 2025'"),
+    batch_size: int = Query(50, ge=1, le=1000, description="Courses regraded per transaction"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_admin)
+):
+    """Recompute letter grades of a course or a semester from the active scales (Admin only)"""
+    if not course_id and not semester:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Give a course_id or a semester"
+        )
+    
+    criteria = []
+    if course_id:
+        criteria.append(Grade.course_id == course_id)
+    if semester:
+        criteria.append(Course.semester == semester)
+    courses, updated = await regrade_in_batches(db, *criteria, batch_size=batch_size)
+    return RegradeResult(courses=courses, updated=updated)
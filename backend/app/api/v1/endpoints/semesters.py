@@ -1,33 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.db.models import User, Semester
 from app.schemas.semester import SemesterCreate, SemesterUpdate, SemesterResponse
 from app.auth.dependencies import get_current_user, require_admin, require_faculty
+from app.api.v1.conditional import not_modified
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[SemesterResponse])
 async def get_semesters(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all semesters (any authenticated user)"""
-    semesters = db.query(Semester).order_by(Semester.id.desc()).all()
+    cached = await not_modified(db, request, response, current_user, "semesters")
+    if cached is not None:
+        return cached
+    
+    semesters = (await db.scalars(select(Semester).order_by(Semester.id.desc()))).all()
     return semesters
 
 
 @router.post("/", response_model=SemesterResponse)
 async def create_semester(
     semester: SemesterCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_faculty)
 ):
     """Create a new semester (Admin only)"""
     # Check if semester with same name exists
-    existing = db.query(Semester).filter(Semester.name == semester.name).first()
+    existing = await db.scalar(select(Semester).where(Semester.name == semester.name))
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -41,19 +49,19 @@ async def create_semester(
         is_current=False
     )
     db.add(new_semester)
-    db.commit()
-    db.refresh(new_semester)
+    await db.commit()
+    await db.refresh(new_semester)
     return new_semester
 
 
 @router.patch("/{semester_id}/set-current")
 async def set_current_semester(
     semester_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_faculty)
 ):
     """Set a semester as the current one (Admin only)"""
-    semester = db.query(Semester).filter(Semester.id == semester_id).first()
+    semester = await db.scalar(select(Semester).where(Semester.id == semester_id))
     if not semester:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -61,11 +69,11 @@ async def set_current_semester(
         )
     
     # Unset all other semesters as current
-    db.query(Semester).update({"is_current": False})
+    await db.execute(update(Semester).values(is_current=False))
     
     # Set this one as current
-    db.query(Semester).filter(Semester.id == semester_id).update({"is_current": True})
-    db.commit()
+    await db.execute(update(Semester).where(Semester.id == semester_id).values(is_current=True))
+    await db.commit()
     
     return {"message": f"'{semester.name}' is now the current semester"}
 
@@ -73,17 +81,17 @@ async def set_current_semester(
 @router.delete("/{semester_id}")
 async def delete_semester(
     semester_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_faculty)
 ):
     """Delete a semester (Admin only)"""
-    semester = db.query(Semester).filter(Semester.id == semester_id).first()
+    semester = await db.scalar(select(Semester).where(Semester.id == semester_id))
     if not semester:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Semester not found"
         )
     
-    db.delete(semester)
-    db.commit()
+    await db.delete(semester)
+    await db.commit()
     return {"message": f"Semester '{semester.name}' deleted successfully"}
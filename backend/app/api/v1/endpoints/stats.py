@@ -0,0 +1,139 @@
+import enum
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Optional
+from app.db.database import get_async_db
+from app.db.models import User, Student, Course, Enrollment, Attendance, Grade
+from app.schemas.stats import StatsOverview, FacultyStats, StudentStats
+from app.auth.dependencies import get_current_user, require_admin, require_faculty
+from app.core.cache import stats_cache
+
+router = APIRouter()
+
+UNASSIGNED = "Unassigned"
+
+
+def _label(value) -> str:
+    if value is None or value == "":
+        return UNASSIGNED
+    if isinstance(value, enum.Enum):
+        return str(value.value)
+    return str(value)
+
+
+async def _grouped(db: AsyncSession, column, *criteria) -> Dict[str, int]:
+    query = select(column, func.count()).group_by(column)
+    if criteria:
+        query = query.where(*criteria)
+    rows = (await db.execute(query)).all()
+    return {_label(key): count for key, count in rows}
+
+
+def _rounded(value) -> Optional[float]:
+    return round(float(value), 2) if value is not None else None
+
+
+@router.get("/overview", response_model=StatsOverview)
+async def get_overview_stats(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_admin)
+):
+    cached = stats_cache.get(("overview",))
+    if cached is not None:
+        return cached
+
+    totals = (await db.execute(select(
+        select(func.count(User.id)).scalar_subquery().label("total_users"),
+        select(func.count(Student.id)).scalar_subquery().label("total_students"),
+        select(func.count(Course.id)).scalar_subquery().label("total_courses"),
+        select(func.count(Course.id)).where(Course.is_active.is_(True)).scalar_subquery().label("active_courses"),
+        select(func.count(Enrollment.id)).scalar_subquery().label("total_enrollments")
+    ))).one()
+
+    overview = StatsOverview(
+        **totals._mapping,
+        users_by_role=await _grouped(db, User.role),
+        students_by_program=await _grouped(db, Student.program),
+        students_by_semester=await _grouped(db, Student.current_semester),
+        courses_by_semester=await _grouped(db, Course.semester),
+        enrollments_by_status=await _grouped(db, Enrollment.status)
+    )
+    stats_cache.set(("overview",), overview)
+    return overview
+
+
+@router.get("/faculty", response_model=FacultyStats)
+async def get_faculty_stats(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_faculty)
+):
+    cache_key = ("faculty", current_user.id)
+    cached = stats_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    my_courses = select(Course.id).where(Course.faculty_id == current_user.id)
+    totals = (await db.execute(select(
+        select(func.count(Course.id)).where(Course.faculty_id == current_user.id)
+            .scalar_subquery().label("total_courses"),
+        select(func.count(Course.id)).where(Course.faculty_id == current_user.id, Course.is_active.is_(True))
+            .scalar_subquery().label("active_courses"),
+        select(func.count(Student.id)).scalar_subquery().label("total_students"),
+        select(func.count(func.distinct(Enrollment.student_id))).where(Enrollment.course_id.in_(my_courses))
+            .scalar_subquery().label("enrolled_students"),
+        select(func.avg(Grade.percentage)).where(Grade.course_id.in_(my_courses))
+            .scalar_subquery().label("average_percentage")
+    ))).one()
+
+    faculty_stats = FacultyStats(
+        total_courses=totals.total_courses,
+        active_courses=totals.active_courses,
+        total_students=totals.total_students,
+        enrolled_students=totals.enrolled_students,
+        average_percentage=_rounded(totals.average_percentage),
+        enrollments_by_status=await _grouped(db, Enrollment.status, Enrollment.course_id.in_(my_courses)),
+        attendance_by_status=await _grouped(db, Attendance.status, Attendance.course_id.in_(my_courses))
+    )
+    stats_cache.set(cache_key, faculty_stats)
+    return faculty_stats
+
+
+@router.get("/student", response_model=StudentStats)
+async def get_student_stats(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    cache_key = ("student", current_user.id)
+    cached = stats_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    student_id = await db.scalar(select(Student.id).where(Student.user_id == current_user.id))
+    if not student_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Student profile not found"
+        )
+
+    totals = (await db.execute(select(
+        select(func.count(Enrollment.id)).where(Enrollment.student_id == student_id)
+            .scalar_subquery().label("total_courses"),
+        select(func.avg(Grade.percentage)).where(Grade.student_id == student_id)
+            .scalar_subquery().label("average_percentage")
+    ))).one()
+    attendance_by_status = await _grouped(db, Attendance.status, Attendance.student_id == student_id)
+
+    # Late arrivals still count as attended
+    attended = attendance_by_status.get("present", 0) + attendance_by_status.get("late", 0)
+    total_attendance = sum(attendance_by_status.values())
+
+    student_stats = StudentStats(
+        total_courses=totals.total_courses,
+        average_percentage=_rounded(totals.average_percentage),
+        enrollments_by_status=await _grouped(db, Enrollment.status, Enrollment.student_id == student_id),
+        attendance_by_status=attendance_by_status,
+        attendance_rate=_rounded(attended * 100 / total_attendance) if total_attendance else None
+    )
+    stats_cache.set(cache_key, student_stats)
+    return student_stats
@@ -1,95 +1,157 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.db.database import get_db
-from app.db.models import User, Student, RoleEnum
-from app.schemas.student import StudentCreate, StudentCreateWithUser, StudentUpdate, StudentResponse, StudentWithUser
-from app.auth.dependencies import get_current_user, require_admin, require_faculty
-from app.core.security import hash_password
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from pydantic import ValidationError
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional
+from app.db.database import get_async_db
+from app.db.models import User, Student, Attendance, Grade, RoleEnum
+from app.schemas.student import (
+    StudentCreate, StudentCreateWithUser, StudentUpdate, StudentResponse, StudentWithUser,
+    StudentImportRow, StudentImportResult
+)
+from app.auth.dependencies import get_current_user, require_admin, require_faculty, invalidate_principal
+from app.core.security import hash_password_async, hash_passwords_async
+from app.api.v1.conditional import not_modified
+from app.api.v1.pagination import paginate, finish_page
+from app.api.v1.export import EXPORT_FORMAT_PATTERN, stream_export
+from app.api.v1.bulk import read_bulk_rows, validation_message
+from app.services.attendance_rollups import discard_attendance
+from app.services.gpa import recompute_all_gpas, recompute_gpas
+from app.services.grading_scales import graded_course_ids, regrade_courses
+from app.core.cache import stats_cache
 
 router = APIRouter()
 
+STUDENT_IMPORT_BATCH_SIZE = 1000
+
+
+def _student_with_user_query():
+    return (
+        select(Student, User.email, User.full_name, User.profile_picture, User.is_active)
+        .join(User, User.id == Student.user_id)
+    )
+
+
+def _student_with_user(row) -> StudentWithUser:
+    student_dict = StudentResponse.model_validate(row.Student).model_dump()
+    student_dict.update({
+        "email": row.email,
+        "full_name": row.full_name,
+        "profile_picture": row.profile_picture,
+        "is_active": row.is_active
+    })
+    return StudentWithUser(**student_dict)
+
+
+def _filter_students(query, program: Optional[str], current_semester: Optional[str]):
+    if program:
+        query = query.where(Student.program == program)
+    if current_semester:
+        query = query.where(Student.current_semester == current_semester)
+    return query
+
 
 @router.get("/", response_model=List[StudentWithUser])
 async def get_students(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
     program: Optional[str] = None,
     current_semester: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_faculty)
 ):
-    print(f"[DEBUG] get_students called by user: {current_user.email}, role: {current_user.role}")
-    query = db.query(Student).join(User)
+    cached = await not_modified(db, request, response, current_user, "students", "users")
+    if cached is not None:
+        return cached
     
-    if program:
-        query = query.filter(Student.program == program)
-    if current_semester:
-        query = query.filter(Student.current_semester == current_semester)
+    query = _filter_students(_student_with_user_query(), program, current_semester)
     
-    students = query.offset(skip).limit(limit).all()
-    print(f"[DEBUG] Found {len(students)} students in database")
+    rows = (await db.execute(paginate(query, [Student.id], cursor, skip, limit))).all()
+    rows = finish_page(response, rows, limit, lambda row: (row.Student.id,))
     
-    result = []
-    for student in students:
-        student_dict = StudentResponse.model_validate(student).model_dump()
-        student_dict.update({
-            "email": student.user.email,
-            "full_name": student.user.full_name,
-            "profile_picture": student.user.profile_picture,
-            "is_active": student.user.is_active
-        })
-        result.append(StudentWithUser(**student_dict))
+    result = [_student_with_user(row) for row in rows]
     
-    print(f"[DEBUG] Returning {len(result)} students")
     return result
 
 
+@router.get("/export")
+async def export_students(
+    export_format: str = Query("csv", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    program: Optional[str] = None,
+    current_semester: Optional[str] = None,
+    current_user: User = Depends(require_faculty)
+):
+    query = (
+        select(
+            Student.id,
+            Student.student_id,
+            User.email,
+            User.full_name,
+            Student.date_of_birth,
+            Student.phone,
+            Student.address,
+            Student.enrollment_year,
+            Student.program,
+            Student.current_semester,
+            Student.gpa,
+            User.is_active,
+            Student.created_at
+        )
+        .join(User, User.id == Student.user_id)
+        .order_by(Student.id)
+    )
+    return stream_export(_filter_students(query, program, current_semester), export_format, "students")
+
+
 @router.get("/{student_id}", response_model=StudentWithUser)
 async def get_student(
     student_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_faculty)
 ):
-    student = db.query(Student).filter(Student.id == student_id).first()
-    if not student:
+    cached = await not_modified(db, request, response, current_user, "students", "users")
+    if cached is not None:
+        return cached
+    
+    row = (await db.execute(
+        _student_with_user_query().where(Student.id == student_id)
+    )).first()
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Student not found"
         )
     
-    student_dict = StudentResponse.model_validate(student).model_dump()
-    student_dict.update({
-        "email": student.user.email,
-        "full_name": student.user.full_name,
-        "profile_picture": student.user.profile_picture,
-        "is_active": student.user.is_active
-    })
-    return StudentWithUser(**student_dict)
+    return _student_with_user(row)
 
 
 @router.post("/", response_model=StudentResponse, status_code=status.HTTP_201_CREATED)
 async def create_student(
     student: StudentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_faculty)
 ):
     if student.user_id:
-        user = db.query(User).filter(User.id == student.user_id).first()
+        user = await db.scalar(select(User).where(User.id == student.user_id))
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
         
-        existing_student = db.query(Student).filter(Student.user_id == student.user_id).first()
+        existing_student = await db.scalar(select(Student).where(Student.user_id == student.user_id))
         if existing_student:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Student profile already exists for this user"
             )
     
-    existing_student_id = db.query(Student).filter(Student.student_id == student.student_id).first()
+    existing_student_id = await db.scalar(select(Student).where(Student.student_id == student.student_id))
     if existing_student_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -102,33 +164,36 @@ async def create_student(
         db_student = Student(**student_data)
     else:
         db_student = Student(**student_data)
-        user = db.query(User).filter(User.id == student.user_id).first()
+        user = await db.scalar(select(User).where(User.id == student.user_id))
         if user and user.role != RoleEnum.STUDENT:
             user.role = RoleEnum.STUDENT
     
     db.add(db_student)
-    db.commit()
-    db.refresh(db_student)
+    await db.commit()
+    stats_cache.clear()
+    if student.user_id:
+        invalidate_principal(student.user_id)
+    await db.refresh(db_student)
     return StudentResponse.model_validate(db_student)
 
 
 @router.post("/with-user", response_model=StudentWithUser, status_code=status.HTTP_201_CREATED)
 async def create_student_with_user(
     student: StudentCreateWithUser,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_faculty)
 ):
-    existing_student_id = db.query(Student).filter(Student.student_id == student.student_id).first()
+    existing_student_id = await db.scalar(select(Student).where(Student.student_id == student.student_id))
     if existing_student_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Student ID already exists"
         )
     
-    existing_user = db.query(User).filter(User.email == student.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == student.email))
     
     if existing_user:
-        existing_student = db.query(Student).filter(Student.user_id == existing_user.id).first()
+        existing_student = await db.scalar(select(Student).where(Student.user_id == existing_user.id))
         if existing_student:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -146,8 +211,9 @@ async def create_student_with_user(
             current_semester=student.current_semester
         )
         db.add(db_student)
-        db.commit()
-        db.refresh(db_student)
+        await db.commit()
+        stats_cache.clear()
+        await db.refresh(db_student)
         
         student_dict = StudentResponse.model_validate(db_student).model_dump()
         student_dict.update({
@@ -161,12 +227,12 @@ async def create_student_with_user(
     new_user = User(
         email=student.email,
         full_name=student.full_name,
-        hashed_password=hash_password(student.password or "Student@123"),
+        hashed_password=await hash_password_async(student.password or "Student@123"),
         role=RoleEnum.STUDENT,
         is_active=True
     )
     db.add(new_user)
-    db.flush()
+    await db.flush()
     
     db_student = Student(
         user_id=new_user.id,
@@ -179,9 +245,10 @@ async def create_student_with_user(
         current_semester=student.current_semester
     )
     db.add(db_student)
-    db.commit()
-    db.refresh(db_student)
-    db.refresh(new_user)
+    await db.commit()
+    stats_cache.clear()
+    await db.refresh(db_student)
+    await db.refresh(new_user)
     
     student_dict = StudentResponse.model_validate(db_student).model_dump()
     student_dict.update({
@@ -193,14 +260,128 @@ async def create_student_with_user(
     return StudentWithUser(**student_dict)
 
 
+@router.post("/import", response_model=StudentImportResult)
+async def import_students(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_faculty)
+):
+    raw_rows = await read_bulk_rows(request)
+    results: Dict[int, StudentImportRow] = {}
+    pending = []
+    seen_emails, seen_codes = set(), set()
+    
+    for position, raw in enumerate(raw_rows, start=1):
+        try:
+            student = StudentCreateWithUser.model_validate(raw)
+        except ValidationError as exc:
+            raw = raw if isinstance(raw, dict) else {}
+            results[position] = StudentImportRow(
+                row=position,
+                student_id=str(raw["student_id"]) if raw.get("student_id") is not None else None,
+                email=str(raw["email"]) if raw.get("email") is not None else None,
+                status="error",
+                error=validation_message(exc)
+            )
+            continue
+        
+        if student.email in seen_emails or student.student_id in seen_codes:
+            results[position] = StudentImportRow(
+                row=position, student_id=student.student_id, email=student.email,
+                status="error", error="Duplicate email or student ID in this upload"
+            )
+            continue
+        seen_emails.add(student.email)
+        seen_codes.add(student.student_id)
+        pending.append((position, student))
+    
+    linked_user_ids = set()
+    for start in range(0, len(pending), STUDENT_IMPORT_BATCH_SIZE):
+        batch = pending[start:start + STUDENT_IMPORT_BATCH_SIZE]
+        
+        # Existing users (with or without a profile) and taken student IDs
+        # for the whole batch in two queries
+        existing_users = {
+            row.email: row for row in (await db.execute(
+                select(User.id, User.email, Student.id.label("profile_id"))
+                .outerjoin(Student, Student.user_id == User.id)
+                .where(User.email.in_([student.email for _, student in batch]))
+            )).all()
+        }
+        taken_codes = set((await db.scalars(
+            select(Student.student_id).where(Student.student_id.in_([student.student_id for _, student in batch]))
+        )).all())
+        
+        new_users, profiles = [], []
+        for position, student in batch:
+            existing = existing_users.get(student.email)
+            if student.student_id in taken_codes:
+                error = "Student ID already exists"
+            elif existing is not None and existing.profile_id is not None:
+                error = "A student profile already exists for this email"
+            else:
+                error = None
+            
+            if error:
+                results[position] = StudentImportRow(
+                    row=position, student_id=student.student_id, email=student.email, status="error", error=error
+                )
+            elif existing is not None:
+                profiles.append((position, student, existing.id))
+                linked_user_ids.add(existing.id)
+            else:
+                new_users.append((position, student))
+        
+        if new_users:
+            hashes = await hash_passwords_async([student.password or "Student@123" for _, student in new_users])
+            created = dict((await db.execute(
+                insert(User).returning(User.email, User.id),
+                [
+                    {
+                        "email": student.email,
+                        "full_name": student.full_name,
+                        "hashed_password": hashed,
+                        "role": RoleEnum.STUDENT,
+                        "is_active": True
+                    }
+                    for (_, student), hashed in zip(new_users, hashes)
+                ]
+            )).all())
+            profiles.extend((position, student, created[student.email]) for position, student in new_users)
+        
+        if profiles:
+            await db.execute(insert(Student), [
+                {"user_id": user_id, **student.model_dump(exclude={"email", "full_name", "password"})}
+                for _, student, user_id in profiles
+            ])
+            for position, student, user_id in profiles:
+                results[position] = StudentImportRow(
+                    row=position, student_id=student.student_id, email=student.email,
+                    status="linked" if user_id in linked_user_ids else "created"
+                )
+    
+    await db.commit()
+    stats_cache.clear()
+    for user_id in linked_user_ids:
+        invalidate_principal(user_id)
+    
+    rows = [results[position] for position in sorted(results)]
+    return StudentImportResult(
+        created=sum(row.status == "created" for row in rows),
+        linked=sum(row.status == "linked" for row in rows),
+        failed=sum(row.status == "error" for row in rows),
+        rows=rows
+    )
+
+
 @router.patch("/{student_id}", response_model=StudentResponse)
 async def update_student(
     student_id: int,
     student_update: StudentUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
-    student = db.query(Student).filter(Student.id == student_id).first()
+    student = await db.scalar(select(Student).where(Student.id == student_id))
     if not student:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -208,50 +389,80 @@ async def update_student(
         )
     
     update_data = student_update.model_dump(exclude_unset=True)
+    program_changed = "program" in update_data and update_data["program"] != student.program
     for field, value in update_data.items():
         setattr(student, field, value)
     
-    db.commit()
-    db.refresh(student)
+    if program_changed:
+        # Program grading scales apply by the student's program
+        await db.flush()
+        regraded = await regrade_courses(db, await graded_course_ids(db, Grade.student_id == student.id))
+        await recompute_gpas(db, {student.id} | regraded.curved_student_ids)
+    
+    await db.commit()
+    stats_cache.clear()
+    await db.refresh(student)
     return StudentResponse.model_validate(student)
 
 
 @router.patch("/bulk/semester")
 async def bulk_update_semester(
     semester: str = Query(..., description="New semester value for all students"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
     """Update semester for all students at once (Admin only)"""
-    result = db.query(Student).update({Student.current_semester: semester})
-    db.commit()
+    result = (await db.execute(update(Student).values(current_semester=semester))).rowcount
+    await db.commit()
+    stats_cache.clear()
     return {"message": f"Successfully updated semester to '{semester}' for {result} students", "updated_count": result}
 
 
+@router.post("/gpa/recompute")
+async def recompute_gpa(
+    chunk_size: int = Query(5000, ge=100, le=50000),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_admin)
+):
+    """Recompute every student's GPA from their grades (Admin only)"""
+    updated = await recompute_all_gpas(db, chunk_size)
+    return {"message": f"Recomputed GPA for {updated} students", "updated_count": updated}
+
+
 @router.delete("/{student_id}")
 async def delete_student(
     student_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
-    student = db.query(Student).filter(Student.id == student_id).first()
+    student = await db.scalar(select(Student).where(Student.id == student_id))
     if not student:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Student not found"
         )
     
-    db.delete(student)
-    db.commit()
+    # The per-course daily rollups outlive the student, so their attendance
+    # comes out of them before the cascade removes it
+    await discard_attendance(db, Attendance.student_id == student.id)
+    # Curves are worked out over everyone graded, so the courses the student
+    # leaves are regraded without their grades
+    course_ids = await graded_course_ids(db, Grade.student_id == student.id)
+    await db.delete(student)
+    await db.flush()
+    regraded = await regrade_courses(db, course_ids)
+    await recompute_gpas(db, regraded.curved_student_ids)
+    await db.commit()
+    stats_cache.clear()
     return {"message": "Student deleted successfully"}
 
 
 @router.get("/me/profile", response_model=StudentWithUser)
 async def get_my_student_profile(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    student = db.query(Student).filter(Student.user_id == current_user.id).first()
+    student = await db.scalar(select(Student).where(Student.user_id == current_user.id))
     if not student:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
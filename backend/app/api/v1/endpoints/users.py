@@ -1,41 +1,50 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from app.db.database import get_db
-from app.db.models import User, RoleEnum
+from app.db.database import get_async_db
+from app.db.models import User, Student, Attendance, Grade, RoleEnum
 from app.schemas.user import UserResponse, UserUpdate
-from app.auth.dependencies import get_current_user, require_admin
+from app.auth.dependencies import get_current_user, require_admin, invalidate_principal
+from app.api.v1.pagination import paginate, finish_page
+from app.core.cache import stats_cache
+from app.services.attendance_rollups import discard_attendance
+from app.services.gpa import recompute_gpas
+from app.services.grading_scales import graded_course_ids, regrade_courses
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[UserResponse])
 async def get_users(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
     role: Optional[RoleEnum] = None,
     is_active: Optional[bool] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
-    query = db.query(User)
+    query = select(User)
     
     if role:
-        query = query.filter(User.role == role)
+        query = query.where(User.role == role)
     if is_active is not None:
-        query = query.filter(User.is_active == is_active)
+        query = query.where(User.is_active == is_active)
     
-    users = query.offset(skip).limit(limit).all()
+    users = (await db.scalars(paginate(query, [User.id], cursor, skip, limit))).all()
+    users = finish_page(response, users, limit, lambda user: (user.id,))
     return [UserResponse.model_validate(user) for user in users]
 
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -48,10 +57,10 @@ async def get_user(
 async def update_user(
     user_id: int,
     user_update: UserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -62,18 +71,20 @@ async def update_user(
     for field, value in update_data.items():
         setattr(user, field, value)
     
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    stats_cache.clear()
+    invalidate_principal(user_id)
+    await db.refresh(user)
     return UserResponse.model_validate(user)
 
 
 @router.delete("/{user_id}")
 async def delete_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -86,6 +97,16 @@ async def delete_user(
             detail="Cannot delete your own account"
         )
     
-    db.delete(user)
-    db.commit()
+    await discard_attendance(
+        db, Attendance.student_id.in_(select(Student.id).where(Student.user_id == user.id))
+    )
+    # A student's grades go with the user; curved courses are regraded without them
+    course_ids = await graded_course_ids(db, Student.user_id == user.id)
+    await db.delete(user)
+    await db.flush()
+    regraded = await regrade_courses(db, course_ids)
+    await recompute_gpas(db, regraded.curved_student_ids)
+    await db.commit()
+    stats_cache.clear()
+    invalidate_principal(user_id)
     return {"message": "User deleted successfully"}
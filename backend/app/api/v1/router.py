@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, users, students, courses, enrollments, academic, semesters
+from app.api.v1.endpoints import auth, users, students, courses, enrollments, academic, grading_scales, semesters, stats
 
 api_router = APIRouter()
 
@@ -9,4 +9,6 @@ api_router.include_router(students.router, prefix="/students", tags=["Students"]
 api_router.include_router(courses.router, prefix="/courses", tags=["Courses"])
 api_router.include_router(enrollments.router, prefix="/enrollments", tags=["Enrollments"])
 api_router.include_router(academic.router, prefix="/academic", tags=["Academic"])
+api_router.include_router(grading_scales.router, prefix="/grading-scales", tags=["Grading Scales"])
 api_router.include_router(semesters.router, prefix="/semesters", tags=["Semesters"])
+api_router.include_router(stats.router, prefix="/stats", tags=["Statistics"])
@@ -1,23 +1,42 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from typing import Optional
+from sqlalchemy import select, inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, Optional
 from app.core.security import verify_token
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.db.models import User, RoleEnum
+from app.core.cache import principal_cache
+import logging
 
 security = HTTPBearer()
+logger = logging.getLogger(__name__)
+
+
+def _principal_snapshot(user: User) -> Dict[str, Any]:
+    return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
+
+def _principal_from_snapshot(snapshot: Dict[str, Any]) -> User:
+    # Rebuilt as a detached instance so it can never be flushed as a new row;
+    # callers only read column attributes from the current user
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return user
+
+
+def invalidate_principal(user_id: int) -> None:
+    principal_cache.invalidate(user_id)
 
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     token = credentials.credentials
     payload = verify_token(token)
-    import logging
-    logger = logging.getLogger(__name__)
-    logger.info("Auth debug: token len=%s payload=%s", len(token) if token else None, payload)
+    logger.debug("Auth token decoded: len=%s sub=%s", len(token) if token else None, payload and payload.get("sub"))
     
     if not payload:
         raise HTTPException(
@@ -41,7 +60,17 @@ async def get_current_user(
             detail="Invalid authentication credentials",
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
+    # A hit costs no query. Writes through the API evict the entry in the
+    # worker that handled them; other workers pick the change up within
+    # AUTH_CACHE_TTL_SECONDS
+    snapshot = principal_cache.get(user_id)
+    if snapshot is not None:
+        user = _principal_from_snapshot(snapshot)
+    else:
+        user = await db.scalar(select(User).where(User.id == user_id))
+        if user:
+            principal_cache.set(user_id, _principal_snapshot(user))
+    
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -2,47 +2,97 @@ import httpx
 from typing import Dict, Optional
 from app.core.config import settings
 
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    # Retries only cover failed connection attempts, so a single-use
+    # authorization code is never submitted twice
+    return httpx.AsyncClient(
+        transport=httpx.AsyncHTTPTransport(retries=settings.OAUTH_HTTP_RETRIES),
+        timeout=httpx.Timeout(settings.OAUTH_HTTP_TIMEOUT_SECONDS, connect=5.0),
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = _build_http_client()
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 class OAuthProvider:
-    
+
+    TOKEN_URL: str = ""
+    TOKEN_HEADERS: Dict[str, str] = {}
+
+    def token_request_data(self, code: str) -> Dict[str, str]:
+        raise NotImplementedError
+
+    async def exchange_code(self, code: str) -> httpx.Response:
+        return await get_http_client().post(
+            self.TOKEN_URL,
+            data=self.token_request_data(code),
+            headers=self.TOKEN_HEADERS
+        )
+
     async def verify_token(self, token: str) -> Optional[Dict]:
         raise NotImplementedError
 
 
 class GoogleOAuth(OAuthProvider):
-    
+
+    TOKEN_URL = "https://oauth2.googleapis.com/token"
     TOKEN_INFO_URL = "https://oauth2.googleapis.com/tokeninfo"
     USERINFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
-    
+
+    def token_request_data(self, code: str) -> Dict[str, str]:
+        return {
+            'code': code,
+            'client_id': settings.GOOGLE_CLIENT_ID,
+            'client_secret': settings.GOOGLE_CLIENT_SECRET,
+            'redirect_uri': settings.GOOGLE_REDIRECT_URI,
+            'grant_type': 'authorization_code'
+        }
+
     async def verify_token(self, access_token: str) -> Optional[Dict]:
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    self.USERINFO_URL,
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
-                
-                if response.status_code != 200:
-                    return None
-                
-                user_info = response.json()
-                
-                return {
-                    "oauth_id": user_info.get("id"),
-                    "email": user_info.get("email"),
-                    "full_name": user_info.get("name"),
-                    "profile_picture": user_info.get("picture"),
-                    "provider": "google"
-                }
-            except Exception:
+        try:
+            response = await get_http_client().get(
+                self.USERINFO_URL,
+                headers={"Authorization": f"Bearer {access_token}"}
+            )
+
+            if response.status_code != 200:
                 return None
 
+            user_info = response.json()
+
+            return {
+                "oauth_id": user_info.get("id"),
+                "email": user_info.get("email"),
+                "full_name": user_info.get("name"),
+                "profile_picture": user_info.get("picture"),
+                "provider": "google"
+            }
+        except Exception:
+            return None
+
 
 class MicrosoftOAuth(OAuthProvider):
-    
+
     USERINFO_URL = "https://graph.microsoft.com/v1.0/me"
-    PHOTO_URL = "https://graph.microsoft.com/v1.0/me/photo/$value"
-    
+
+    def __init__(self):
+        self.TOKEN_URL = f"https://login.microsoftonline.com/{settings.MICROSOFT_TENANT_ID}/oauth2/v2.0/token"
+
     @staticmethod
     def normalize_microsoft_email(email: str) -> str:
         if "#EXT#@" in email:
@@ -50,93 +100,102 @@ class MicrosoftOAuth(OAuthProvider):
             normalized = parts.replace("_", "@")
             return normalized
         return email
-    
+
+    def token_request_data(self, code: str) -> Dict[str, str]:
+        return {
+            'code': code,
+            'client_id': settings.MICROSOFT_CLIENT_ID,
+            'client_secret': settings.MICROSOFT_CLIENT_SECRET,
+            'redirect_uri': settings.MICROSOFT_REDIRECT_URI,
+            'grant_type': 'authorization_code'
+        }
+
     async def verify_token(self, access_token: str) -> Optional[Dict]:
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    self.USERINFO_URL,
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
-                
-                if response.status_code != 200:
-                    return None
-                
-                user_info = response.json()
-                
-                profile_picture = None
-                try:
-                    photo_response = await client.get(
-                        self.PHOTO_URL,
-                        headers={"Authorization": f"Bearer {access_token}"}
-                    )
-                    if photo_response.status_code == 200:
-                        pass
-                except Exception:
-                    pass
-                
-                raw_email = user_info.get("userPrincipalName") or user_info.get("mail")
-                normalized_email = self.normalize_microsoft_email(raw_email) if raw_email else None
-                
-                return {
-                    "oauth_id": user_info.get("id"),
-                    "email": normalized_email,
-                    "full_name": user_info.get("displayName"),
-                    "profile_picture": profile_picture,
-                    "provider": "microsoft"
-                }
-            except Exception:
+        try:
+            response = await get_http_client().get(
+                self.USERINFO_URL,
+                headers={"Authorization": f"Bearer {access_token}"}
+            )
+
+            if response.status_code != 200:
                 return None
 
+            user_info = response.json()
+
+            # Graph only serves the photo as raw bytes, which cannot be stored
+            # in profile_picture, so it is not fetched
+            raw_email = user_info.get("userPrincipalName") or user_info.get("mail")
+            normalized_email = self.normalize_microsoft_email(raw_email) if raw_email else None
+
+            return {
+                "oauth_id": user_info.get("id"),
+                "email": normalized_email,
+                "full_name": user_info.get("displayName"),
+                "profile_picture": None,
+                "provider": "microsoft"
+            }
+        except Exception:
+            return None
+
 
 class GitHubOAuth(OAuthProvider):
-    
+
+    TOKEN_URL = "https://github.com/login/oauth/access_token"
+    TOKEN_HEADERS = {"Accept": "application/json"}
     USERINFO_URL = "https://api.github.com/user"
     EMAILS_URL = "https://api.github.com/user/emails"
-    
+
+    def token_request_data(self, code: str) -> Dict[str, str]:
+        return {
+            'code': code,
+            'client_id': settings.GITHUB_CLIENT_ID,
+            'client_secret': settings.GITHUB_CLIENT_SECRET,
+            'redirect_uri': settings.GITHUB_REDIRECT_URI
+        }
+
     async def verify_token(self, access_token: str) -> Optional[Dict]:
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    self.USERINFO_URL,
+        client = get_http_client()
+        try:
+            response = await client.get(
+                self.USERINFO_URL,
+                headers={
+                    "Authorization": f"token {access_token}",
+                    "Accept": "application/vnd.github.v3+json"
+                }
+            )
+
+            if response.status_code != 200:
+                return None
+
+            user_info = response.json()
+
+            email = user_info.get("email")
+            if not email:
+                emails_response = await client.get(
+                    self.EMAILS_URL,
                     headers={
                         "Authorization": f"token {access_token}",
                         "Accept": "application/vnd.github.v3+json"
                     }
                 )
-                
-                if response.status_code != 200:
-                    return None
-                
-                user_info = response.json()
-                
-                email = user_info.get("email")
-                if not email:
-                    emails_response = await client.get(
-                        self.EMAILS_URL,
-                        headers={
-                            "Authorization": f"token {access_token}",
-                            "Accept": "application/vnd.github.v3+json"
-                        }
+                if emails_response.status_code == 200:
+                    emails = emails_response.json()
+                    primary_email = next(
+                        (e for e in emails if e.get("primary")),
+                        emails[0] if emails else None
                     )
-                    if emails_response.status_code == 200:
-                        emails = emails_response.json()
-                        primary_email = next(
-                            (e for e in emails if e.get("primary")),
-                            emails[0] if emails else None
-                        )
-                        if primary_email:
-                            email = primary_email.get("email")
-                
-                return {
-                    "oauth_id": str(user_info.get("id")),
-                    "email": email,
-                    "full_name": user_info.get("name") or user_info.get("login"),
-                    "profile_picture": user_info.get("avatar_url"),
-                    "provider": "github"
-                }
-            except Exception:
-                return None
+                    if primary_email:
+                        email = primary_email.get("email")
+
+            return {
+                "oauth_id": str(user_info.get("id")),
+                "email": email,
+                "full_name": user_info.get("name") or user_info.get("login"),
+                "profile_picture": user_info.get("avatar_url"),
+                "provider": "github"
+            }
+        except Exception:
+            return None
 
 
 google_oauth = GoogleOAuth()
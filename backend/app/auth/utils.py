@@ -1,6 +1,9 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.models import User, RoleEnum
 from app.core.config import settings
+from app.core.cache import stats_cache
+from app.auth.dependencies import invalidate_principal
 from typing import Dict
 
 
@@ -17,12 +20,12 @@ def determine_user_role(email: str) -> RoleEnum:
     return RoleEnum.STUDENT
 
 
-def create_or_update_user(db: Session, user_data: Dict) -> User:
+async def create_or_update_user(db: AsyncSession, user_data: Dict) -> User:
     email = user_data.get("email")
     
     current_role = determine_user_role(email)
     
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(select(User).where(User.email == email))
     
     if user:
         user.full_name = user_data.get("full_name", user.full_name)
@@ -42,6 +45,8 @@ def create_or_update_user(db: Session, user_data: Dict) -> User:
         )
         db.add(user)
     
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    stats_cache.clear()
+    await db.refresh(user)
+    invalidate_principal(user.id)
     return user
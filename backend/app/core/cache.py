@@ -0,0 +1,81 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+from app.core.config import settings
+from app.core import metrics
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Small in-process LRU cache whose entries expire after ``ttl`` seconds.
+
+    Each worker process holds its own copy, so entries are only ever as stale
+    as the TTL even when another worker handled the write.
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = 30.0):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        _registry[name] = self
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING or entry[0] < time.monotonic():
+            if entry is not _MISSING:
+                del self._entries[key]
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+_registry: Dict[str, TTLCache] = {}
+
+
+def get_cache(name: str) -> Optional[TTLCache]:
+    return _registry.get(name)
+
+
+def all_caches() -> Dict[str, TTLCache]:
+    return dict(_registry)
+
+
+def _collect_cache_metrics():
+    for name, cache in _registry.items():
+        metrics.cache_hits_total.set_total(cache.hits, cache=name)
+        metrics.cache_misses_total.set_total(cache.misses, cache=name)
+        metrics.cache_entries.set(len(cache._entries), cache=name)
+
+
+metrics.register_collector(_collect_cache_metrics)
+
+
+stats_cache = TTLCache("stats", maxsize=512, ttl=settings.STATS_CACHE_TTL_SECONDS)
+# Keyed by course id and the grades/courses table versions, so writes from any
+# worker make older entries unreachable; the TTL only bounds memory
+grade_stats_cache = TTLCache("grade_stats", maxsize=256, ttl=settings.GRADE_STATS_CACHE_TTL_SECONDS)
+# Evicted by user writes in this worker; the TTL bounds staleness in the others
+principal_cache = TTLCache(
+    "principal", maxsize=settings.AUTH_CACHE_MAXSIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS
+)
@@ -1,10 +1,11 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    ASYNC_DATABASE_URL: Optional[str] = None
     
     # JWT
     SECRET_KEY: str
@@ -27,9 +28,47 @@ class Settings(BaseSettings):
     GITHUB_CLIENT_SECRET: str
     GITHUB_REDIRECT_URI: str
     
+    # OAuth - outbound HTTP
+    OAUTH_HTTP_TIMEOUT_SECONDS: float = 10.0
+    OAUTH_HTTP_RETRIES: int = 2
+    
     # Frontend
     FRONTEND_URL: str
     
+    # Startup - set to false to skip the Alembic revision check
+    SCHEMA_CHECK_ON_STARTUP: bool = True
+    
+    # Password hashing
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_LIMIT: int = 64
+    
+    # Request profiling
+    PROFILING_ENABLED: bool = True
+    PROFILE_SLOW_REQUEST_MS: float = 500.0
+    PROFILE_MAX_STATEMENTS: int = 20
+    PROFILE_N_PLUS_ONE_THRESHOLD: int = 5
+    
+    # Metrics - set METRICS_MULTIPROC_DIR when running several workers
+    METRICS_ENABLED: bool = True
+    METRICS_MULTIPROC_DIR: Optional[str] = None
+    METRICS_FLUSH_INTERVAL_SECONDS: float = 5.0
+    
+    # Bulk imports
+    BULK_IMPORT_MAX_ROWS: int = 50000
+    
+    # At-risk detection - students below either threshold in a course are flagged
+    AT_RISK_MIN_ATTENDANCE_RATE: float = 75.0
+    AT_RISK_MIN_GRADE_PERCENTAGE: float = 60.0
+    AT_RISK_MIN_SESSIONS: int = 3  # fewer recorded sessions never flag attendance
+    AT_RISK_CHUNK_SIZE: int = 5000  # students per worker task
+    AT_RISK_WORKERS: int = 4
+    
+    # Caching
+    STATS_CACHE_TTL_SECONDS: float = 30.0
+    GRADE_STATS_CACHE_TTL_SECONDS: float = 300.0
+    AUTH_CACHE_TTL_SECONDS: float = 60.0
+    AUTH_CACHE_MAXSIZE: int = 10000
+    
     # Role Assignment
     ADMIN_EMAILS: str = ""
     FACULTY_EMAILS: str = ""
@@ -0,0 +1,125 @@
+from typing import Optional, Sequence, Tuple
+import numpy as np
+
+# Lower bound of each letter grade, in percent, from lowest to highest
+LETTER_GRADE_CUTOFFS = [
+    (60.0, "D-"), (63.0, "D"), (67.0, "D+"),
+    (70.0, "C-"), (73.0, "C"), (77.0, "C+"),
+    (80.0, "B-"), (83.0, "B"), (87.0, "B+"),
+    (90.0, "A-"), (93.0, "A"),
+]
+FAILING_GRADE = "F"
+
+# How a grading scale adjusts an assessment's percentages before they are
+# mapped to letters; curves only ever raise a grade, and never past 100
+CURVE_MODES = ("none", "flat", "top_score", "target_mean")
+# Curves that depend on the rest of the assessment's results
+RELATIVE_CURVE_MODES = ("top_score", "target_mean")
+
+# Grade points on the 4.0 scale used for GPA
+GRADE_POINTS = {
+    "A": 4.0, "A-": 3.7, "B+": 3.3, "B": 3.0, "B-": 2.7, "C+": 2.3,
+    "C": 2.0, "C-": 1.7, "D+": 1.3, "D": 1.0, "D-": 0.7, "F": 0.0,
+}
+
+_cutoffs = np.array([cutoff for cutoff, _ in LETTER_GRADE_CUTOFFS])
+_letters = np.array([FAILING_GRADE] + [letter for _, letter in LETTER_GRADE_CUTOFFS], dtype=object)
+_points = np.array([GRADE_POINTS[letter] for letter in _letters])
+
+
+def compute_percentage(score: float, max_score: float) -> Optional[float]:
+    if max_score <= 0:
+        return None
+    return round(score / max_score * 100, 2)
+
+
+def letter_grade(percentage: Optional[float]) -> Optional[str]:
+    if percentage is None:
+        return None
+    return _letters[np.searchsorted(_cutoffs, percentage, side="right")]
+
+
+def compute_percentages(scores: Sequence[float], max_scores: Sequence[float]) -> np.ndarray:
+    """Percentages for whole columns of scores; NaN where max_score <= 0."""
+    scores = np.asarray(scores, dtype=float)
+    max_scores = np.asarray(max_scores, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percentages = np.where(max_scores > 0, scores / max_scores * 100, np.nan)
+    return np.round(percentages, 2)
+
+
+def letter_grades(
+    percentages: Sequence[float],
+    cutoffs: Optional[Sequence[Tuple[float, str]]] = None,
+    failing_grade: str = FAILING_GRADE
+) -> np.ndarray:
+    """Letters for whole columns of percentages, on ``cutoffs`` or the default scale."""
+    bounds, letters = _cutoffs, _letters
+    if cutoffs is not None:
+        bounds = np.array([float(cutoff) for cutoff, _ in cutoffs])
+        letters = np.array([failing_grade] + [letter for _, letter in cutoffs], dtype=object)
+    percentages = np.asarray(percentages, dtype=float)
+    result = letters[np.searchsorted(bounds, np.nan_to_num(percentages, nan=-1.0), side="right")]
+    result[np.isnan(percentages)] = None
+    return result
+
+
+def group_stats(percentages: Sequence[float], groups: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Top and mean percentage of each row's group, one value per row."""
+    percentages = np.asarray(percentages, dtype=float)
+    groups = np.asarray(groups, dtype=np.int64)
+    if not len(percentages):
+        return percentages, percentages
+    tops = np.zeros(groups.max() + 1)
+    np.maximum.at(tops, groups, percentages)
+    means = np.bincount(groups, weights=percentages) / np.bincount(groups)
+    return tops[groups], means[groups]
+
+
+def curve_with_stats(
+    percentages: Sequence[float],
+    tops: Optional[Sequence[float]],
+    means: Optional[Sequence[float]],
+    mode: str,
+    value: Optional[float] = None
+) -> np.ndarray:
+    """Curved percentages, given the top and mean of each row's assessment.
+
+    ``flat`` adds ``value`` points, ``top_score`` scales the best result up
+    to 100 and ``target_mean`` shifts the assessment so its mean becomes
+    ``value``. Only the relative modes read ``tops`` and ``means``.
+    """
+    percentages = np.asarray(percentages, dtype=float)
+    if mode == "none" or not len(percentages):
+        return percentages
+    if mode == "flat":
+        curved = percentages + (value or 0.0)
+    elif mode == "top_score":
+        tops = np.asarray(tops, dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            curved = np.where(tops > 0, percentages * 100 / tops, percentages)
+    elif mode == "target_mean":
+        curved = percentages + ((value or 0.0) - np.asarray(means, dtype=float))
+    else:
+        raise ValueError(f"Unknown curve mode: {mode}")
+    return np.round(np.where(curved > percentages, np.minimum(curved, 100.0), percentages), 2)
+
+
+def grade_points(
+    percentages: Sequence[float],
+    cutoffs: Optional[Sequence[Tuple[float, float]]] = None
+) -> np.ndarray:
+    """Grade points for whole columns of percentages.
+
+    ``cutoffs`` are (min_percentage, points) pairs in ascending order; below
+    the first one a result is failing and earns no points. Without them the
+    default scale is used.
+    """
+    bounds, points = _cutoffs, _points
+    if cutoffs is not None:
+        bounds = np.array([float(cutoff) for cutoff, _ in cutoffs])
+        points = np.array([GRADE_POINTS[FAILING_GRADE]] + [float(value) for _, value in cutoffs])
+    percentages = np.asarray(percentages, dtype=float)
+    result = points[np.searchsorted(bounds, np.nan_to_num(percentages, nan=-1.0), side="right")]
+    result[np.isnan(percentages)] = np.nan
+    return result
@@ -0,0 +1,271 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metric:
+    TYPE = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        _registry[name] = self
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def samples(self) -> List[list]:
+        return [[list(key), value] for key, value in self._values.items()]
+
+
+class Counter(Metric):
+    TYPE = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set_total(self, value: float, **labels) -> None:
+        # For totals that are counted elsewhere, such as cache hits
+        self._values[self._key(labels)] = float(value)
+
+
+class Gauge(Metric):
+    TYPE = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        self._values[self._key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    TYPE = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        # Per-bucket (non-cumulative) counts, then sum and count
+        state = self._values.get(key)
+        if state is None:
+            state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                state[index] += 1
+                break
+        state[-2] += value
+        state[-1] += 1
+
+
+_registry: Dict[str, Metric] = {}
+_collectors: List[Callable[[], None]] = []
+
+
+def register_collector(collector: Callable[[], None]) -> None:
+    """Registers a callback that refreshes gauges right before a snapshot."""
+    _collectors.append(collector)
+
+
+def snapshot() -> Dict[str, dict]:
+    for collector in _collectors:
+        try:
+            collector()
+        except Exception:
+            logger.exception("Metrics collector failed")
+    return {
+        name: {
+            "type": metric.TYPE,
+            "help": metric.documentation,
+            "labels": list(metric.labelnames),
+            "buckets": list(getattr(metric, "buckets", ())),
+            "samples": metric.samples(),
+        }
+        for name, metric in _registry.items()
+    }
+
+
+# Multi-process support: with uvicorn --workers each process keeps its own
+# registry and flushes it to METRICS_MULTIPROC_DIR; whichever worker serves
+# /metrics merges every file.
+
+def _snapshot_path(pid: int) -> str:
+    return os.path.join(settings.METRICS_MULTIPROC_DIR, f"metrics-{pid}.json")
+
+
+def write_snapshot() -> None:
+    if not settings.METRICS_MULTIPROC_DIR:
+        return
+    os.makedirs(settings.METRICS_MULTIPROC_DIR, exist_ok=True)
+    path = _snapshot_path(os.getpid())
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as fh:
+        json.dump(snapshot(), fh)
+    os.replace(tmp_path, path)
+
+
+def _read_snapshots() -> List[Tuple[bool, Dict[str, dict]]]:
+    stale_after = settings.METRICS_FLUSH_INTERVAL_SECONDS * 3
+    now = time.time()
+    snapshots = []
+    for filename in os.listdir(settings.METRICS_MULTIPROC_DIR):
+        if not (filename.startswith("metrics-") and filename.endswith(".json")):
+            continue
+        path = os.path.join(settings.METRICS_MULTIPROC_DIR, filename)
+        try:
+            live = now - os.path.getmtime(path) <= stale_after
+            with open(path) as fh:
+                snapshots.append((live, json.load(fh)))
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+
+def _merge(snapshots: List[Tuple[bool, Dict[str, dict]]]) -> Dict[str, dict]:
+    merged: Dict[str, dict] = {}
+    for live, data in snapshots:
+        for name, family in data.items():
+            # Gauges describe the present, so exited workers no longer count
+            if family["type"] == "gauge" and not live:
+                continue
+            target = merged.setdefault(name, {**family, "samples": {}})
+            for labels, value in family["samples"]:
+                key = tuple(labels)
+                current = target["samples"].get(key)
+                if current is None:
+                    target["samples"][key] = value
+                elif isinstance(value, list):
+                    target["samples"][key] = [a + b for a, b in zip(current, value)]
+                else:
+                    target["samples"][key] = current + value
+    for family in merged.values():
+        family["samples"] = [[list(key), value] for key, value in family["samples"].items()]
+    return merged
+
+
+def collect() -> Dict[str, dict]:
+    if not settings.METRICS_MULTIPROC_DIR:
+        return snapshot()
+    write_snapshot()
+    return _merge(_read_snapshots())
+
+
+async def flush_periodically() -> None:
+    while True:
+        await asyncio.sleep(settings.METRICS_FLUSH_INTERVAL_SECONDS)
+        try:
+            write_snapshot()
+        except OSError:
+            logger.exception("Could not write metrics snapshot")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def render(families: Dict[str, dict]) -> str:
+    """Renders metric families in the Prometheus text exposition format."""
+    lines = []
+    for name, family in sorted(families.items()):
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        labelnames = family["labels"]
+        for labels, value in family["samples"]:
+            if family["type"] != "histogram":
+                lines.append(f"{name}{_format_labels(labelnames, labels)} {_format_number(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(family["buckets"], value):
+                cumulative += count
+                le = ("le", _format_number(bound))
+                lines.append(f"{name}_bucket{_format_labels(labelnames, labels, le)} {cumulative}")
+            lines.append(f"{name}_bucket{_format_labels(labelnames, labels, ('le', '+Inf'))} {value[-1]}")
+            lines.append(f"{name}_sum{_format_labels(labelnames, labels)} {_format_number(value[-2])}")
+            lines.append(f"{name}_count{_format_labels(labelnames, labels)} {value[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+http_requests_total = Counter(
+    "http_requests_total", "HTTP requests by route, method and status code", ("route", "method", "status")
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("route", "method")
+)
+http_requests_in_flight = Gauge("http_requests_in_flight", "HTTP requests currently being served")
+db_pool_wait_seconds = Histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled database connection", ("engine",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+db_pool_timeouts_total = Counter(
+    "db_pool_timeouts_total", "Connection checkouts that timed out waiting for the pool", ("engine",)
+)
+db_pool_size = Gauge("db_pool_size", "Configured pool size", ("engine",))
+db_pool_checked_out = Gauge("db_pool_checked_out", "Connections currently checked out", ("engine",))
+db_pool_overflow = Gauge("db_pool_overflow", "Overflow connections currently open", ("engine",))
+cache_hits_total = Counter("cache_hits_total", "In-process cache hits", ("cache",))
+cache_misses_total = Counter("cache_misses_total", "In-process cache misses", ("cache",))
+cache_entries = Gauge("cache_entries", "Entries held by an in-process cache", ("cache",))
+
+
+class MetricsMiddleware:
+    """Records request counts, latency and in-flight requests per route.
+
+    Requests are labelled with the route template rather than the raw path
+    so ids in URLs do not create a new series each.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+            http_request_duration_seconds.observe(time.perf_counter() - started, route=route_path, method=method)
+            http_requests_total.inc(route=route_path, method=method, status=str(status["code"]))
@@ -0,0 +1,110 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RequestProfile:
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_time = 0.0
+        self.statement_count = 0
+        self.statements: Counter = Counter()
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    @property
+    def db_time_ms(self) -> float:
+        return self.db_time * 1000
+
+    def repeated_statements(self, threshold: int):
+        return [(sql, count) for sql, count in self.statements.most_common() if count >= threshold]
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _current_profile.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._profiling_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_profiling_started", None)
+    profile = _current_profile.get()
+    if profile is not None and started is not None:
+        profile.db_time += time.perf_counter() - started
+        profile.statement_count += 1
+        profile.statements[statement] += 1
+
+
+def install_sql_hooks(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class RequestProfilingMiddleware:
+    """Times each HTTP request and the SQL it runs.
+
+    Adds a ``Server-Timing`` header and logs requests that are slow, run
+    too many statements, or repeat one statement often enough to look like
+    an N+1 loop.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                server_timing = (
+                    f'app;dur={profile.elapsed_ms:.1f}, '
+                    f'db;dur={profile.db_time_ms:.1f};desc="{profile.statement_count} statements"'
+                )
+                headers.append((b"server-timing", server_timing.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_profile.reset(token)
+            self._report(scope, profile)
+
+    def _report(self, scope, profile: RequestProfile) -> None:
+        path = f'{scope.get("method", "")} {scope.get("path", "")}'
+        elapsed_ms = profile.elapsed_ms
+
+        if elapsed_ms >= settings.PROFILE_SLOW_REQUEST_MS or profile.statement_count > settings.PROFILE_MAX_STATEMENTS:
+            logger.warning(
+                "Slow request %s: %.1fms total, %.1fms in %s SQL statements",
+                path, elapsed_ms, profile.db_time_ms, profile.statement_count
+            )
+
+        for statement, count in profile.repeated_statements(settings.PROFILE_N_PLUS_ONE_THRESHOLD):
+            logger.warning(
+                "Possible N+1 in %s: statement ran %s times: %s",
+                path, count, " ".join(statement.split())[:200]
+            )
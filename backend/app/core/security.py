@@ -1,9 +1,20 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, List, Sequence
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 import bcrypt
 from app.core.config import settings
 
+# bcrypt releases the GIL while hashing, so a thread pool runs hashes in
+# parallel without blocking the event loop
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+_password_jobs_in_flight = 0
+
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -46,3 +57,46 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     password_bytes = plain_password.encode('utf-8')
     hashed_bytes = hashed_password.encode('utf-8')
     return bcrypt.checkpw(password_bytes, hashed_bytes)
+
+
+async def _run_password_job(func: Callable, *args) -> Any:
+    global _password_jobs_in_flight
+    capacity = settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_LIMIT
+    if _password_jobs_in_flight >= capacity:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
+    
+    _password_jobs_in_flight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_password_executor, func, *args)
+    finally:
+        _password_jobs_in_flight -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_password_job(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+
+async def hash_passwords_async(passwords: Sequence[str]) -> List[str]:
+    # Bulk imports keep at most one hash per worker queued at a time, so
+    # interactive logins still get a turn on the pool between them
+    semaphore = asyncio.Semaphore(settings.PASSWORD_HASH_WORKERS)
+    loop = asyncio.get_running_loop()
+    
+    async def hash_one(password: str) -> str:
+        async with semaphore:
+            return await loop.run_in_executor(_password_executor, hash_password, password)
+    
+    return list(await asyncio.gather(*(hash_one(password) for password in passwords)))
+
+
+def shutdown_password_executor() -> None:
+    _password_executor.shutdown(wait=False, cancel_futures=True)
@@ -1,7 +1,13 @@
+import time
 from sqlalchemy import create_engine
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core import metrics
 
 engine = create_engine(
     settings.DATABASE_URL,
@@ -12,12 +18,67 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def get_async_database_url() -> str:
+    # pg8000 has no asyncio dialect, so the async engine talks to the same
+    # database through asyncpg unless an explicit URL is configured.
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(settings.DATABASE_URL)
+    if url.get_backend_name() == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+    return url.render_as_string(hide_password=False)
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except sa_exc.TimeoutError:
+            metrics.db_pool_timeouts_total.inc(engine="async")
+            raise
+        finally:
+            metrics.db_pool_wait_seconds.observe(time.perf_counter() - started, engine="async")
+
+
+async_engine = create_async_engine(
+    get_async_database_url(),
+    poolclass=TimedAsyncQueuePool,
+    pool_pre_ping=True,
+    pool_size=10,
+    max_overflow=20
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 Base = declarative_base()
 
 
+def _collect_pool_metrics():
+    for label, pool in (("sync", engine.pool), ("async", async_engine.sync_engine.pool)):
+        metrics.db_pool_size.set(pool.size(), engine=label)
+        metrics.db_pool_checked_out.set(pool.checkedout(), engine=label)
+        metrics.db_pool_overflow.set(max(pool.overflow(), 0), engine=label)
+
+
+metrics.register_collector(_collect_pool_metrics)
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Text, Date, Float
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, ForeignKey, Enum, Text, Date, Float, Index, JSON, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -44,8 +44,8 @@ class Student(Base):
     address = Column(Text, nullable=True)
     
     enrollment_year = Column(Integer, nullable=True)
-    program = Column(String(100), nullable=True)  # e.g., "Computer Science", "Engineering"
-    current_semester = Column(String(50), nullable=True)  # e.g., "Fall 2024", "Spring 2025"
+    program = Column(String(100), nullable=True, index=True)  # e.g., "Computer Science", "Engineering"
+    current_semester = Column(String(50), nullable=True, index=True)  # e.g., "Fall 2024", "Spring 2025"
     gpa = Column(Float, nullable=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -66,7 +66,7 @@ class Course(Base):
     description = Column(Text, nullable=True)
     credits = Column(Integer, nullable=False, default=3)
     
-    faculty_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    faculty_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
     
     semester = Column(String(50), nullable=True)
     academic_year = Column(String(20), nullable=True)
@@ -83,6 +83,11 @@ class Course(Base):
 
 class Enrollment(Base):
     __tablename__ = "enrollments"
+    __table_args__ = (
+        # Also serves lookups by student_id alone
+        UniqueConstraint("student_id", "course_id", name="uq_enrollment_student_course"),
+        Index("ix_enrollments_course_id_status", "course_id", "status"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False)
@@ -100,6 +105,11 @@ class Enrollment(Base):
 
 class Attendance(Base):
     __tablename__ = "attendance"
+    __table_args__ = (
+        UniqueConstraint("student_id", "course_id", "date", name="uq_attendance_student_course_date"),
+        Index("ix_attendance_course_id_date", "course_id", "date"),
+        Index("ix_attendance_date_id", "date", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False)
@@ -116,8 +126,44 @@ class Attendance(Base):
     course = relationship("Course", back_populates="attendance_records")
 
 
+class AttendanceStudentRollup(Base):
+    """Attendance counts per student x course, kept in step with attendance writes."""
+    __tablename__ = "attendance_student_rollups"
+    
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), primary_key=True)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True, index=True)
+    
+    present = Column(Integer, nullable=False, default=0)
+    absent = Column(Integer, nullable=False, default=0)
+    late = Column(Integer, nullable=False, default=0)
+    excused = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=False, default=0)
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class AttendanceDailyRollup(Base):
+    """Attendance counts per course x date, kept in step with attendance writes."""
+    __tablename__ = "attendance_daily_rollups"
+    
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    
+    present = Column(Integer, nullable=False, default=0)
+    absent = Column(Integer, nullable=False, default=0)
+    late = Column(Integer, nullable=False, default=0)
+    excused = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=False, default=0)
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
 class Grade(Base):
     __tablename__ = "grades"
+    __table_args__ = (
+        Index("ix_grades_student_id_course_id_assessment_type", "student_id", "course_id", "assessment_type"),
+        Index("ix_grades_course_id_assessment_type", "course_id", "assessment_type"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False)
@@ -140,6 +186,44 @@ class Grade(Base):
     course = relationship("Course", back_populates="grades")
 
 
+class AtRiskFlag(Base):
+    """A student x course flagged by the latest at-risk scan."""
+    __tablename__ = "at_risk_flags"
+    
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), primary_key=True)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True, index=True)
+    
+    attendance_rate = Column(Float, nullable=True)
+    sessions = Column(Integer, nullable=False, default=0)
+    grade_percentage = Column(Float, nullable=True)
+    assessments = Column(Integer, nullable=False, default=0)
+    reasons = Column(String(100), nullable=False)  # comma-separated: low_attendance, low_grade
+    
+    computed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class GradingScale(Base):
+    __tablename__ = "grading_scales"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False)
+    
+    # A course scale beats the scale of the student's program, which beats
+    # the institution scale; without any, the built-in cutoffs apply
+    scope = Column(String(20), nullable=False, default="institution")  # institution, program, course
+    program = Column(String(100), nullable=True)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=True, index=True)
+    
+    cutoffs = Column(JSON, nullable=False)  # [{"min_percentage": 93.0, "letter": "A"}, ...], lowest first
+    failing_grade = Column(String(5), nullable=False, default="F")
+    curve_mode = Column(String(20), nullable=False, default="none")  # none, flat, top_score, target_mean
+    curve_value = Column(Float, nullable=True)
+    
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
 class Semester(Base):
     __tablename__ = "semesters"
     
@@ -149,3 +233,12 @@ class Semester(Base):
     start_date = Column(Date, nullable=True)
     end_date = Column(Date, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class TableVersion(Base):
+    """Write counter per table, bumped once per writing transaction at commit (migration 0006)."""
+    __tablename__ = "table_versions"
+    
+    table_name = Column(String(63), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,41 @@
+import os
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from app.db.database import async_engine
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic.ini")
+
+
+class SchemaOutOfDate(RuntimeError):
+    pass
+
+
+def alembic_heads() -> set:
+    # Alembic is only needed for this one check, so it is imported lazily
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "alembic"))
+    return set(ScriptDirectory.from_config(config).get_heads())
+
+
+async def verify_schema_revision() -> str:
+    """Checks with one query that the database is at the Alembic head.
+
+    Replaces running create_all on every worker start; schema changes are
+    applied with ``alembic upgrade head`` before deploying instead.
+    """
+    try:
+        async with async_engine.connect() as conn:
+            current = set((await conn.scalars(text("SELECT version_num FROM alembic_version"))).all())
+    except ProgrammingError as exc:
+        raise SchemaOutOfDate("Database has no alembic_version table; run 'alembic upgrade head'") from exc
+
+    heads = alembic_heads()
+    if current != heads:
+        raise SchemaOutOfDate(
+            f"Database is at revision {', '.join(sorted(current)) or 'none'} but the code expects "
+            f"{', '.join(sorted(heads))}; run 'alembic upgrade head'"
+        )
+    return ", ".join(sorted(heads))
@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models import TableVersion
+
+
+async def table_versions(db: AsyncSession, *tables: str) -> Optional[Dict[str, Tuple[int, Optional[datetime]]]]:
+    """Write counters of ``tables`` as ``{name: (version, updated_at)}``.
+
+    The counters are bumped by database triggers on every committed write,
+    so they are shared by all workers. Returns None when any counter is
+    missing, e.g. before migration 0006 ran; callers must then not cache.
+    """
+    rows = (await db.execute(
+        select(TableVersion.table_name, TableVersion.version, TableVersion.updated_at)
+        .where(TableVersion.table_name.in_(tables))
+    )).all()
+    if len(rows) != len(set(tables)):
+        return None
+    return {name: (version, updated_at) for name, version, updated_at in rows}
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime, date
 
 
@@ -37,6 +37,52 @@ class AttendanceWithDetails(AttendanceResponse):
     course_code: Optional[str] = None
 
 
+class AttendanceBulkEntry(BaseModel):
+    student_id: int
+    status: str  # present, absent, late, excused
+    notes: Optional[str] = None
+
+
+class AttendanceBulkCreate(BaseModel):
+    course_id: int
+    date: date
+    records: List[AttendanceBulkEntry]
+
+
+class AttendanceBulkResult(BaseModel):
+    inserted: int
+    updated: int
+
+
+class AttendanceCounts(BaseModel):
+    present: int = 0
+    absent: int = 0
+    late: int = 0
+    excused: int = 0
+    total: int = 0
+    attendance_rate: Optional[float] = None  # (present + late) / total, in percent
+
+
+class StudentCourseAttendance(AttendanceCounts):
+    course_id: int
+    course_code: Optional[str] = None
+    course_name: Optional[str] = None
+
+
+class CourseStudentAttendance(AttendanceCounts):
+    student_id: int
+
+
+class CourseDateAttendance(AttendanceCounts):
+    date: date
+
+
+class CourseAttendanceSummary(AttendanceCounts):
+    course_id: int
+    by_date: List[CourseDateAttendance]
+    by_student: List[CourseStudentAttendance]
+
+
 class GradeBase(BaseModel):
     student_id: int
     course_id: int
@@ -55,10 +101,20 @@ class GradeCreate(GradeBase):
 class GradeUpdate(BaseModel):
     score: Optional[float] = None
     max_score: Optional[float] = None
-    letter_grade: Optional[str] = None
     remarks: Optional[str] = None
 
 
+class GradeBulkError(BaseModel):
+    row: int  # 1-based position in the uploaded JSON array or CSV body
+    student_id: Optional[int] = None
+    error: str
+
+
+class GradeBulkResult(BaseModel):
+    inserted: int
+    errors: List[GradeBulkError]
+
+
 class GradeResponse(GradeBase):
     id: int
     percentage: Optional[float] = None
@@ -67,3 +123,51 @@ class GradeResponse(GradeBase):
     
     class Config:
         from_attributes = True
+
+
+class AtRiskStudent(BaseModel):
+    student_id: int
+    course_id: int
+    student_name: Optional[str] = None
+    course_code: Optional[str] = None
+    course_name: Optional[str] = None
+    attendance_rate: Optional[float] = None
+    sessions: int
+    grade_percentage: Optional[float] = None
+    assessments: int
+    reasons: List[str]  # low_attendance, low_grade
+    computed_at: datetime
+
+
+class AtRiskScanResult(BaseModel):
+    flagged: int
+
+
+class HistogramBucket(BaseModel):
+    lower: float
+    upper: float  # exclusive, except for the last bucket
+    count: int
+
+
+class StudentPercentile(BaseModel):
+    student_id: int
+    percentage: float
+    percentile: float
+
+
+class AssessmentStats(BaseModel):
+    assessment_type: str
+    assessment_name: str
+    count: int
+    mean: float
+    median: float
+    std_dev: float
+    min: float
+    max: float
+    histogram: List[HistogramBucket]
+    students: List[StudentPercentile]  # lowest percentage first
+
+
+class CourseGradeStats(BaseModel):
+    course_id: int
+    assessments: List[AssessmentStats]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -12,6 +12,21 @@ class EnrollmentCreate(EnrollmentBase):
     enrollment_date: Optional[datetime] = None
 
 
+class EnrollmentBulkCreate(BaseModel):
+    course_id: int
+    # Either an explicit cohort or a program/semester filter
+    student_ids: Optional[List[int]] = None
+    program: Optional[str] = None
+    current_semester: Optional[str] = None
+    status: str = "active"
+
+
+class EnrollmentBulkResult(BaseModel):
+    enrolled: List[int]
+    already_enrolled: List[int]
+    not_found: List[int]
+
+
 class EnrollmentUpdate(BaseModel):
     student_id: Optional[int] = None
     course_id: Optional[int] = None
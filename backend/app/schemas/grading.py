@@ -0,0 +1,49 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+
+class GradeCutoff(BaseModel):
+    min_percentage: float = Field(..., ge=0, le=100)
+    letter: str = Field(..., min_length=1, max_length=5)
+    # Grade points toward GPA; defaults to the 4.0 value of a standard letter
+    grade_points: Optional[float] = Field(None, ge=0)
+
+
+class GradingScaleBase(BaseModel):
+    name: str
+    scope: str = Field(default="institution", pattern="^(institution|program|course)$")
+    program: Optional[str] = None  # required for program scales
+    course_id: Optional[int] = None  # required for course scales
+    cutoffs: List[GradeCutoff] = Field(..., min_length=1)
+    failing_grade: str = Field(default="F", min_length=1, max_length=5)
+    curve_mode: str = Field(default="none", pattern="^(none|flat|top_score|target_mean)$")
+    curve_value: Optional[float] = None  # points for flat, target mean for target_mean
+
+
+class GradingScaleCreate(GradingScaleBase):
+    pass
+
+
+class GradingScaleUpdate(BaseModel):
+    name: Optional[str] = None
+    cutoffs: Optional[List[GradeCutoff]] = Field(None, min_length=1)
+    failing_grade: Optional[str] = Field(None, min_length=1, max_length=5)
+    curve_mode: Optional[str] = Field(None, pattern="^(none|flat|top_score|target_mean)$")
+    curve_value: Optional[float] = None
+    is_active: Optional[bool] = None
+
+
+class GradingScaleResponse(GradingScaleBase):
+    id: int
+    is_active: bool
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class RegradeResult(BaseModel):
+    courses: int
+    updated: int
@@ -0,0 +1,33 @@
+from pydantic import BaseModel
+from typing import Dict, Optional
+
+
+class StatsOverview(BaseModel):
+    total_users: int
+    total_students: int
+    total_courses: int
+    active_courses: int
+    total_enrollments: int
+    users_by_role: Dict[str, int]
+    students_by_program: Dict[str, int]
+    students_by_semester: Dict[str, int]
+    courses_by_semester: Dict[str, int]
+    enrollments_by_status: Dict[str, int]
+
+
+class FacultyStats(BaseModel):
+    total_courses: int
+    active_courses: int
+    total_students: int  # All students visible to faculty
+    enrolled_students: int  # Distinct students enrolled in this faculty's courses
+    enrollments_by_status: Dict[str, int]
+    attendance_by_status: Dict[str, int]
+    average_percentage: Optional[float] = None
+
+
+class StudentStats(BaseModel):
+    total_courses: int
+    enrollments_by_status: Dict[str, int]
+    attendance_by_status: Dict[str, int]
+    attendance_rate: Optional[float] = None
+    average_percentage: Optional[float] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime, date
 
 
@@ -30,7 +30,6 @@ class StudentUpdate(BaseModel):
     enrollment_year: Optional[int] = None
     program: Optional[str] = None
     current_semester: Optional[str] = None
-    gpa: Optional[float] = None
 
 
 class StudentResponse(StudentBase):
@@ -49,3 +48,18 @@ class StudentWithUser(StudentResponse):
     full_name: str
     profile_picture: Optional[str] = None
     is_active: bool
+
+
+class StudentImportRow(BaseModel):
+    row: int  # 1-based position in the uploaded file
+    student_id: Optional[str] = None
+    email: Optional[str] = None
+    status: str  # created, linked (existing user), error
+    error: Optional[str] = None
+
+
+class StudentImportResult(BaseModel):
+    created: int
+    linked: int
+    failed: int
+    rows: List[StudentImportRow]
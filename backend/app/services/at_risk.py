@@ -0,0 +1,173 @@
+"""At-risk detection over attendance and grades.
+
+For every active enrollment the scan combines the attendance rate
+(present or late over recorded sessions) with the grade percentage (total
+score over total possible score) and flags the student x course when
+either falls below the configured thresholds. Student-id ranges are
+aggregated in a process pool, each worker with its own connection reading
+grouped rows straight from the attendance and grade tables; the flags then
+replace the previous run's in one transaction, so readers never see a half
+written result. Meant to run from cron:
+
+    python -m app.services.at_risk --workers 8 --chunk-size 5000
+"""
+import argparse
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import and_, create_engine, delete, func, insert, select
+from sqlalchemy.pool import NullPool
+from app.core.config import settings
+from app.core.grading import compute_percentage
+from app.db.models import AtRiskFlag, Attendance, Enrollment, Grade, Student
+from app.services.attendance_rollups import attendance_rate
+
+INSERT_BATCH_SIZE = 5000
+
+# (min_attendance_rate, min_grade_percentage, min_sessions)
+Thresholds = Tuple[float, float, int]
+
+_worker_engine = None
+
+
+def default_thresholds() -> Thresholds:
+    return (
+        settings.AT_RISK_MIN_ATTENDANCE_RATE,
+        settings.AT_RISK_MIN_GRADE_PERCENTAGE,
+        settings.AT_RISK_MIN_SESSIONS,
+    )
+
+
+def _active_enrollment(model):
+    return and_(
+        Enrollment.student_id == model.student_id,
+        Enrollment.course_id == model.course_id,
+        Enrollment.status == "active"
+    )
+
+
+def _attendance_query(low: int, high: int):
+    return (
+        select(
+            Attendance.student_id,
+            Attendance.course_id,
+            func.count().filter(Attendance.status.in_(("present", "late"))).label("attended"),
+            func.count().label("sessions")
+        )
+        .join(Enrollment, _active_enrollment(Attendance))
+        .where(Attendance.student_id.between(low, high))
+        .group_by(Attendance.student_id, Attendance.course_id)
+    )
+
+
+def _grades_query(low: int, high: int):
+    return (
+        select(
+            Grade.student_id,
+            Grade.course_id,
+            func.sum(Grade.score).label("score_total"),
+            func.sum(Grade.max_score).label("max_score_total"),
+            func.count().label("assessments")
+        )
+        .join(Enrollment, _active_enrollment(Grade))
+        .where(Grade.student_id.between(low, high))
+        .group_by(Grade.student_id, Grade.course_id)
+    )
+
+
+def evaluate(attendance_rows, grade_rows, thresholds: Thresholds) -> List[Dict]:
+    """Flag rows for the student x course pairs under either threshold."""
+    min_attendance_rate, min_grade_percentage, min_sessions = thresholds
+    pairs: Dict[tuple, Dict] = {}
+    for student_id, course_id, attended, sessions in attendance_rows:
+        pairs[(student_id, course_id)] = {
+            "attendance_rate": attendance_rate(attended, 0, sessions),
+            "sessions": sessions,
+        }
+    for student_id, course_id, score_total, max_score_total, assessments in grade_rows:
+        pairs.setdefault((student_id, course_id), {}).update({
+            "grade_percentage": compute_percentage(score_total or 0.0, max_score_total or 0.0),
+            "assessments": assessments,
+        })
+    
+    flagged = []
+    for (student_id, course_id), pair in pairs.items():
+        reasons = []
+        rate = pair.get("attendance_rate")
+        if rate is not None and pair["sessions"] >= min_sessions and rate < min_attendance_rate:
+            reasons.append("low_attendance")
+        percentage = pair.get("grade_percentage")
+        if percentage is not None and percentage < min_grade_percentage:
+            reasons.append("low_grade")
+        if reasons:
+            flagged.append({
+                "student_id": student_id,
+                "course_id": course_id,
+                "attendance_rate": rate,
+                "sessions": pair.get("sessions", 0),
+                "grade_percentage": percentage,
+                "assessments": pair.get("assessments", 0),
+                "reasons": ",".join(reasons),
+            })
+    return flagged
+
+
+def _init_worker(database_url: str) -> None:
+    global _worker_engine
+    _worker_engine = create_engine(database_url, poolclass=NullPool)
+
+
+def _scan_chunk(bounds: Tuple[int, int], thresholds: Thresholds) -> List[Dict]:
+    low, high = bounds
+    with _worker_engine.connect() as conn:
+        attendance_rows = conn.execute(_attendance_query(low, high)).all()
+        grade_rows = conn.execute(_grades_query(low, high)).all()
+    return evaluate(attendance_rows, grade_rows, thresholds)
+
+
+def run_scan(
+    chunk_size: Optional[int] = None,
+    workers: Optional[int] = None,
+    thresholds: Optional[Thresholds] = None
+) -> int:
+    """Scan every student, replace the stored flags and return how many were flagged."""
+    from app.db.database import engine
+    
+    chunk_size = chunk_size or settings.AT_RISK_CHUNK_SIZE
+    thresholds = thresholds or default_thresholds()
+    with engine.connect() as conn:
+        max_id = conn.scalar(select(func.max(Student.id))) or 0
+    ranges = [(low, min(low + chunk_size - 1, max_id)) for low in range(1, max_id + 1, chunk_size)]
+    
+    # spawn, not fork: the API process calling this has threads and open connections
+    with ProcessPoolExecutor(
+        max_workers=workers or settings.AT_RISK_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(settings.DATABASE_URL,)
+    ) as pool:
+        flagged = [flag for flags in pool.map(_scan_chunk, ranges, repeat(thresholds)) for flag in flags]
+    
+    with engine.begin() as conn:
+        conn.execute(delete(AtRiskFlag.__table__))
+        for start in range(0, len(flagged), INSERT_BATCH_SIZE):
+            conn.execute(insert(AtRiskFlag.__table__), flagged[start:start + INSERT_BATCH_SIZE])
+    return len(flagged)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Flag students at risk in their active courses")
+    parser.add_argument("--chunk-size", type=int, default=settings.AT_RISK_CHUNK_SIZE, help="Students per worker task")
+    parser.add_argument("--workers", type=int, default=settings.AT_RISK_WORKERS)
+    parser.add_argument("--min-attendance-rate", type=float, default=settings.AT_RISK_MIN_ATTENDANCE_RATE)
+    parser.add_argument("--min-grade-percentage", type=float, default=settings.AT_RISK_MIN_GRADE_PERCENTAGE)
+    parser.add_argument("--min-sessions", type=int, default=settings.AT_RISK_MIN_SESSIONS)
+    args = parser.parse_args()
+    
+    started = time.perf_counter()
+    flagged = run_scan(
+        args.chunk_size, args.workers, (args.min_attendance_rate, args.min_grade_percentage, args.min_sessions)
+    )
+    print(f"Flagged {flagged} student-course pairs in {time.perf_counter() - started:.1f}s")
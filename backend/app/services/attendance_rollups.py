@@ -0,0 +1,143 @@
+"""Materialized attendance counts per student x course and per course x date.
+
+Every attendance write passes the rows it removed and added to
+``apply_attendance_changes``, which folds them into count deltas and upserts
+both rollup tables inside the caller's transaction, so attendance rates are
+a primary-key lookup instead of a scan of the attendance table.
+``rebuild_rollups`` recomputes both tables from scratch, e.g. after rows were
+loaded behind the API's back:
+
+    python -m app.services.attendance_rollups
+"""
+import asyncio
+import time
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models import Attendance, AttendanceDailyRollup, AttendanceStudentRollup
+
+ROLLUP_STATUSES = ("present", "absent", "late", "excused")
+COUNT_COLUMNS = ROLLUP_STATUSES + ("total",)
+ROLLUP_BATCH_SIZE = 1000
+
+_ROLLUPS = (
+    (AttendanceStudentRollup, ("student_id", "course_id")),
+    (AttendanceDailyRollup, ("course_id", "date")),
+)
+
+# (student_id, course_id, date, status) of one attendance row
+AttendanceKey = Tuple[int, int, date, str]
+
+
+def attendance_key(record) -> AttendanceKey:
+    return (record.student_id, record.course_id, record.date, record.status)
+
+
+def attendance_rate(present: int, late: int, total: int) -> Optional[float]:
+    """Share of sessions attended, counting late arrivals, as a percentage."""
+    if not total:
+        return None
+    return round((present + late) / total * 100, 2)
+
+
+def _deltas(removed: Iterable[AttendanceKey], added: Iterable[AttendanceKey]) -> List[Dict[tuple, Dict[str, int]]]:
+    deltas: List[Dict[tuple, Dict[str, int]]] = [{} for _ in _ROLLUPS]
+    for sign, keys in ((-1, removed), (1, added)):
+        for student_id, course_id, day, status in keys:
+            fields = {"student_id": student_id, "course_id": course_id, "date": day}
+            for (_, key_columns), table_deltas in zip(_ROLLUPS, deltas):
+                key = tuple(fields[column] for column in key_columns)
+                counts = table_deltas.setdefault(key, dict.fromkeys(COUNT_COLUMNS, 0))
+                counts["total"] += sign
+                if status in counts:
+                    counts[status] += sign
+    return deltas
+
+
+async def lock_attendance_day(db: AsyncSession, course_id: int, day: date) -> None:
+    """Serialize attendance writers of one course and date until commit.
+
+    Row locks cannot cover attendance rows that do not exist yet, so without
+    this two batches for the same session could both read a row as missing
+    and count it as inserted twice.
+    """
+    await db.execute(select(func.pg_advisory_xact_lock(course_id, day.toordinal())))
+
+
+async def apply_attendance_changes(
+    db: AsyncSession,
+    removed: Iterable[AttendanceKey] = (),
+    added: Iterable[AttendanceKey] = ()
+) -> None:
+    """Fold removed and added attendance rows into both rollup tables."""
+    for (model, key_columns), table_deltas in zip(_ROLLUPS, _deltas(removed, added)):
+        # Sorted keys keep concurrent writers locking rows in the same order
+        rows = [
+            {**dict(zip(key_columns, key)), **counts}
+            for key, counts in sorted(table_deltas.items())
+            if any(counts.values())
+        ]
+        table = model.__table__
+        for start in range(0, len(rows), ROLLUP_BATCH_SIZE):
+            stmt = pg_insert(table).values(rows[start:start + ROLLUP_BATCH_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(key_columns),
+                set_={
+                    **{column: table.c[column] + stmt.excluded[column] for column in COUNT_COLUMNS},
+                    "updated_at": func.now()
+                }
+            )
+            await db.execute(stmt)
+
+
+async def discard_attendance(db: AsyncSession, *criteria) -> None:
+    """Take attendance rows matching ``criteria`` out of the rollups.
+
+    For deletes that remove attendance through cascades, e.g. of a student.
+    """
+    rows = (await db.execute(
+        select(Attendance.student_id, Attendance.course_id, Attendance.date, Attendance.status).where(*criteria)
+    )).all()
+    await apply_attendance_changes(db, removed=rows)
+
+
+def rebuild_statements() -> list:
+    """Statements that recompute both rollup tables from the attendance table."""
+    statements = [text("LOCK TABLE attendance IN SHARE MODE")]
+    for model, key_columns in _ROLLUPS:
+        keys = [getattr(Attendance, column) for column in key_columns]
+        statements.append(delete(model.__table__))
+        statements.append(insert(model.__table__).from_select(
+            [*key_columns, *COUNT_COLUMNS],
+            select(
+                *keys,
+                *(func.count().filter(Attendance.status == status) for status in ROLLUP_STATUSES),
+                func.count()
+            ).group_by(*keys)
+        ))
+    return statements
+
+
+async def rebuild_rollups(db: AsyncSession) -> int:
+    """Recompute both rollup tables in one transaction; attendance writes wait meanwhile."""
+    for statement in rebuild_statements():
+        await db.execute(statement)
+    rebuilt = await db.scalar(select(func.count()).select_from(AttendanceStudentRollup))
+    await db.commit()
+    return rebuilt
+
+
+async def _main() -> None:
+    from app.db.database import AsyncSessionLocal, async_engine
+    
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        rebuilt = await rebuild_rollups(db)
+    await async_engine.dispose()
+    print(f"Rebuilt attendance rollups for {rebuilt} student x course pairs in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
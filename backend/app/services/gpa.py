@@ -0,0 +1,124 @@
+"""Credit-weighted GPA derived from grades and course credits.
+
+Every grade is first curved on the scale that grades it, exactly as its
+letter is (``app.services.grading_scales``). A student's percentage in a
+course is then the mean of those percentages weighted by each assessment's
+possible score; it maps to grade points on the same scale, or the 4.0 scale
+without one, and is weighted by ``Course.credits``. Grade and scale writes
+call ``recompute_gpas`` for the students they touch; ``recompute_all_gpas``
+rebuilds every student in id-range chunks:
+
+    python -m app.services.gpa --chunk-size 5000
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict, Iterable
+import numpy as np
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models import Course, Grade, Student
+from app.services.grading_scales import curved_percentages, resolve_scales, scale_grade_points
+
+RECOMPUTE_BATCH_SIZE = 5000
+
+
+def _grades_query(*criteria):
+    return (
+        select(
+            Grade.student_id, Grade.course_id, Grade.assessment_type, Grade.assessment_name,
+            Grade.percentage, Grade.max_score, Course.credits, Student.program
+        )
+        .join(Course, Course.id == Grade.course_id)
+        .join(Student, Student.id == Grade.student_id)
+        .where(Grade.percentage.is_not(None), Grade.max_score > 0, *criteria)
+    )
+
+
+def compute_gpas(student_ids, course_ids, credits, percentages, max_scores, scales) -> Dict[int, float]:
+    """GPA per student from one row per (curved) grade, over whole columns.
+
+    ``scales`` holds the grading scale of every row, None for the default
+    one; all grades of a student in a course share it.
+    """
+    pairs, first, inverse = np.unique(
+        np.column_stack([np.asarray(student_ids, dtype=np.int64), np.asarray(course_ids, dtype=np.int64)]),
+        axis=0, return_index=True, return_inverse=True
+    )
+    inverse = inverse.reshape(-1)
+    max_scores = np.asarray(max_scores, dtype=float)
+    course_percentages = (
+        np.bincount(inverse, weights=np.asarray(percentages, dtype=float) * max_scores)
+        / np.bincount(inverse, weights=max_scores)
+    )
+    points = scale_grade_points(course_percentages, [scales[index] for index in first.tolist()])
+    course_credits = np.asarray(credits, dtype=float)[first]
+    counted = ~np.isnan(points) & (course_credits > 0)
+    if not counted.any():
+        return {}
+    
+    students, student_index = np.unique(pairs[counted, 0], return_inverse=True)
+    weighted_points = np.bincount(student_index, weights=points[counted] * course_credits[counted])
+    total_credits = np.bincount(student_index, weights=course_credits[counted])
+    gpas = np.round(weighted_points / total_credits, 2)
+    return dict(zip(students.tolist(), gpas.tolist()))
+
+
+async def _gpas_for(db: AsyncSession, *criteria) -> Dict[int, float]:
+    rows = (await db.execute(_grades_query(*criteria))).all()
+    if not rows:
+        return {}
+    student_ids, course_ids, assessment_types, assessment_names, percentages, max_scores, credits, programs = zip(*rows)
+    scales = await resolve_scales(db, course_ids, programs)
+    curved = await curved_percentages(
+        db, list(zip(course_ids, assessment_types, assessment_names)), percentages, scales
+    )
+    return compute_gpas(student_ids, course_ids, credits, curved, max_scores, scales)
+
+
+async def recompute_gpas(db: AsyncSession, student_ids: Iterable[int]) -> None:
+    """Refresh the GPA of the given students inside the caller's transaction."""
+    student_ids = sorted(set(student_ids))
+    for start in range(0, len(student_ids), RECOMPUTE_BATCH_SIZE):
+        batch = student_ids[start:start + RECOMPUTE_BATCH_SIZE]
+        gpas = await _gpas_for(db, Grade.student_id.in_(batch))
+        await db.execute(update(Student), [
+            {"id": student_id, "gpa": gpas.get(student_id)} for student_id in batch
+        ])
+
+
+async def recompute_all_gpas(db: AsyncSession, chunk_size: int = 5000) -> int:
+    """Recompute every student's GPA, committing one id range at a time."""
+    max_id = await db.scalar(select(func.max(Student.id))) or 0
+    updated = 0
+    for low in range(1, max_id + 1, chunk_size):
+        high = low + chunk_size - 1
+        gpas = await _gpas_for(db, Grade.student_id.between(low, high))
+        # Students in the range without grades lose any stale GPA
+        await db.execute(
+            update(Student).where(Student.id.between(low, high)).values(gpa=None),
+            execution_options={"synchronize_session": False}
+        )
+        if gpas:
+            await db.execute(update(Student), [
+                {"id": student_id, "gpa": gpa} for student_id, gpa in gpas.items()
+            ])
+        await db.commit()
+        updated += len(gpas)
+    return updated
+
+
+async def _main(chunk_size: int) -> None:
+    from app.db.database import AsyncSessionLocal, async_engine
+    
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        updated = await recompute_all_gpas(db, chunk_size)
+    await async_engine.dispose()
+    print(f"Recomputed GPA for {updated} students in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute every student's GPA from their grades")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    asyncio.run(_main(parser.parse_args().chunk_size))
@@ -0,0 +1,105 @@
+"""Distribution of grade percentages per assessment of a course.
+
+All assessments of a course are handled in one pass over whole columns:
+rows are sorted by (assessment, percentage) once, and the means, medians,
+standard deviations, histogram buckets and percentile ranks are read off
+the sorted arrays without a Python loop over grades.
+"""
+from typing import Dict, Sequence
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models import Grade
+from app.schemas.academic import AssessmentStats, CourseGradeStats, HistogramBucket, StudentPercentile
+
+HISTOGRAM_BUCKET_WIDTH = 10.0
+_bucket_edges = np.arange(0.0, 100.0 + HISTOGRAM_BUCKET_WIDTH, HISTOGRAM_BUCKET_WIDTH)
+
+
+def assessment_stats(groups: Sequence[int], percentages: Sequence[float]) -> Dict[str, np.ndarray]:
+    """Summary statistics per group and percentile rank per row.
+
+    ``groups`` are dense group numbers 0..n-1. Returned per-group arrays are
+    indexed by group; ``order`` sorts the input rows by (group, percentage)
+    and ``percentiles`` follows that order. Standard deviations are of the
+    population, and percentile ranks count ties as half below.
+    """
+    groups = np.asarray(groups, dtype=np.int64)
+    percentages = np.asarray(percentages, dtype=float)
+    order = np.lexsort((percentages, groups))
+    groups, values = groups[order], percentages[order]
+    group_count = int(groups.max()) + 1 if len(groups) else 0
+    
+    counts = np.bincount(groups, minlength=group_count)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    means = np.bincount(groups, weights=values, minlength=group_count) / counts
+    medians = (values[starts + (counts - 1) // 2] + values[starts + counts // 2]) / 2
+    std_devs = np.sqrt(np.bincount(groups, weights=(values - means[groups]) ** 2, minlength=group_count) / counts)
+    
+    buckets = np.clip(np.searchsorted(_bucket_edges, values, side="right") - 1, 0, len(_bucket_edges) - 2)
+    histograms = np.bincount(
+        groups * (len(_bucket_edges) - 1) + buckets, minlength=group_count * (len(_bucket_edges) - 1)
+    ).reshape(group_count, -1)
+    
+    # Offsetting each group past the previous one's range lets a single
+    # searchsorted find every row's rank within its own group
+    span = values.max() - values.min() + 1 if len(values) else 1.0
+    keys = groups * span + (values - values.min() if len(values) else values)
+    below = np.searchsorted(keys, keys, side="left") - starts[groups]
+    at_or_below = np.searchsorted(keys, keys, side="right") - starts[groups]
+    percentiles = (below + at_or_below) / 2 / counts[groups] * 100
+    
+    return {
+        "order": order,
+        "counts": counts,
+        "means": means,
+        "medians": medians,
+        "std_devs": std_devs,
+        "minimums": values[starts],
+        "maximums": values[starts + counts - 1],
+        "histograms": histograms,
+        "percentiles": percentiles,
+    }
+
+
+async def course_grade_stats(db: AsyncSession, course_id: int) -> CourseGradeStats:
+    rows = (await db.execute(
+        select(Grade.assessment_type, Grade.assessment_name, Grade.student_id, Grade.percentage)
+        .where(Grade.course_id == course_id, Grade.percentage.is_not(None))
+    )).all()
+    if not rows:
+        return CourseGradeStats(course_id=course_id, assessments=[])
+    
+    assessment_types, assessment_names, student_ids, percentages = zip(*rows)
+    labels = list(zip(assessment_types, assessment_names))
+    assessments = sorted(set(labels))
+    group_of = {assessment: index for index, assessment in enumerate(assessments)}
+    stats = assessment_stats([group_of[label] for label in labels], percentages)
+    
+    sorted_students = np.asarray(student_ids)[stats["order"]]
+    sorted_percentages = np.asarray(percentages, dtype=float)[stats["order"]]
+    ends = np.cumsum(stats["counts"])
+    result = []
+    for index, (assessment_type, assessment_name) in enumerate(assessments):
+        start, end = ends[index] - stats["counts"][index], ends[index]
+        result.append(AssessmentStats(
+            assessment_type=assessment_type,
+            assessment_name=assessment_name,
+            count=int(stats["counts"][index]),
+            mean=round(float(stats["means"][index]), 2),
+            median=round(float(stats["medians"][index]), 2),
+            std_dev=round(float(stats["std_devs"][index]), 2),
+            min=float(stats["minimums"][index]),
+            max=float(stats["maximums"][index]),
+            histogram=[
+                HistogramBucket(lower=float(lower), upper=float(upper), count=int(count))
+                for lower, upper, count in zip(_bucket_edges[:-1], _bucket_edges[1:], stats["histograms"][index])
+            ],
+            students=[
+                StudentPercentile(student_id=int(student_id), percentage=float(percentage), percentile=round(float(percentile), 2))
+                for student_id, percentage, percentile in zip(
+                    sorted_students[start:end], sorted_percentages[start:end], stats["percentiles"][start:end]
+                )
+            ]
+        ))
+    return CourseGradeStats(course_id=course_id, assessments=result)
@@ -0,0 +1,319 @@
+"""Letter grades derived from the grading scales stored in the database.
+
+Each grade is graded on the most specific active scale: the course's, else
+the one for the student's program, else the institution's, else the
+built-in cutoffs of ``app.core.grading``. Curves are worked out over every
+grade of an assessment (course, type and name), so grade writes regrade the
+whole assessments they touch with ``regrade_assessments``. After a scale
+changes, ``regrade_in_batches`` re-grades the affected courses a batch at a
+time, reading plain rows and writing only the letters that changed, and
+recomputes the GPAs of their students:
+
+    python -m app.services.grading_scales --semester "Fall 2025"
+    python -m app.services.grading_scales --course-id 42
+
+GPA (``app.services.gpa``) resolves scales and curves through the same
+helpers, so a student's letters and grade points always agree.
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+import numpy as np
+from sqlalchemy import and_, func, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.grading import (
+    GRADE_POINTS, RELATIVE_CURVE_MODES, curve_with_stats, grade_points, group_stats, letter_grades
+)
+from app.db.models import Course, Grade, GradingScale, Student
+
+REGRADE_COURSE_BATCH_SIZE = 50
+UPDATE_BATCH_SIZE = 5000
+ASSESSMENT_BATCH_SIZE = 1000  # three bind parameters per assessment key
+
+# (course_id, assessment_type, assessment_name)
+AssessmentKey = Tuple[int, str, str]
+
+
+class Regraded(NamedTuple):
+    updated: int  # letter grades changed
+    curved_student_ids: Set[int]  # students graded relative to the rest of an assessment
+
+
+def scale_criteria(scale: GradingScale) -> list:
+    """Criteria selecting the grades a scale can apply to."""
+    if scale.scope == "course":
+        return [Grade.course_id == scale.course_id]
+    if scale.scope == "program":
+        return [Student.program == scale.program]
+    return []
+
+
+def cutoff_points(cutoff: dict) -> Optional[float]:
+    """Grade points of a scale cutoff: its own, else those of a standard letter."""
+    if cutoff.get("grade_points") is not None:
+        return cutoff["grade_points"]
+    return GRADE_POINTS.get(cutoff["letter"])
+
+
+async def _active_scales(db: AsyncSession, course_ids: Iterable[int], programs: Iterable[str]):
+    scales = (await db.scalars(
+        select(GradingScale)
+        .where(
+            GradingScale.is_active.is_(True),
+            or_(
+                GradingScale.scope == "institution",
+                and_(GradingScale.scope == "program", GradingScale.program.in_(set(programs))),
+                and_(GradingScale.scope == "course", GradingScale.course_id.in_(set(course_ids)))
+            )
+        )
+        .order_by(GradingScale.id)
+    )).all()
+    # The newest active scale wins if a target has several
+    by_course = {scale.course_id: scale for scale in scales if scale.scope == "course"}
+    by_program = {scale.program: scale for scale in scales if scale.scope == "program"}
+    institution = next((scale for scale in reversed(scales) if scale.scope == "institution"), None)
+    return by_course, by_program, institution
+
+
+async def resolve_scales(
+    db: AsyncSession,
+    course_ids: Sequence[int],
+    programs: Sequence[Optional[str]]
+) -> List[Optional[GradingScale]]:
+    """The scale each row is graded on; None means the built-in cutoffs."""
+    by_course, by_program, institution = await _active_scales(db, course_ids, filter(None, programs))
+    return [
+        by_course.get(course_id) or by_program.get(program) or institution
+        for course_id, program in zip(course_ids, programs)
+    ]
+
+
+def _is_relative(scale: Optional[GradingScale]) -> bool:
+    return scale is not None and scale.curve_mode in RELATIVE_CURVE_MODES
+
+
+def _rows_by_scale(scales: Sequence[Optional[GradingScale]]):
+    distinct: Dict[Optional[int], tuple] = {}
+    for index, scale in enumerate(scales):
+        distinct.setdefault(scale and scale.id, (scale, []))[1].append(index)
+    return [(scale, np.array(rows)) for scale, rows in distinct.values()]
+
+
+def apply_curves(
+    percentages: np.ndarray,
+    scales: Sequence[Optional[GradingScale]],
+    tops: np.ndarray,
+    means: np.ndarray
+) -> np.ndarray:
+    """Curve each row on its scale, given the top and mean of its assessment."""
+    curved = percentages.copy()
+    curves: Dict[tuple, List[int]] = {}
+    for index, scale in enumerate(scales):
+        if scale is not None and scale.curve_mode != "none":
+            curves.setdefault((scale.curve_mode, scale.curve_value), []).append(index)
+    for (mode, value), rows in curves.items():
+        rows = np.array(rows)
+        curved[rows] = curve_with_stats(percentages[rows], tops[rows], means[rows], mode, value)
+    return curved
+
+
+async def curved_percentages(
+    db: AsyncSession,
+    keys: Sequence[AssessmentKey],
+    percentages: Sequence[float],
+    scales: Sequence[Optional[GradingScale]]
+) -> np.ndarray:
+    """Curved percentages for rows that need not cover whole assessments.
+
+    The top and mean of assessments on a relative curve are read from the
+    database, so the result matches what ``regrade`` works out from
+    complete assessments.
+    """
+    percentages = np.asarray(percentages, dtype=float)
+    relative = sorted({key for key, scale in zip(keys, scales) if _is_relative(scale)})
+    stats: Dict[AssessmentKey, Tuple[float, float]] = {}
+    for start in range(0, len(relative), ASSESSMENT_BATCH_SIZE):
+        rows = (await db.execute(
+            select(
+                Grade.course_id, Grade.assessment_type, Grade.assessment_name,
+                func.max(Grade.percentage), func.avg(Grade.percentage)
+            )
+            .where(
+                tuple_(Grade.course_id, Grade.assessment_type, Grade.assessment_name).in_(
+                    relative[start:start + ASSESSMENT_BATCH_SIZE]
+                ),
+                Grade.percentage.is_not(None)
+            )
+            .group_by(Grade.course_id, Grade.assessment_type, Grade.assessment_name)
+        )).all()
+        stats.update({(course_id, kind, name): (top, mean) for course_id, kind, name, top, mean in rows})
+    missing = (np.nan, np.nan)
+    tops = np.array([stats.get(key, missing)[0] for key in keys], dtype=float)
+    means = np.array([stats.get(key, missing)[1] for key in keys], dtype=float)
+    return apply_curves(percentages, scales, tops, means)
+
+
+def scale_letters(percentages: np.ndarray, scales: Sequence[Optional[GradingScale]]) -> np.ndarray:
+    letters = np.empty(len(percentages), dtype=object)
+    for scale, rows in _rows_by_scale(scales):
+        if scale is None:
+            letters[rows] = letter_grades(percentages[rows])
+        else:
+            cutoffs = sorted((cutoff["min_percentage"], cutoff["letter"]) for cutoff in scale.cutoffs)
+            letters[rows] = letter_grades(percentages[rows], cutoffs, scale.failing_grade)
+    return letters
+
+
+def scale_grade_points(percentages: np.ndarray, scales: Sequence[Optional[GradingScale]]) -> np.ndarray:
+    """Grade points on each row's scale; NaN where a letter has no points."""
+    points = np.empty(len(percentages), dtype=float)
+    for scale, rows in _rows_by_scale(scales):
+        if scale is None:
+            points[rows] = grade_points(percentages[rows])
+        else:
+            cutoffs = sorted((cutoff["min_percentage"], cutoff_points(cutoff)) for cutoff in scale.cutoffs)
+            points[rows] = grade_points(percentages[rows], [
+                (minimum, np.nan if value is None else value) for minimum, value in cutoffs
+            ])
+    return points
+
+
+async def regrade(db: AsyncSession, *criteria) -> Regraded:
+    """Recompute letter grades of the grades matching ``criteria``.
+
+    Runs inside the caller's transaction; criteria may refer to Grade,
+    Student and Course. Only whole assessments should be selected, or
+    curves are worked out over part of one.
+    """
+    rows = (await db.execute(
+        select(
+            Grade.id, Grade.student_id, Grade.course_id, Grade.assessment_type, Grade.assessment_name,
+            Grade.percentage, Grade.letter_grade, Student.program
+        )
+        .join(Student, Student.id == Grade.student_id)
+        .join(Course, Course.id == Grade.course_id)
+        .where(Grade.percentage.is_not(None), *criteria)
+    )).all()
+    if not rows:
+        return Regraded(0, set())
+    
+    grade_ids, student_ids, course_ids, assessment_types, assessment_names, percentages, current, programs = zip(*rows)
+    scales = await resolve_scales(db, course_ids, programs)
+    
+    group_of: Dict[AssessmentKey, int] = {}
+    groups = np.array([
+        group_of.setdefault(key, len(group_of))
+        for key in zip(course_ids, assessment_types, assessment_names)
+    ])
+    percentages = np.asarray(percentages, dtype=float)
+    tops, means = group_stats(percentages, groups)
+    letters = scale_letters(apply_curves(percentages, scales, tops, means), scales)
+    
+    changed = [
+        {"id": grade_id, "letter_grade": letter}
+        for grade_id, letter, old in zip(grade_ids, letters.tolist(), current)
+        if letter != old
+    ]
+    for start in range(0, len(changed), UPDATE_BATCH_SIZE):
+        await db.execute(update(Grade), changed[start:start + UPDATE_BATCH_SIZE])
+    curved = {student_id for student_id, scale in zip(student_ids, scales) if _is_relative(scale)}
+    return Regraded(len(changed), curved)
+
+
+async def regrade_assessments(db: AsyncSession, keys: Iterable[AssessmentKey]) -> Regraded:
+    """Regrade every grade of the given assessments, e.g. after grade writes.
+
+    The result names the students on a relative curve in these assessments,
+    whose GPAs move with the rest of the assessment.
+    """
+    keys = sorted(set(keys))
+    updated, curved = 0, set()
+    for start in range(0, len(keys), ASSESSMENT_BATCH_SIZE):
+        result = await regrade(db, tuple_(Grade.course_id, Grade.assessment_type, Grade.assessment_name).in_(
+            keys[start:start + ASSESSMENT_BATCH_SIZE]
+        ))
+        updated += result.updated
+        curved |= result.curved_student_ids
+    return Regraded(updated, curved)
+
+
+async def graded_course_ids(db: AsyncSession, *criteria) -> List[int]:
+    """Courses with grades matching ``criteria``, which may refer to Grade, Student and Course."""
+    return (await db.scalars(
+        select(Grade.course_id)
+        .join(Student, Student.id == Grade.student_id)
+        .join(Course, Course.id == Grade.course_id)
+        .where(*criteria)
+        .distinct()
+        .order_by(Grade.course_id)
+    )).all()
+
+
+async def regrade_courses(
+    db: AsyncSession,
+    course_ids: Iterable[int],
+    batch_size: int = REGRADE_COURSE_BATCH_SIZE
+) -> Regraded:
+    """Regrade whole courses inside the caller's transaction.
+
+    For writes that move students between scales or change a curved
+    cohort, e.g. a program change or a deleted student.
+    """
+    course_ids = sorted(set(course_ids))
+    updated, curved = 0, set()
+    for start in range(0, len(course_ids), batch_size):
+        result = await regrade(db, Grade.course_id.in_(course_ids[start:start + batch_size]))
+        updated += result.updated
+        curved |= result.curved_student_ids
+    return Regraded(updated, curved)
+
+
+async def regrade_in_batches(
+    db: AsyncSession,
+    *criteria,
+    batch_size: int = REGRADE_COURSE_BATCH_SIZE
+) -> Tuple[int, int]:
+    """Regrade every course with grades matching ``criteria``, committing per batch of courses.
+
+    Whole courses are regraded, so curves always see complete assessments,
+    and the GPAs of everyone graded in them are recomputed on the new
+    scales. Returns the number of courses and of letter grades changed.
+    """
+    # gpa resolves scales through this module, so it is imported here
+    from app.services.gpa import recompute_gpas
+    
+    course_ids = await graded_course_ids(db, *criteria)
+    updated = 0
+    for start in range(0, len(course_ids), batch_size):
+        batch = course_ids[start:start + batch_size]
+        updated += (await regrade(db, Grade.course_id.in_(batch))).updated
+        await recompute_gpas(db, (await db.scalars(
+            select(Grade.student_id).where(Grade.course_id.in_(batch)).distinct()
+        )).all())
+        await db.commit()
+    return len(course_ids), updated
+
+
+async def _main(course_id: Optional[int], semester: Optional[str], batch_size: int) -> None:
+    from app.db.database import AsyncSessionLocal, async_engine
+    
+    criteria = []
+    if course_id:
+        criteria.append(Grade.course_id == course_id)
+    if semester:
+        criteria.append(Course.semester == semester)
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        courses, updated = await regrade_in_batches(db, *criteria, batch_size=batch_size)
+    await async_engine.dispose()
+    print(f"Regraded {courses} courses, {updated} letter grades changed, in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute letter grades from the active grading scales")
+    parser.add_argument("--course-id", type=int, help="Only this course")
+    parser.add_argument("--semester", help="Only courses of this semester, e.g. 'Fall 2025'")
+    parser.add_argument("--batch-size", type=int, default=REGRADE_COURSE_BATCH_SIZE, help="Courses per transaction")
+    args = parser.parse_args()
+    asyncio.run(_main(args.course_id, args.semester, args.batch_size))
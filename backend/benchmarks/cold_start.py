@@ -0,0 +1,67 @@
+"""Cold-start benchmark for the API server.
+
+Launches ``uvicorn main:app`` as a fresh process several times and measures
+the time from exec to the first 200 from /health, which is what a rolling
+restart or a scale-up waits for before a worker takes traffic:
+
+    python -m benchmarks.cold_start --runs 5
+    python -m benchmarks.cold_start --runs 5 --skip-schema-check
+
+Run it from the backend directory with the usual .env in place.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+
+import httpx
+
+from benchmarks.concurrency import percentile
+
+
+def time_to_first_ok(port: int, env: dict, timeout: float) -> float:
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while time.perf_counter() - started < timeout:
+                if process.poll() is not None:
+                    raise RuntimeError(f"Server exited during startup:\n{process.stderr.read().decode()}")
+                try:
+                    if client.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                        return (time.perf_counter() - started) * 1000
+                except httpx.HTTPError:
+                    pass
+                time.sleep(0.01)
+        raise RuntimeError(f"No 200 from /health within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main(args: argparse.Namespace):
+    env = dict(os.environ)
+    if args.skip_schema_check:
+        env["SCHEMA_CHECK_ON_STARTUP"] = "false"
+
+    samples: List[float] = [time_to_first_ok(args.port, env, args.timeout) for _ in range(args.runs)]
+    print(
+        f"cold start ({'no schema check' if args.skip_schema_check else 'schema check'}): "
+        f"runs={len(samples)} mean={statistics.fmean(samples):.0f}ms p50={percentile(samples, 50):.0f}ms "
+        f"min={min(samples):.0f}ms max={max(samples):.0f}ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time from process exec to first 200 response")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--skip-schema-check", action="store_true")
+    main(parser.parse_args())
@@ -0,0 +1,121 @@
+"""EXPLAIN check for the list endpoint queries.
+
+Builds the same queries the list endpoints run, with filter values sampled
+from the database, and fails if any plan sequentially scans one of the
+large tables. Run it against a seeded and ANALYZEd database:
+
+    python -m benchmarks.explain_plans
+
+Exits with status 1 when a sequential scan is found.
+"""
+import argparse
+import json
+import sys
+from typing import Iterator, List, Tuple
+
+from sqlalchemy import select, text
+
+from app.api.v1.endpoints.academic import _attendance_details_query
+from app.api.v1.endpoints.courses import _course_with_faculty_query
+from app.api.v1.endpoints.enrollments import _enrollment_details_query
+from app.api.v1.endpoints.students import _student_with_user_query
+from app.api.v1.pagination import paginate
+from app.db.database import engine
+from app.db.models import Attendance, Course, Enrollment, Grade, Student
+
+LARGE_TABLES = {"users", "students", "enrollments", "attendance", "grades"}
+
+
+def list_queries(conn) -> List[Tuple[str, object]]:
+    student = conn.execute(select(Student.id, Student.program, Student.current_semester).limit(1)).one()
+    course_id, faculty_id = conn.execute(
+        select(Course.id, Course.faculty_id).where(Course.faculty_id.is_not(None)).limit(1)
+    ).one()
+    attendance = conn.execute(select(Attendance.student_id, Attendance.course_id, Attendance.date).limit(1)).one()
+    grade = conn.execute(select(Grade.student_id, Grade.course_id, Grade.assessment_type).limit(1)).one()
+
+    def page(query, columns, descending=False):
+        return paginate(query, columns, None, 0, 100, descending=descending)
+
+    def attendance_page(query):
+        return page(query, [Attendance.date, Attendance.id], descending=True)
+
+    return [
+        ("students", page(_student_with_user_query(), [Student.id])),
+        ("students by program", page(_student_with_user_query().where(Student.program == student.program), [Student.id])),
+        ("students by semester", page(
+            _student_with_user_query().where(Student.current_semester == student.current_semester), [Student.id]
+        )),
+        ("courses by faculty", select(Course).where(Course.faculty_id == faculty_id)),
+        ("course detail", _course_with_faculty_query().where(Course.id == course_id)),
+        ("enrollments", page(_enrollment_details_query(), [Enrollment.id])),
+        ("enrollments by student", page(
+            _enrollment_details_query().where(Enrollment.student_id == student.id), [Enrollment.id]
+        )),
+        ("enrollments by course and status", page(
+            _enrollment_details_query().where(Enrollment.course_id == course_id, Enrollment.status == "active"),
+            [Enrollment.id]
+        )),
+        ("attendance", attendance_page(_attendance_details_query())),
+        ("attendance by student", attendance_page(
+            _attendance_details_query().where(Attendance.student_id == attendance.student_id)
+        )),
+        ("attendance by course and date range", attendance_page(
+            _attendance_details_query().where(
+                Attendance.course_id == attendance.course_id,
+                Attendance.date >= attendance.date,
+                Attendance.date <= attendance.date
+            )
+        )),
+        ("grades", page(select(Grade), [Grade.id])),
+        ("grades by student", page(select(Grade).where(Grade.student_id == grade.student_id), [Grade.id])),
+        ("grades by course and type", page(
+            select(Grade).where(Grade.course_id == grade.course_id, Grade.assessment_type == grade.assessment_type),
+            [Grade.id]
+        )),
+    ]
+
+
+def plan_nodes(node: dict) -> Iterator[dict]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(conn, query) -> dict:
+    sql = str(query.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def large_table_seq_scans(root: dict) -> List[str]:
+    return sorted({
+        node["Relation Name"] for node in plan_nodes(root)
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in LARGE_TABLES
+    })
+
+
+def main(args: argparse.Namespace) -> int:
+    failures = 0
+    with engine.connect() as conn:
+        for label, query in list_queries(conn):
+            root = explain(conn, query)
+            seq_scans = large_table_seq_scans(root)
+            status = "SEQ SCAN on " + ", ".join(seq_scans) if seq_scans else "ok"
+            print(f"{label}: cost={root['Total Cost']:.0f} {status}")
+            if args.verbose:
+                print(json.dumps(root, indent=2))
+            failures += bool(seq_scans)
+
+    if failures:
+        print(f"{failures} list queries fall back to a sequential scan")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail if list endpoint queries sequentially scan large tables")
+    parser.add_argument("--verbose", action="store_true", help="Print the full plan of every query")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,91 @@
+"""Login throughput benchmark for a running API server.
+
+Sends a burst of password logins with bounded concurrency, the way a
+semester start looks to the API, and reports throughput, latency
+percentiles and how many requests were shed with 503. While it runs, an
+unauthenticated probe polls /health so event-loop stalls show up as probe
+latency:
+
+    python -m benchmarks.login --email alice@student.edu --password secret \\
+        --concurrency 32 --requests 500
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+
+from benchmarks.concurrency import percentile
+
+
+async def probe_health(client: httpx.AsyncClient, stop: asyncio.Event, samples: List[float]):
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            await client.get("/health")
+            samples.append((time.perf_counter() - started) * 1000)
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.05)
+
+
+async def main(args: argparse.Namespace):
+    limits = httpx.Limits(max_connections=args.concurrency + 1, max_keepalive_connections=args.concurrency + 1)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        semaphore = asyncio.Semaphore(args.concurrency)
+        latencies: List[float] = []
+        probe_latencies: List[float] = []
+        outcomes = {"ok": 0, "shed": 0, "failed": 0}
+
+        async def one_login():
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    response = await client.post(
+                        "/api/auth/login",
+                        json={"email": args.email, "password": args.password}
+                    )
+                    if response.status_code == 200:
+                        outcomes["ok"] += 1
+                    elif response.status_code == 503:
+                        outcomes["shed"] += 1
+                    else:
+                        outcomes["failed"] += 1
+                except httpx.HTTPError:
+                    outcomes["failed"] += 1
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        stop = asyncio.Event()
+        probe = asyncio.create_task(probe_health(client, stop, probe_latencies))
+        started = time.perf_counter()
+        await asyncio.gather(*(one_login() for _ in range(args.requests)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probe
+
+    print(
+        f"logins: {args.requests} in {elapsed:.2f}s ({outcomes['ok'] / elapsed:.1f} ok/s), "
+        f"ok={outcomes['ok']} shed={outcomes['shed']} failed={outcomes['failed']}"
+    )
+    print(
+        f"login latency: mean={statistics.fmean(latencies):.1f}ms p50={percentile(latencies, 50):.1f}ms "
+        f"p95={percentile(latencies, 95):.1f}ms p99={percentile(latencies, 99):.1f}ms"
+    )
+    if probe_latencies:
+        print(
+            f"/health probe during burst: p50={percentile(probe_latencies, 50):.1f}ms "
+            f"p99={percentile(probe_latencies, 99):.1f}ms max={max(probe_latencies):.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Login throughput benchmark")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    asyncio.run(main(parser.parse_args()))
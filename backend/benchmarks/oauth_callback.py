@@ -0,0 +1,134 @@
+"""OAuth callback latency harness against a local mock provider.
+
+Starts a mock OAuth provider on localhost, points the configured providers
+at it and measures the provider leg of the callback (token exchange plus
+userinfo) with the shared, pooled client and with a fresh client per login,
+which is what every callback used to pay for:
+
+    python -m benchmarks.oauth_callback --provider github --iterations 200
+
+With --full the whole /api/auth/{provider}/callback route is driven
+in-process, which also exercises the user upsert and needs a database.
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+
+import httpx
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.auth import oauth
+from benchmarks.concurrency import percentile
+
+USER_INFO = {
+    "google": {"id": "mock-1", "email": "mock.user@example.edu", "name": "Mock User", "picture": None},
+    "microsoft": {"id": "mock-1", "userPrincipalName": "mock.user@example.edu", "displayName": "Mock User"},
+    "github": {"id": 1, "login": "mock-user", "name": "Mock User", "email": None, "avatar_url": None},
+}
+
+
+def build_mock_provider(provider: str, delay_ms: float) -> Starlette:
+    async def pause():
+        if delay_ms:
+            await asyncio.sleep(delay_ms / 1000)
+
+    async def token(request: Request):
+        await pause()
+        return JSONResponse({"access_token": "mock-access-token", "token_type": "bearer"})
+
+    async def userinfo(request: Request):
+        await pause()
+        return JSONResponse(USER_INFO[provider])
+
+    async def emails(request: Request):
+        await pause()
+        return JSONResponse([{"email": "mock.user@example.edu", "primary": True}])
+
+    return Starlette(routes=[
+        Route("/token", token, methods=["POST"]),
+        Route("/userinfo", userinfo),
+        Route("/emails", emails),
+    ])
+
+
+def point_provider_at(provider: oauth.OAuthProvider, base_url: str):
+    provider.TOKEN_URL = f"{base_url}/token"
+    provider.USERINFO_URL = f"{base_url}/userinfo"
+    if isinstance(provider, oauth.GitHubOAuth):
+        provider.EMAILS_URL = f"{base_url}/emails"
+
+
+async def provider_leg(provider: oauth.OAuthProvider, iterations: int, fresh_client: bool) -> List[float]:
+    latencies = []
+    for _ in range(iterations):
+        if fresh_client:
+            await oauth.close_http_client()
+        started = time.perf_counter()
+        response = await provider.exchange_code("mock-code")
+        user_data = await provider.verify_token(response.json()["access_token"])
+        latencies.append((time.perf_counter() - started) * 1000)
+        if not user_data or not user_data.get("email"):
+            raise RuntimeError("Mock provider returned no user")
+    await oauth.close_http_client()
+    return latencies
+
+
+async def full_callback(provider_name: str, iterations: int) -> List[float]:
+    from main import app
+
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://app") as client:
+        for _ in range(iterations):
+            started = time.perf_counter()
+            response = await client.get(f"/api/auth/{provider_name}/callback", params={"code": "mock-code"})
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 307:
+                raise RuntimeError(f"Callback failed: {response.status_code} {response.text}")
+    return latencies
+
+
+def report(label: str, latencies: List[float]):
+    print(
+        f"{label}: n={len(latencies)} p50={percentile(latencies, 50):.2f}ms "
+        f"p95={percentile(latencies, 95):.2f}ms p99={percentile(latencies, 99):.2f}ms"
+    )
+
+
+async def main(args: argparse.Namespace):
+    base_url = f"http://127.0.0.1:{args.mock_port}"
+    server = uvicorn.Server(uvicorn.Config(
+        build_mock_provider(args.provider, args.provider_delay_ms),
+        host="127.0.0.1", port=args.mock_port, log_level="warning"
+    ))
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    try:
+        provider = oauth.get_oauth_provider(args.provider)
+        point_provider_at(provider, base_url)
+
+        if args.full:
+            report(f"{args.provider} full callback", await full_callback(args.provider, args.iterations))
+        else:
+            report(f"{args.provider} pooled client", await provider_leg(provider, args.iterations, False))
+            report(f"{args.provider} fresh client", await provider_leg(provider, args.iterations, True))
+    finally:
+        server.should_exit = True
+        await serve_task
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OAuth callback latency harness")
+    parser.add_argument("--provider", choices=["google", "microsoft", "github"], default="google")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--mock-port", type=int, default=8765)
+    parser.add_argument("--provider-delay-ms", type=float, default=0.0)
+    parser.add_argument("--full", action="store_true", help="Drive the whole callback route in-process")
+    asyncio.run(main(parser.parse_args()))
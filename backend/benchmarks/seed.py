@@ -0,0 +1,253 @@
+"""Synthetic data generator for load and performance testing.
+
+Generates users, students, faculty, courses, enrollments, attendance and
+grades with skewed, realistic-looking distributions and bulk loads them
+with COPY (pg8000) or batched Core insert() executemany:
+
+    python -m benchmarks.seed --students 100000 --courses 5000 --seed 42
+
+The run is deterministic for a given --seed and dataset size. Rows are
+appended after the current maximum ids, so it can run on top of init_db.py
+data. Every seeded user can log in with --password.
+"""
+import argparse
+import asyncio
+import csv
+import io
+import random
+import time
+from itertools import accumulate
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Sequence
+
+from sqlalchemy import func, select, text
+
+from app.core.grading import letter_grade
+from app.core.security import hash_password
+from app.db.database import AsyncSessionLocal, async_engine, engine
+from app.db.models import Attendance, Course, Enrollment, Grade, Student, User
+from app.services.attendance_rollups import rebuild_statements
+from app.services.gpa import recompute_all_gpas
+
+PROGRAMS = [
+    ("Computer Science", 30), ("Business Administration", 20), ("Engineering", 18),
+    ("Biology", 10), ("Psychology", 9), ("Mathematics", 6), ("History", 4), ("Fine Arts", 3),
+]
+SEMESTERS = ["Fall 2024", "Spring 2025", "Fall 2025", "Spring 2026"]
+SEMESTER_STARTS = {
+    "Fall 2024": date(2024, 9, 2), "Spring 2025": date(2025, 1, 13),
+    "Fall 2025": date(2025, 9, 1), "Spring 2026": date(2026, 1, 12),
+}
+ENROLLMENT_STATUSES = [("active", 80), ("completed", 12), ("dropped", 6), ("withdrawn", 2)]
+ASSESSMENTS = ["assignment", "quiz", "assignment", "midterm", "project", "quiz", "assignment", "final"]
+
+
+def weighted(choices: Sequence[tuple]):
+    values, weights = zip(*choices)
+    return list(values), list(weights)
+
+
+class Loader:
+    """Writes rows of one table either with COPY or with executemany."""
+
+    def __init__(self, conn, method: str, batch_size: int):
+        self.conn = conn
+        self.method = method
+        self.batch_size = batch_size
+        self.counts: Dict[str, int] = {}
+
+    def load(self, table, columns: List[str], rows: Iterable[tuple]) -> None:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self._flush(table, columns, batch)
+                batch = []
+        if batch:
+            self._flush(table, columns, batch)
+
+    def _flush(self, table, columns: List[str], rows: List[tuple]) -> None:
+        if self.method == "copy":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in rows:
+                writer.writerow(["" if value is None else value for value in row])
+            buffer.seek(0)
+            cursor = self.conn.connection.dbapi_connection.cursor()
+            cursor.execute(
+                f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                stream=buffer
+            )
+        else:
+            self.conn.execute(table.insert(), [dict(zip(columns, row)) for row in rows])
+        self.counts[table.name] = self.counts.get(table.name, 0) + len(rows)
+
+
+def next_id(conn, model) -> int:
+    return (conn.scalar(select(func.max(model.id))) or 0) + 1
+
+
+async def recompute_seeded_gpas() -> int:
+    async with AsyncSessionLocal() as db:
+        updated = await recompute_all_gpas(db)
+    await async_engine.dispose()
+    return updated
+
+
+def generate(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    password_hash = hash_password(args.password)
+    program_values, program_weights = weighted(PROGRAMS)
+    status_values, status_weights = weighted(ENROLLMENT_STATUSES)
+    faculty_count = max(1, args.courses // args.courses_per_faculty)
+    started = time.perf_counter()
+
+    with engine.begin() as conn:
+        loader = Loader(conn, args.method, args.batch_size)
+        user_id = next_id(conn, User)
+        student_id = next_id(conn, Student)
+        course_id = next_id(conn, Course)
+        enrollment_id = next_id(conn, Enrollment)
+        attendance_id = next_id(conn, Attendance)
+        grade_id = next_id(conn, Grade)
+        tag = f"s{args.seed}u{user_id}"
+
+        faculty_ids = list(range(user_id, user_id + faculty_count))
+        loader.load(User.__table__, ["id", "email", "full_name", "hashed_password", "role", "is_active"], (
+            (uid, f"faculty{uid}.{tag}@faculty.seed.edu", f"Faculty Member {uid}", password_hash, "FACULTY", True)
+            for uid in faculty_ids
+        ))
+        user_id += faculty_count
+
+        # Courses: popularity follows a Zipf-like curve, so a few courses
+        # are very large and most are small, as in a real catalogue
+        course_rows = []
+        course_semesters = {}
+        for offset in range(args.courses):
+            cid = course_id + offset
+            semester = rng.choice(SEMESTERS)
+            course_semesters[cid] = semester
+            course_rows.append((
+                cid, f"SD{cid}", f"Seeded Course {cid}", rng.choice([1, 2, 3, 3, 3, 4, 4]),
+                rng.choice(faculty_ids), semester, f"{SEMESTER_STARTS[semester].year}", rng.random() < 0.9
+            ))
+        loader.load(Course.__table__, [
+            "id", "course_code", "course_name", "credits", "faculty_id", "semester", "academic_year", "is_active"
+        ], course_rows)
+        course_ids = list(course_semesters)
+        course_weights = [1 / (rank + 1) ** 0.8 for rank in range(len(course_ids))]
+        rng.shuffle(course_weights)
+        course_cum_weights = list(accumulate(course_weights))
+        session_dates = {
+            cid: [SEMESTER_STARTS[semester] + timedelta(days=7 * week + rng.randrange(5)) for week in range(args.sessions)]
+            for cid, semester in course_semesters.items()
+        }
+
+        for chunk_start in range(0, args.students, args.chunk_size):
+            chunk = range(chunk_start, min(args.students, chunk_start + args.chunk_size))
+            users, students, enrollments, attendance, grades = [], [], [], [], []
+
+            for index in chunk:
+                uid, sid = user_id + index, student_id + index
+                program = rng.choices(program_values, program_weights)[0]
+                users.append((uid, f"student{uid}.{tag}@student.seed.edu", f"Student {uid}", password_hash, "STUDENT", True))
+                students.append((sid, uid, f"SD{sid:08d}", program, rng.choice(SEMESTERS), rng.randint(2020, 2025)))
+
+                # Per-student ability and absence propensity, so some
+                # students are consistently strong and a tail is at risk
+                ability = min(98.0, max(35.0, rng.gauss(76, 11)))
+                absence_rate = rng.betavariate(1.2, 9)
+                course_count = max(1, min(len(course_ids), round(rng.gauss(args.enrollments_per_student, 1.2))))
+                chosen = set()
+                while len(chosen) < course_count:
+                    chosen.add(rng.choices(course_ids, cum_weights=course_cum_weights)[0])
+
+                for cid in chosen:
+                    status = rng.choices(status_values, status_weights)[0]
+                    enrollments.append((enrollment_id, sid, cid, status))
+                    enrollment_id += 1
+                    sessions = session_dates[cid]
+                    if status in ("dropped", "withdrawn"):
+                        sessions = sessions[:rng.randrange(1, len(sessions) + 1)]
+                    for day in sessions:
+                        roll = rng.random()
+                        if roll < absence_rate:
+                            mark = "absent"
+                        elif roll < absence_rate + 0.05:
+                            mark = "late"
+                        elif roll < absence_rate + 0.07:
+                            mark = "excused"
+                        else:
+                            mark = "present"
+                        attendance.append((attendance_id, sid, cid, day, mark))
+                        attendance_id += 1
+                    if status in ("dropped", "withdrawn"):
+                        continue
+                    for number, assessment in enumerate(ASSESSMENTS[:args.assessments]):
+                        max_score = 100.0 if assessment in ("midterm", "final") else rng.choice([10.0, 20.0, 50.0])
+                        percentage = min(100.0, max(0.0, rng.gauss(ability - 40 * absence_rate, 8)))
+                        score = round(max_score * percentage / 100, 1)
+                        percentage = round(score / max_score * 100, 2)
+                        grades.append((
+                            grade_id, sid, cid, assessment, f"{assessment.capitalize()} {number + 1}",
+                            score, max_score, percentage, letter_grade(percentage),
+                            sessions[min(len(sessions) - 1, (number + 1) * len(sessions) // (args.assessments + 1))]
+                        ))
+                        grade_id += 1
+
+            loader.load(User.__table__, ["id", "email", "full_name", "hashed_password", "role", "is_active"], users)
+            loader.load(Student.__table__, [
+                "id", "user_id", "student_id", "program", "current_semester", "enrollment_year"
+            ], students)
+            loader.load(Enrollment.__table__, ["id", "student_id", "course_id", "status"], enrollments)
+            loader.load(Attendance.__table__, ["id", "student_id", "course_id", "date", "status"], attendance)
+            loader.load(Grade.__table__, [
+                "id", "student_id", "course_id", "assessment_type", "assessment_name",
+                "score", "max_score", "percentage", "letter_grade", "date_assessed"
+            ], grades)
+            print(f"  {chunk.stop}/{args.students} students ({time.perf_counter() - started:.1f}s)")
+
+        # Ids were assigned here, so the serial sequences must catch up
+        for model in (User, Student, Course, Enrollment, Attendance, Grade):
+            table = model.__tablename__
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"
+            ))
+        
+        # COPY bypasses the attendance endpoints that keep the rollups current
+        for statement in rebuild_statements():
+            conn.execute(statement)
+
+    # Grades were loaded directly too, so GPAs come from the same batch job
+    # the API uses; it needs the rows above committed
+    updated = asyncio.run(recompute_seeded_gpas())
+    print(f"  recomputed GPA for {updated} students ({time.perf_counter() - started:.1f}s)")
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE"))
+
+    elapsed = time.perf_counter() - started
+    total = sum(loader.counts.values())
+    for table, count in loader.counts.items():
+        print(f"{table}: {count} rows")
+    print(f"Loaded {total} rows in {elapsed:.1f}s ({total / elapsed:.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic dataset for load testing")
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--courses", type=int, default=500)
+    parser.add_argument("--courses-per-faculty", type=int, default=4)
+    parser.add_argument("--enrollments-per-student", type=float, default=5.0)
+    parser.add_argument("--sessions", type=int, default=12, help="Attendance sessions per course")
+    parser.add_argument("--assessments", type=int, default=6, choices=range(1, len(ASSESSMENTS) + 1))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--password", default="Student@123")
+    parser.add_argument("--method", choices=["copy", "executemany"], default="copy",
+                        help="COPY needs the pg8000 driver from DATABASE_URL")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--chunk-size", type=int, default=2000, help="Students generated per round")
+    args = parser.parse_args()
+    if args.method == "copy" and engine.dialect.driver != "pg8000":
+        parser.error("--method copy needs a pg8000 DATABASE_URL; use --method executemany")
+    generate(args)
@@ -0,0 +1,239 @@
+"""End-to-end API benchmark suite.
+
+Optionally seeds a dataset (see benchmarks.seed), then drives the real
+FastAPI app through the student, enrollment, attendance, grade and login
+endpoints with concurrent async clients. For each scenario it reports
+throughput, latency percentiles and SQL statements per request, the last
+taken from the Server-Timing header the profiling middleware adds.
+
+By default the app runs in-process; pass --base-url to benchmark a running
+server instead. Results can be written as JSON and compared with an earlier
+run, e.g. from the previous commit:
+
+    python -m benchmarks.suite --seed-students 20000 --seed-courses 1000 \\
+        --output bench-new.json --compare bench-old.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import statistics
+import subprocess
+import time
+from contextlib import AsyncExitStack
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import httpx
+from sqlalchemy import select
+
+from app.core.security import create_access_token
+from app.db.database import engine
+from app.db.models import Attendance, Course, Grade, RoleEnum, Student, User
+from benchmarks import seed
+from benchmarks.concurrency import percentile
+
+STATEMENTS_PATTERN = re.compile(r'db;[^,]*desc="(\d+) statements"')
+
+
+class Scenario:
+
+    def __init__(self, name: str, build: Callable[[random.Random], dict], token: Optional[str] = None):
+        self.name = name
+        self.build = build
+        self.token = token
+
+
+def token_for(user) -> str:
+    return create_access_token(data={"sub": user.id, "email": user.email, "role": user.role.value})
+
+
+def build_scenarios(args: argparse.Namespace) -> List[Scenario]:
+    with engine.connect() as conn:
+        admin = conn.execute(select(User).where(User.role == RoleEnum.ADMIN).limit(1)).one_or_none()
+        faculty = conn.execute(select(User).where(User.role == RoleEnum.FACULTY).limit(1)).one()
+        student_ids = conn.scalars(select(Student.id).order_by(Student.id.desc()).limit(args.sample_size)).all()
+        course_ids = conn.scalars(
+            select(Attendance.course_id).distinct().order_by(Attendance.course_id.desc()).limit(args.sample_size)
+        ).all()
+        grade_student_ids = conn.scalars(
+            select(Grade.student_id).distinct().order_by(Grade.student_id.desc()).limit(args.sample_size)
+        ).all()
+        login_emails = conn.scalars(
+            select(User.email).where(User.role == RoleEnum.STUDENT, User.hashed_password.is_not(None))
+            .order_by(User.id.desc()).limit(args.sample_size)
+        ).all()
+        programs = conn.scalars(select(Student.program).distinct().where(Student.program.is_not(None))).all()
+        active_course_ids = conn.scalars(select(Course.id).where(Course.is_active.is_(True)).limit(args.sample_size)).all()
+
+    staff_token = token_for(admin or faculty)
+    faculty_token = token_for(faculty)
+
+    def get(path: str) -> dict:
+        return {"method": "GET", "url": path}
+
+    scenarios = [
+        Scenario("students_list", lambda rng: get(
+            f"/api/students/?limit=100&program={rng.choice(programs)}" if programs else "/api/students/?limit=100"
+        ), staff_token),
+        Scenario("student_detail", lambda rng: get(f"/api/students/{rng.choice(student_ids)}"), staff_token),
+        Scenario("enrollments_list", lambda rng: get(
+            f"/api/enrollments/?course_id={rng.choice(active_course_ids or course_ids)}"
+        ), faculty_token),
+        Scenario("attendance_list", lambda rng: get(
+            f"/api/academic/attendance/?course_id={rng.choice(course_ids)}"
+        ), faculty_token),
+        Scenario("grades_list", lambda rng: get(
+            f"/api/academic/grades/?student_id={rng.choice(grade_student_ids)}"
+        ), faculty_token),
+    ]
+    if login_emails:
+        scenarios.append(Scenario("login", lambda rng: {
+            "method": "POST", "url": "/api/auth/login",
+            "json": {"email": rng.choice(login_emails), "password": args.password}
+        }))
+    if args.scenario:
+        scenarios = [scenario for scenario in scenarios if scenario.name in args.scenario]
+    return scenarios
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, args: argparse.Namespace) -> Dict:
+    rng = random.Random(f"{args.random_seed}:{scenario.name}")
+    requests = [scenario.build(rng) for _ in range(args.requests)]
+    headers = {"Authorization": f"Bearer {scenario.token}"} if scenario.token else {}
+    queue: asyncio.Queue = asyncio.Queue()
+    for request in requests:
+        queue.put_nowait(request)
+
+    latencies: List[float] = []
+    statements: List[int] = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        while not queue.empty():
+            request = queue.get_nowait()
+            started = time.perf_counter()
+            try:
+                response = await client.request(headers=headers, **request)
+                if response.status_code >= 400:
+                    errors += 1
+                match = STATEMENTS_PATTERN.search(response.headers.get("server-timing", ""))
+                if match:
+                    statements.append(int(match.group(1)))
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    for _ in range(min(args.warmup, len(requests))):
+        await client.request(headers=headers, **requests[0])
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(requests),
+        "errors": errors,
+        "throughput_rps": round(len(requests) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(latencies), 2),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "statements_per_request": round(statistics.fmean(statements), 2) if statements else None,
+        "max_statements": max(statements) if statements else None,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: Dict, baseline_path: str) -> None:
+    with open(baseline_path) as fh:
+        baseline = json.load(fh)
+    print(f"\nCompared with {baseline_path} ({baseline.get('commit') or 'unknown commit'}):")
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        deltas = []
+        for key in ("throughput_rps", "p95_ms", "p99_ms", "statements_per_request"):
+            if previous.get(key) and current.get(key) is not None:
+                deltas.append(f"{key} {(current[key] - previous[key]) / previous[key] * 100:+.1f}%")
+        print(f"  {name}: {', '.join(deltas)}")
+
+
+async def main(args: argparse.Namespace):
+    if args.seed_students:
+        seed.generate(argparse.Namespace(
+            students=args.seed_students, courses=args.seed_courses, courses_per_faculty=4,
+            enrollments_per_student=5.0, sessions=12, assessments=6, seed=args.random_seed,
+            password=args.password, method=args.seed_method, batch_size=10000, chunk_size=2000
+        ))
+
+    scenarios = build_scenarios(args)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with AsyncExitStack() as stack:
+        if args.base_url:
+            client = httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout)
+        else:
+            from main import app
+
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://app", timeout=args.timeout
+            )
+        await stack.enter_async_context(client)
+
+        results = {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "config": {
+                "target": args.base_url or "in-process",
+                "concurrency": args.concurrency,
+                "requests": args.requests,
+                "random_seed": args.random_seed,
+            },
+            "scenarios": {},
+        }
+        for scenario in scenarios:
+            result = await run_scenario(client, scenario, args)
+            results["scenarios"][scenario.name] = result
+            print(
+                f"{scenario.name}: {result['throughput_rps']} req/s, p50={result['p50_ms']}ms "
+                f"p95={result['p95_ms']}ms p99={result['p99_ms']}ms, "
+                f"{result['statements_per_request']} statements/request, {result['errors']} errors"
+            )
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(results, fh, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="End-to-end API benchmark suite")
+    parser.add_argument("--base-url", default=None, help="Benchmark a running server instead of the in-process app")
+    parser.add_argument("--seed-students", type=int, default=0, help="Seed this many students first (0 to skip)")
+    parser.add_argument("--seed-courses", type=int, default=500)
+    parser.add_argument("--seed-method", choices=["copy", "executemany"], default="copy")
+    parser.add_argument("--password", default="Student@123", help="Password of the seeded students")
+    parser.add_argument("--scenario", action="append", help="Only run this scenario, may be repeated")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--sample-size", type=int, default=1000, help="Ids sampled for request parameters")
+    parser.add_argument("--random-seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    asyncio.run(main(parser.parse_args()))
@@ -1,3 +1,5 @@
+from alembic import command
+from alembic.config import Config
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from datetime import date, datetime, timedelta
@@ -6,17 +8,23 @@ import os
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from app.db.models import Base, User, Student, Course, Enrollment, Attendance, Grade, RoleEnum
+from app.db.models import User, Student, Course, Enrollment, Attendance, Grade, RoleEnum
 from app.core.config import settings
+from app.services.attendance_rollups import rebuild_statements
 
 engine = create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(bind=engine)
 
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
 def init_db():
     
-    print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    print("✓ Tables created")
+    # The schema comes from the migrations, as in every deployment
+    print("Applying migrations (alembic upgrade head)...")
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    command.upgrade(config, "head")
+    print("✓ Schema up to date")
     
     db = SessionLocal()
     
@@ -161,6 +169,8 @@ def init_db():
                 )
                 db.add(attendance)
         
+        for statement in rebuild_statements():
+            db.execute(statement)
         db.commit()
         print("✓ Attendance records created")
         
@@ -1,16 +1,22 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import PlainTextResponse, Response
 from app.core.config import settings
 from app.api.v1.router import api_router
-from app.db.database import engine
-from app.db import models
+from app.db.database import engine, async_engine
+from app.db.schema import verify_schema_revision
+from app.core.cache import all_caches
+from app.core.security import shutdown_password_executor
+from app.auth.oauth import close_http_client
+from app.core.profiling import RequestProfilingMiddleware, install_sql_hooks
+from app.core import metrics
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-models.Base.metadata.create_all(bind=engine)
 
 def check_oauth_config():
     providers = {
@@ -43,7 +49,26 @@ def check_oauth_config():
     else:
         logger.info(f"✅ OAuth configured for: {', '.join(configured)}")
 
-check_oauth_config()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs once per worker before it accepts requests, not at import time
+    if settings.SCHEMA_CHECK_ON_STARTUP:
+        revision = await verify_schema_revision()
+        logger.info(f"Database schema at revision {revision}")
+    check_oauth_config()
+    
+    flush_task = None
+    if settings.METRICS_ENABLED and settings.METRICS_MULTIPROC_DIR:
+        flush_task = asyncio.create_task(metrics.flush_periodically())
+    yield
+    if flush_task is not None:
+        flush_task.cancel()
+        metrics.write_snapshot()
+    await close_http_client()
+    shutdown_password_executor()
+    await async_engine.dispose()
+
 
 app = FastAPI(
     title="Student Management System API",
@@ -51,6 +76,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    lifespan=lifespan,
 )
 
 allowed_origins = {
@@ -67,8 +93,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Server-Timing", "ETag"],
 )
 
+if settings.PROFILING_ENABLED:
+    install_sql_hooks(engine)
+    install_sql_hooks(async_engine.sync_engine)
+    app.add_middleware(RequestProfilingMiddleware)
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
 app.include_router(api_router, prefix="/api")
 
 
@@ -85,7 +120,21 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "✅ Healthy", "database": "Connected"}
+    return {
+        "status": "✅ Healthy",
+        "database": "Connected",
+        "caches": {name: cache.stats() for name, cache in all_caches().items()}
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    if not settings.METRICS_ENABLED:
+        return Response(status_code=404)
+    return PlainTextResponse(
+        metrics.render(metrics.collect()),
+        media_type="text/plain; version=0.0.4"
+    )
 
 
 @app.get("/favicon.ico")
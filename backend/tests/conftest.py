@@ -0,0 +1,142 @@
+"""Shared fixtures for the API tests.
+
+The tests talk to a real PostgreSQL database named by TEST_DATABASE_URL and
+are skipped when it is not set. The database is migrated to head once per
+session and truncated before every test, so point it at a scratch database.
+"""
+import os
+from pathlib import Path
+
+import pytest
+from sqlalchemy.engine import make_url
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+def _sync_database_url(url: str) -> str:
+    # The sync engine uses pg8000, the only sync driver in the requirements;
+    # a plain postgresql:// URL would make SQLAlchemy look for psycopg2
+    url = make_url(url)
+    if url.get_backend_name() == "postgresql" and url.get_driver_name() != "pg8000":
+        url = url.set(drivername="postgresql+pg8000")
+    return url.render_as_string(hide_password=False)
+
+
+# Settings are read at import time, so the environment has to be in place
+# before anything from app is imported
+os.environ["DATABASE_URL"] = _sync_database_url(TEST_DATABASE_URL or "postgresql+pg8000://localhost/unconfigured")
+os.environ["ASYNC_DATABASE_URL"] = ""
+for _name in (
+    "SECRET_KEY",
+    "GOOGLE_CLIENT_ID", "GOOGLE_CLIENT_SECRET", "GOOGLE_REDIRECT_URI",
+    "MICROSOFT_CLIENT_ID", "MICROSOFT_CLIENT_SECRET", "MICROSOFT_REDIRECT_URI",
+    "GITHUB_CLIENT_ID", "GITHUB_CLIENT_SECRET", "GITHUB_REDIRECT_URI",
+    "FRONTEND_URL",
+):
+    os.environ.setdefault(_name, "test")
+
+import httpx
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import event, text
+
+from app.core.cache import all_caches
+from app.core.security import create_access_token
+from app.db.database import Base, SessionLocal, async_engine, engine
+from app.db.models import RoleEnum, TableVersion
+from main import app
+from tests import factories
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def pytest_collection_modifyitems(config, items):
+    if TEST_DATABASE_URL:
+        return
+    skip = pytest.mark.skip(reason="TEST_DATABASE_URL is not set")
+    for item in items:
+        item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def migrated_database():
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    command.upgrade(config, "head")
+    yield
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def clean_database(request, migrated_database):
+    tables = ", ".join(
+        table.name for table in Base.metadata.sorted_tables if table.name != TableVersion.__tablename__
+    )
+    with engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+    for cache in all_caches().values():
+        cache.clear()
+    yield
+
+
+@pytest.fixture
+def db():
+    """Synchronous session for arranging test data outside the request path."""
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+async def client():
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    # Pooled asyncpg connections are bound to this test's event loop
+    await async_engine.dispose()
+
+
+def auth_headers(user) -> dict:
+    token = create_access_token(data={"sub": user.id, "email": user.email, "role": user.role.value})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def admin(db):
+    return factories.create_user(db, role=RoleEnum.ADMIN)
+
+
+@pytest.fixture
+def admin_headers(admin):
+    return auth_headers(admin)
+
+
+class StatementCounter:
+    """Records every statement the API's async engine sends to the database."""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    async def count(self, client, url: str, **kwargs) -> int:
+        """Number of statements one successful GET of ``url`` runs."""
+        self.statements.clear()
+        response = await client.get(url, **kwargs)
+        assert response.status_code == 200, response.text
+        return len(self.statements)
+
+
+@pytest.fixture
+def statement_counter():
+    counter = StatementCounter()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(async_engine.sync_engine, "before_cursor_execute", counter)
@@ -0,0 +1,56 @@
+"""Helpers that insert rows for tests through a synchronous session."""
+from datetime import date, timedelta
+from itertools import count
+from typing import List
+
+from app.db.models import Attendance, Course, Enrollment, RoleEnum, Student, User
+
+_sequence = count(1)
+
+
+def create_user(db, role: RoleEnum = RoleEnum.STUDENT, **fields) -> User:
+    n = next(_sequence)
+    user = User(email=f"user{n}@example.edu", full_name=f"User {n}", role=role, is_active=True, **fields)
+    db.add(user)
+    db.commit()
+    return user
+
+
+def create_student(db, **fields) -> Student:
+    user = create_user(db, role=RoleEnum.STUDENT)
+    fields.setdefault("program", "Computer Science")
+    fields.setdefault("current_semester", "Fall 2026")
+    student = Student(user_id=user.id, student_id=f"S{user.id:06d}", **fields)
+    db.add(student)
+    db.commit()
+    return student
+
+
+def create_students(db, n: int, **fields) -> List[Student]:
+    return [create_student(db, **fields) for _ in range(n)]
+
+
+def create_course(db, **fields) -> Course:
+    n = next(_sequence)
+    fields.setdefault("credits", 3)
+    course = Course(course_code=f"C{n:05d}", course_name=f"Course {n}", is_active=True, **fields)
+    db.add(course)
+    db.commit()
+    return course
+
+
+def enroll(db, students: List[Student], course: Course, status: str = "active") -> List[Enrollment]:
+    enrollments = [Enrollment(student_id=student.id, course_id=course.id, status=status) for student in students]
+    db.add_all(enrollments)
+    db.commit()
+    return enrollments
+
+
+def record_attendance(db, students: List[Student], course: Course, days: int,
+                      start: date = date(2026, 9, 1), status: str = "present") -> None:
+    db.add_all(
+        Attendance(student_id=student.id, course_id=course.id, date=start + timedelta(days=day), status=status)
+        for student in students
+        for day in range(days)
+    )
+    db.commit()
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app.api.v1.endpoints import academic
+from app.core.config import settings
+from app.db.models import Attendance, AttendanceDailyRollup, AttendanceStudentRollup
+from tests import factories
+
+pytestmark = pytest.mark.anyio
+
+COUNTS = ("present", "absent", "late", "excused", "total")
+
+
+@pytest.fixture
+def batch(db):
+    course = factories.create_course(db)
+    students = factories.create_students(db, 4)
+    factories.enroll(db, students, course)
+    statuses = ["present", "absent", "late", "present"]
+    return {
+        "course_id": course.id,
+        "date": "2026-09-01",
+        "records": [{"student_id": student.id, "status": status} for student, status in zip(students, statuses)],
+    }
+
+
+def rollup_totals(db, model):
+    db.expire_all()
+    return tuple(db.execute(select(*[func.coalesce(func.sum(getattr(model, column)), 0) for column in COUNTS])).one())
+
+
+def attendance_totals(db):
+    rows = dict(db.execute(select(Attendance.status, func.count()).group_by(Attendance.status)).all())
+    return tuple(rows.get(status, 0) for status in COUNTS[:-1]) + (sum(rows.values()),)
+
+
+def assert_rollups_match_attendance(db):
+    for model in (AttendanceStudentRollup, AttendanceDailyRollup):
+        assert rollup_totals(db, model) == attendance_totals(db)
+
+
+async def test_resubmitted_batch_leaves_rollups_unchanged(client, db, admin_headers, batch):
+    first = await client.post("/api/academic/attendance/bulk", json=batch, headers=admin_headers)
+    assert first.json() == {"inserted": 4, "updated": 0}
+    after_first = rollup_totals(db, AttendanceStudentRollup)
+    
+    second = await client.post("/api/academic/attendance/bulk", json=batch, headers=admin_headers)
+    
+    assert second.json() == {"inserted": 0, "updated": 4}
+    assert rollup_totals(db, AttendanceStudentRollup) == after_first
+    assert_rollups_match_attendance(db)
+
+
+async def test_concurrent_duplicate_batches_count_rows_once(client, db, admin_headers, batch):
+    responses = await asyncio.gather(*[
+        client.post("/api/academic/attendance/bulk", json=batch, headers=admin_headers) for _ in range(4)
+    ])
+    
+    assert all(response.status_code == 200 for response in responses)
+    assert sum(response.json()["inserted"] for response in responses) == 4
+    assert_rollups_match_attendance(db)
+
+
+async def test_batches_past_one_statement_are_split(client, db, admin_headers, batch, monkeypatch):
+    monkeypatch.setattr(academic, "ATTENDANCE_UPSERT_BATCH_SIZE", 3)
+    
+    response = await client.post("/api/academic/attendance/bulk", json=batch, headers=admin_headers)
+    
+    assert response.json() == {"inserted": 4, "updated": 0}
+    assert_rollups_match_attendance(db)
+
+
+async def test_oversized_batch_is_rejected(client, admin_headers, batch, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_IMPORT_MAX_ROWS", 3)
+    
+    response = await client.post("/api/academic/attendance/bulk", json=batch, headers=admin_headers)
+    
+    assert response.status_code == 413
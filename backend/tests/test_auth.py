@@ -0,0 +1,30 @@
+import pytest
+
+from app.db.models import RoleEnum
+from tests import factories
+from tests.conftest import auth_headers
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_deactivating_a_user_evicts_the_cached_principal(client, db, admin_headers):
+    faculty = factories.create_user(db, role=RoleEnum.FACULTY)
+    headers = auth_headers(faculty)
+    assert (await client.get("/api/students/", headers=headers)).status_code == 200
+    
+    deactivated = await client.patch(f"/api/users/{faculty.id}", json={"is_active": False}, headers=admin_headers)
+    assert deactivated.status_code == 200
+    
+    response = await client.get("/api/students/", headers=headers)
+    
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Inactive user"
+
+
+async def test_cached_principal_costs_no_query(client, db, statement_counter):
+    faculty = factories.create_user(db, role=RoleEnum.FACULTY)
+    headers = auth_headers(faculty)
+    await client.get("/api/courses/faculty/my-courses", headers=headers)
+    
+    # The endpoint itself runs one query; the principal comes from the cache
+    assert await statement_counter.count(client, "/api/courses/faculty/my-courses", headers=headers) == 1
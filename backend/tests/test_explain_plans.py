@@ -0,0 +1,40 @@
+"""The list endpoint queries must be answerable from an index.
+
+The test database is far too small for the planner to prefer an index on
+its own, so sequential scans are disabled: a plan that still scans one of
+the large tables has no index it could use.
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+
+from app.db.database import engine
+from app.db.models import Grade, RoleEnum
+from benchmarks.explain_plans import explain, large_table_seq_scans, list_queries
+from tests import factories
+
+
+@pytest.fixture
+def plans(db):
+    faculty = factories.create_user(db, role=RoleEnum.FACULTY)
+    course = factories.create_course(db, faculty_id=faculty.id)
+    students = factories.create_students(db, 3)
+    factories.enroll(db, students, course)
+    factories.record_attendance(db, students, course, days=2)
+    db.add_all(
+        Grade(student_id=student.id, course_id=course.id, assessment_type="quiz", assessment_name="Quiz 1",
+              score=8, max_score=10, percentage=80.0, date_assessed=date(2026, 9, 1))
+        for student in students
+    )
+    db.commit()
+    
+    with engine.connect() as conn:
+        conn.execute(text("SET enable_seqscan = off"))
+        yield [(label, explain(conn, query)) for label, query in list_queries(conn)]
+
+
+def test_list_queries_use_indexes(plans):
+    seq_scans = {label: large_table_seq_scans(root) for label, root in plans}
+    
+    assert {label: tables for label, tables in seq_scans.items() if tables} == {}
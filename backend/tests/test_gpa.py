@@ -0,0 +1,53 @@
+from datetime import date
+
+import pytest
+
+from app.db.models import Grade, Student
+from tests import factories
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def graded_student(db):
+    # 100% in one course (4.0) and 0% in another (0.0), three credits each
+    student = factories.create_student(db)
+    courses = [factories.create_course(db, credits=3) for _ in range(2)]
+    for course, score in zip(courses, (10, 0)):
+        factories.enroll(db, [student], course)
+        db.add(Grade(student_id=student.id, course_id=course.id, assessment_type="quiz", assessment_name="Quiz 1",
+                     score=score, max_score=10, percentage=score * 10.0, date_assessed=date(2026, 9, 1)))
+    student.gpa = 2.0
+    db.commit()
+    return student, courses
+
+
+def gpa_of(db, student):
+    db.expire_all()
+    return db.get(Student, student.id).gpa
+
+
+async def test_credit_change_recomputes_gpa(client, db, admin_headers, graded_student):
+    student, (passed, _) = graded_student
+    
+    response = await client.patch(f"/api/courses/{passed.id}", json={"credits": 1}, headers=admin_headers)
+    
+    assert response.status_code == 200
+    assert gpa_of(db, student) == 1.0
+
+
+async def test_course_delete_recomputes_gpa(client, db, admin_headers, graded_student):
+    student, (passed, _) = graded_student
+    
+    response = await client.delete(f"/api/courses/{passed.id}", headers=admin_headers)
+    
+    assert response.status_code == 200
+    assert gpa_of(db, student) == 0.0
+
+
+async def test_gpa_cannot_be_set_directly(client, db, admin_headers, graded_student):
+    student, _ = graded_student
+    
+    await client.patch(f"/api/students/{student.id}", json={"gpa": 4.0}, headers=admin_headers)
+    
+    assert gpa_of(db, student) == 2.0
@@ -0,0 +1,30 @@
+from datetime import date
+
+import pytest
+
+from app.db.models import Grade
+from tests import factories
+
+pytestmark = pytest.mark.anyio
+
+
+def add_grade(db, student, course, score):
+    db.add(Grade(student_id=student.id, course_id=course.id, assessment_type="quiz", assessment_name="Quiz 1",
+                 score=score, max_score=10, percentage=score * 10.0, date_assessed=date(2026, 9, 1)))
+    db.commit()
+
+
+async def test_cached_stats_see_grades_written_outside_this_process(client, db, admin_headers):
+    course = factories.create_course(db)
+    first, second = factories.create_students(db, 2)
+    add_grade(db, first, course, 8)
+    url = f"/api/academic/courses/{course.id}/grade-stats"
+    
+    assert (await client.get(url, headers=admin_headers)).json()["assessments"][0]["count"] == 1
+    # Written behind the API's back, as another worker would
+    add_grade(db, second, course, 6)
+    
+    assessment = (await client.get(url, headers=admin_headers)).json()["assessments"][0]
+    
+    assert assessment["count"] == 2
+    assert assessment["mean"] == 70.0
@@ -0,0 +1,115 @@
+from datetime import date
+
+import pytest
+
+from app.db.models import Grade, RoleEnum, Student
+from tests import factories
+from tests.conftest import auth_headers
+
+pytestmark = pytest.mark.anyio
+
+
+def add_grade(db, student, course, score):
+    grade = Grade(student_id=student.id, course_id=course.id, assessment_type="quiz", assessment_name="Quiz 1",
+                  score=score, max_score=10, percentage=score * 10.0, date_assessed=date(2026, 9, 1))
+    db.add(grade)
+    db.commit()
+    return grade
+
+
+def letter_of(db, grade):
+    db.expire_all()
+    return db.get(Grade, grade.id).letter_grade
+
+
+def scale(**fields):
+    return {
+        "name": "Test scale",
+        "cutoffs": [{"min_percentage": 90, "letter": "A"}, {"min_percentage": 50, "letter": "C"}],
+        **fields,
+    }
+
+
+async def test_faculty_manage_only_their_own_course_scales(client, db):
+    owner, other = (factories.create_user(db, role=RoleEnum.FACULTY) for _ in range(2))
+    course = factories.create_course(db, faculty_id=owner.id)
+    body = scale(scope="course", course_id=course.id)
+    
+    denied = await client.post("/api/grading-scales/", json=body, headers=auth_headers(other))
+    created = await client.post("/api/grading-scales/", json=body, headers=auth_headers(owner))
+    
+    assert denied.status_code == 403
+    assert created.status_code == 201
+    deleted = await client.delete(f"/api/grading-scales/{created.json()['id']}", headers=auth_headers(other))
+    assert deleted.status_code == 403
+
+
+async def test_program_change_regrades_the_student(client, db, admin_headers):
+    student = factories.create_student(db, program="Computer Science")
+    grade = add_grade(db, student, factories.create_course(db), 6)
+    response = await client.post(
+        "/api/grading-scales/", json=scale(scope="program", program="Mathematics"), headers=admin_headers
+    )
+    assert response.status_code == 201
+    assert letter_of(db, grade) is None
+    
+    await client.patch(f"/api/students/{student.id}", json={"program": "Mathematics"}, headers=admin_headers)
+    
+    assert letter_of(db, grade) == "C"
+
+
+@pytest.mark.parametrize("delete_path", ["students", "users"])
+async def test_deleting_a_student_regrades_curved_courses(client, db, admin_headers, delete_path):
+    course = factories.create_course(db)
+    top, other = factories.create_students(db, 2)
+    add_grade(db, top, course, 8)
+    grade = add_grade(db, other, course, 4)
+    body = scale(scope="course", course_id=course.id, curve_mode="top_score")
+    assert (await client.post("/api/grading-scales/", json=body, headers=admin_headers)).status_code == 201
+    assert letter_of(db, grade) == "C"
+    
+    target = top.id if delete_path == "students" else top.user_id
+    response = await client.delete(f"/api/{delete_path}/{target}", headers=admin_headers)
+    
+    assert response.status_code == 200
+    assert letter_of(db, grade) == "A"
+
+
+
+async def test_gpa_follows_the_scale_and_its_curve(client, db, admin_headers):
+    course = factories.create_course(db)
+    top, other = factories.create_students(db, 2)
+    add_grade(db, top, course, 8)
+    add_grade(db, other, course, 4)
+    cutoffs = [{"min_percentage": 50, "letter": "P", "grade_points": 2.5}, {"min_percentage": 90, "letter": "A"}]
+    body = scale(scope="course", course_id=course.id, curve_mode="top_score", cutoffs=cutoffs)
+    
+    response = await client.post("/api/grading-scales/", json=body, headers=admin_headers)
+    
+    assert response.status_code == 201
+    assert (gpa_of(db, top), gpa_of(db, other)) == (4.0, 2.5)
+
+
+async def test_grade_writes_recompute_gpas_across_a_curve(client, db, admin_headers):
+    course = factories.create_course(db)
+    top, other = factories.create_students(db, 2)
+    add_grade(db, top, course, 8)
+    body = scale(scope="course", course_id=course.id, curve_mode="top_score")
+    assert (await client.post("/api/grading-scales/", json=body, headers=admin_headers)).status_code == 201
+    assert gpa_of(db, top) == 4.0
+    
+    response = await client.post("/api/academic/grades/", json={
+        "student_id": other.id, "course_id": course.id, "assessment_type": "quiz", "assessment_name": "Quiz 1",
+        "score": 10, "max_score": 10
+    }, headers=admin_headers)
+    
+    assert response.status_code == 201
+    assert gpa_of(db, top) == 2.0
+
+
+async def test_letters_without_standard_points_need_grade_points(client, admin_headers):
+    body = scale(scope="institution", cutoffs=[{"min_percentage": 50, "letter": "P"}])
+    
+    response = await client.post("/api/grading-scales/", json=body, headers=admin_headers)
+    
+    assert response.status_code == 400
@@ -0,0 +1,39 @@
+import pytest
+
+from app.api.v1.pagination import NEXT_CURSOR_HEADER, encode_cursor
+from tests import factories
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_cursor_walks_every_page(client, db, admin_headers):
+    students = factories.create_students(db, 5)
+    
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/api/students/", params=params, headers=admin_headers)
+        assert response.status_code == 200
+        seen += [student["id"] for student in response.json()]
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+    
+    assert seen == [student.id for student in students]
+
+
+@pytest.mark.parametrize("values", [["7"], [True], [{"d": "2026-09-01"}], [1.5], [1, 2]])
+async def test_cursor_values_must_match_the_ordering_columns(client, admin_headers, values):
+    response = await client.get("/api/students/", params={"cursor": encode_cursor(values)}, headers=admin_headers)
+    
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid pagination cursor"
+
+
+@pytest.mark.parametrize("values", [[{"d": "2026-09-01"}, "x"], ["2026-09-01", 1], [{"dt": "2026-09-01T00:00:00"}, 1]])
+async def test_attendance_cursor_values_must_match_the_ordering_columns(client, admin_headers, values):
+    response = await client.get(
+        "/api/academic/attendance/", params={"cursor": encode_cursor(values)}, headers=admin_headers
+    )
+    
+    assert response.status_code == 400
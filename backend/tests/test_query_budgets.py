@@ -0,0 +1,80 @@
+"""Statement budgets for list endpoints.
+
+A page has to cost the same number of statements whatever its size; a count
+that grows with ``limit`` means rows are being loaded one query at a time.
+"""
+import pytest
+
+from app.db.models import RoleEnum
+from tests import factories
+
+pytestmark = pytest.mark.anyio
+
+LIMITS = (1, 10, 50)
+
+
+async def statements_per_limit(client, statement_counter, url, headers):
+    # The first request also loads the principal into the auth cache
+    await client.get(url, headers=headers)
+    return [
+        await statement_counter.count(client, url, params={"limit": limit}, headers=headers)
+        for limit in LIMITS
+    ]
+
+
+async def test_attendance_list_statements_do_not_grow_with_limit(client, db, admin_headers, statement_counter):
+    course = factories.create_course(db)
+    factories.record_attendance(db, factories.create_students(db, 10), course, days=6)
+    
+    counts = await statements_per_limit(client, statement_counter, "/api/academic/attendance/", admin_headers)
+    
+    assert counts == [counts[0]] * len(LIMITS)
+    assert counts[0] <= 1
+
+
+async def test_student_list_statements_do_not_grow_with_limit(client, db, admin_headers, statement_counter):
+    factories.create_students(db, 60)
+    
+    counts = await statements_per_limit(client, statement_counter, "/api/students/", admin_headers)
+    
+    assert counts == [counts[0]] * len(LIMITS)
+    assert counts[0] <= 2
+
+
+async def test_course_list_statements_do_not_grow_with_limit(client, db, admin_headers, statement_counter):
+    faculty = factories.create_user(db, role=RoleEnum.FACULTY)
+    for _ in range(60):
+        factories.create_course(db, faculty_id=faculty.id)
+    
+    counts = await statements_per_limit(client, statement_counter, "/api/courses/", admin_headers)
+    
+    assert counts == [counts[0]] * len(LIMITS)
+    assert counts[0] <= 2
+
+
+async def test_enrollment_list_statements_do_not_grow_with_limit(client, db, admin_headers, statement_counter):
+    students = factories.create_students(db, 30)
+    for _ in range(2):
+        factories.enroll(db, students, factories.create_course(db))
+    
+    counts = await statements_per_limit(client, statement_counter, "/api/enrollments/", admin_headers)
+    
+    assert counts == [counts[0]] * len(LIMITS)
+    assert counts[0] <= 2
+
+
+async def test_student_enrollments_statements_do_not_grow_with_courses(client, db, admin_headers, statement_counter):
+    one_course, many_courses = factories.create_students(db, 2)
+    courses = [factories.create_course(db) for _ in range(8)]
+    factories.enroll(db, [one_course], courses[0])
+    for course in courses:
+        factories.enroll(db, [many_courses], course)
+    
+    await client.get(f"/api/enrollments/student/{one_course.id}/courses", headers=admin_headers)
+    counts = [
+        await statement_counter.count(client, f"/api/enrollments/student/{student.id}/courses", headers=admin_headers)
+        for student in (one_course, many_courses)
+    ]
+    
+    assert counts[0] == counts[1]
+    assert counts[0] <= 2
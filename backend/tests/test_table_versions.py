@@ -0,0 +1,66 @@
+from sqlalchemy import select, text
+
+from app.db.database import engine
+from app.db.models import RoleEnum, Student, TableVersion, User
+
+
+def versions():
+    with engine.connect() as conn:
+        return dict(conn.execute(select(TableVersion.table_name, TableVersion.version)).all())
+
+
+def add_student(conn, n):
+    user_id = conn.scalar(User.__table__.insert().values(
+        email=f"versions{n}@example.edu", full_name="Versions", role=RoleEnum.STUDENT
+    ).returning(User.id))
+    conn.execute(Student.__table__.insert().values(user_id=user_id, student_id=f"V{n}"))
+
+
+def test_versions_move_once_per_committed_transaction():
+    before = versions()
+    
+    with engine.begin() as conn:
+        for n in range(3):
+            add_student(conn, n)
+    
+    after = versions()
+    assert after["users"] == before["users"] + 1
+    assert after["students"] == before["students"] + 1
+    assert after["courses"] == before["courses"]
+
+
+def test_rolled_back_writes_leave_versions_alone():
+    before = versions()
+    
+    with engine.connect() as conn:
+        add_student(conn, 1)
+        conn.rollback()
+    
+    assert versions() == before
+
+
+def test_writes_in_opposite_table_order_do_not_deadlock():
+    with engine.begin() as conn:
+        add_student(conn, 1)
+    
+    before = versions()
+    
+    # Neither transaction locks table_versions rows before it commits, so the
+    # delete does not wait on the open create
+    first, second = engine.connect(), engine.connect()
+    try:
+        first.begin()
+        add_student(first, 2)
+        second.begin()
+        second.execute(text("SET LOCAL lock_timeout = '5s'"))
+        second.execute(Student.__table__.delete().where(Student.student_id == "V1"))
+        second.execute(User.__table__.delete().where(User.email == "versions1@example.edu"))
+        first.commit()
+        second.commit()
+    finally:
+        first.close()
+        second.close()
+    
+    after = versions()
+    assert after["users"] == before["users"] + 2
+    assert after["students"] == before["students"] + 2
@@ -112,17 +112,15 @@ const MarkAttendancePage = () => {
     setSuccess('');
 
     try {
-      // Submit attendance for each student
-      const promises = Object.entries(attendance).map(([studentId, isPresent]) => 
-        api.post('/academic/attendance/', {
+      // Submit the whole class in one request
+      await api.post('/academic/attendance/bulk', {
+        course_id: parseInt(selectedCourse),
+        date: attendanceDate,
+        records: Object.entries(attendance).map(([studentId, isPresent]) => ({
           student_id: parseInt(studentId),
-          course_id: parseInt(selectedCourse),
-          date: attendanceDate,
           status: isPresent ? 'present' : 'absent'
-        })
-      );
-
-      await Promise.all(promises);
+        }))
+      });
 
       setSuccess('Attendance marked successfully!');
       
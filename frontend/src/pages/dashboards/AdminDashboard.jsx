@@ -1,6 +1,6 @@
 import { useQuery } from '@tanstack/react-query'
 import { useNavigate } from 'react-router-dom'
-import { usersApi, studentsApi, coursesApi, enrollmentsApi } from '../../services/api'
+import { studentsApi, coursesApi, statsApi } from '../../services/api'
 import { useAuthStore } from '../../store/authStore'
 import { Users, UserCheck, BookOpen, ClipboardList, UserPlus, PlusCircle, Award, ClipboardCheck } from 'lucide-react'
 
@@ -8,30 +8,25 @@ export default function AdminDashboard() {
   const { user } = useAuthStore()
   const navigate = useNavigate()
   
-  const { data: users = [] } = useQuery({
-    queryKey: ['users'],
-    queryFn: () => usersApi.getUsers({ limit: 100 }),
+  const { data: overview } = useQuery({
+    queryKey: ['stats', 'overview'],
+    queryFn: () => statsApi.getOverview(),
   })
 
   const { data: students = [] } = useQuery({
-    queryKey: ['students'],
-    queryFn: () => studentsApi.getStudents({ limit: 100 }),
+    queryKey: ['students', { limit: 5 }],
+    queryFn: () => studentsApi.getStudents({ limit: 5 }),
   })
 
   const { data: courses = [] } = useQuery({
-    queryKey: ['courses'],
-    queryFn: () => coursesApi.getCourses({ limit: 100 }),
-  })
-
-  const { data: enrollments = [] } = useQuery({
-    queryKey: ['enrollments'],
-    queryFn: () => enrollmentsApi.getEnrollments({ limit: 100 }),
+    queryKey: ['courses', { limit: 5 }],
+    queryFn: () => coursesApi.getCourses({ limit: 5 }),
   })
 
   const stats = [
     {
       name: 'Total Users',
-      value: users.length,
+      value: overview?.total_users ?? 0,
       icon: Users,
       bgColor: 'bg-blue-500/10',
       textColor: 'text-blue-400',
@@ -39,7 +34,7 @@ export default function AdminDashboard() {
     },
     {
       name: 'Students',
-      value: students.length,
+      value: overview?.total_students ?? 0,
       icon: UserCheck,
       bgColor: 'bg-green-500/10',
       textColor: 'text-green-400',
@@ -47,7 +42,7 @@ export default function AdminDashboard() {
     },
     {
       name: 'Courses',
-      value: courses.length,
+      value: overview?.total_courses ?? 0,
       icon: BookOpen,
       bgColor: 'bg-purple-500/10',
       textColor: 'text-purple-400',
@@ -55,7 +50,7 @@ export default function AdminDashboard() {
     },
     {
       name: 'Enrollments',
-      value: enrollments.length,
+      value: overview?.total_enrollments ?? 0,
       icon: ClipboardList,
       bgColor: 'bg-amber-500/10',
       textColor: 'text-amber-400',
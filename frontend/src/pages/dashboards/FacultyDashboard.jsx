@@ -1,6 +1,6 @@
 import { useQuery } from '@tanstack/react-query'
 import { useNavigate } from 'react-router-dom'
-import { coursesApi, studentsApi } from '../../services/api'
+import { coursesApi, statsApi } from '../../services/api'
 import { useAuthStore } from '../../store/authStore'
 import { BookOpen, Users, Award, UserCheck, PlusCircle, ClipboardCheck } from 'lucide-react'
 
@@ -13,9 +13,9 @@ export default function FacultyDashboard() {
     queryFn: () => coursesApi.getMyCourses(),
   })
 
-  const { data: students = [] } = useQuery({
-    queryKey: ['students'],
-    queryFn: () => studentsApi.getStudents({ limit: 100 }),
+  const { data: facultyStats } = useQuery({
+    queryKey: ['stats', 'faculty'],
+    queryFn: () => statsApi.getFacultyStats(),
   })
 
   const stats = [
@@ -29,7 +29,7 @@ export default function FacultyDashboard() {
     },
     {
       name: 'Total Students',
-      value: students.length,
+      value: facultyStats?.total_students ?? 0,
       icon: Users,
       bgColor: 'bg-green-500/10',
       textColor: 'text-green-400',
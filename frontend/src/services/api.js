@@ -60,6 +60,13 @@ export const studentsApi = {
     return response.data
   },
 
+  importStudents: async (file) => {
+    const formData = new FormData()
+    formData.append('file', file)
+    const response = await api.post('/students/import', formData)
+    return response.data
+  },
+
   updateStudent: async (id, data) => {
     const response = await api.patch(`/students/${id}`, data)
     return response.data
@@ -134,6 +141,11 @@ export const enrollmentsApi = {
     return response.data
   },
 
+  bulkEnroll: async (data) => {
+    const response = await api.post('/enrollments/bulk', data)
+    return response.data
+  },
+
   updateEnrollment: async (id, data) => {
     const response = await api.patch(`/enrollments/${id}`, data)
     return response.data
@@ -161,6 +173,21 @@ export const academicApi = {
     return response.data
   },
 
+  bulkMarkAttendance: async (data) => {
+    const response = await api.post('/academic/attendance/bulk', data)
+    return response.data
+  },
+
+  getStudentAttendanceRates: async (studentId) => {
+    const response = await api.get(`/academic/attendance/rates/students/${studentId}`)
+    return response.data
+  },
+
+  getCourseAttendanceRates: async (courseId) => {
+    const response = await api.get(`/academic/attendance/rates/courses/${courseId}`)
+    return response.data
+  },
+
   updateAttendance: async (id, data) => {
     const response = await api.patch(`/academic/attendance/${id}`, data)
     return response.data
@@ -185,6 +212,33 @@ export const academicApi = {
     const response = await api.delete(`/academic/grades/${id}`)
     return response.data
   },
+
+  getCourseGradeStats: async (courseId) => {
+    const response = await api.get(`/academic/courses/${courseId}/grade-stats`)
+    return response.data
+  },
+
+  getAtRiskStudents: async (params) => {
+    const response = await api.get('/academic/at-risk', { params })
+    return response.data
+  },
+}
+
+export const statsApi = {
+  getOverview: async () => {
+    const response = await api.get('/stats/overview')
+    return response.data
+  },
+
+  getFacultyStats: async () => {
+    const response = await api.get('/stats/faculty')
+    return response.data
+  },
+
+  getStudentStats: async () => {
+    const response = await api.get('/stats/student')
+    return response.data
+  },
 }
 
 export const semestersApi = {
@@ -208,3 +262,30 @@ export const semestersApi = {
     return response.data
   },
 }
+
+export const gradingScalesApi = {
+  getGradingScales: async (params) => {
+    const response = await api.get('/grading-scales/', { params })
+    return response.data
+  },
+
+  createGradingScale: async (data) => {
+    const response = await api.post('/grading-scales/', data)
+    return response.data
+  },
+
+  updateGradingScale: async (id, data) => {
+    const response = await api.patch(`/grading-scales/${id}`, data)
+    return response.data
+  },
+
+  deleteGradingScale: async (id) => {
+    const response = await api.delete(`/grading-scales/${id}`)
+    return response.data
+  },
+
+  recomputeLetterGrades: async (params) => {
+    const response = await api.post('/grading-scales/recompute', null, { params })
+    return response.data
+  },
+}